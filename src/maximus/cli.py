@@ -269,9 +269,8 @@ def execute_delegate_command() -> str:
             return f"{Colors.RED}Failed to load delegation.{Colors.ENDC} Invalid password or corrupted file."
         
         # Check if expired
-        from datetime import datetime, timezone
-        expires = datetime.fromisoformat(config.expires_at) if config.expires_at else None
-        is_expired = expires and datetime.now(timezone.utc) > expires
+        expires = config.expires_datetime
+        is_expired = config.is_expired()
         
         output_lines = [f"\n{Colors.BOLD}Delegation Status:{Colors.ENDC}\n"]
         
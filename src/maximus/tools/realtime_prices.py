@@ -3,10 +3,10 @@ import asyncio
 import threading
 import time
 import os
-from typing import Dict, Optional, Set, Callable
+from typing import Dict, Iterator, List, Optional, Set, Callable, Tuple
 from datetime import datetime
 import websockets
-from websockets.client import WebSocketClientProtocol
+from websockets.asyncio.client import ClientConnection
 from websockets.exceptions import ConnectionClosed, ConnectionClosedError, ConnectionClosedOK
 import logging
 
@@ -84,17 +84,41 @@ class PriceCache:
     def __init__(self):
         self._cache: Dict[str, PriceData] = {}
         self._lock = threading.Lock()
+        # Notified under the lock on every store, for wait_for()
+        self._stored = threading.Condition(self._lock)
+        # Set on every update so displays can redraw on new data instead of polling
+        self.updated = threading.Event()
     
     def set(self, token_id: str, price_data: PriceData):
         """Store price data for a token."""
         with self._lock:
             self._cache[token_id] = price_data
+            self._stored.notify_all()
+        self.updated.set()
+    
+    def wait_for(self, token_ids: List[str], timeout: Optional[float] = None) -> bool:
+        """
+        Block until every token has a cached price, or the timeout expires.
+        
+        Returns:
+            bool: True if all tokens are cached
+        """
+        with self._stored:
+            return self._stored.wait_for(
+                lambda: all(token_id in self._cache for token_id in token_ids),
+                timeout
+            )
     
     def get(self, token_id: str) -> Optional[PriceData]:
         """Retrieve price data for a token."""
         with self._lock:
             return self._cache.get(token_id)
     
+    def get_many(self, token_ids: List[str]) -> Dict[str, PriceData]:
+        """Retrieve price data for several tokens under one lock; missing tokens are omitted."""
+        with self._lock:
+            return {token_id: self._cache[token_id] for token_id in token_ids if token_id in self._cache}
+    
     def get_price(self, token_id: str) -> Optional[float]:
         """Quick access to just the price value."""
         data = self.get(token_id)
@@ -110,6 +134,24 @@ class PriceCache:
         with self._lock:
             return {k: v.to_dict() for k, v in self._cache.items()}
     
+    def iter_snapshot(self) -> Iterator[Tuple[str, float, float]]:
+        """
+        Iterate (token_id, price, age_seconds) for every cached token.
+        
+        Cheaper than get_all() for status displays: the lock is held only to
+        copy the entry references, and no per-token dict is built.
+        """
+        with self._lock:
+            entries = list(self._cache.items())
+        now = time.time()
+        for token_id, data in entries:
+            yield token_id, data.price, now - data.received_at
+    
+    def __len__(self) -> int:
+        """Number of cached tokens."""
+        with self._lock:
+            return len(self._cache)
+    
     def remove(self, token_id: str):
         """Remove a token from cache."""
         with self._lock:
@@ -139,8 +181,8 @@ class WebsocketManager:
         self.onchain_tokens: Set[str] = set()  # network:address for OnchainSimpleTokenPrice
         
         # Websocket connections
-        self.cg_ws: Optional[WebSocketClientProtocol] = None
-        self.onchain_ws: Optional[WebSocketClientProtocol] = None
+        self.cg_ws: Optional[ClientConnection] = None
+        self.onchain_ws: Optional[ClientConnection] = None
         
         # Background thread
         self.thread: Optional[threading.Thread] = None
@@ -487,6 +529,18 @@ class WebsocketManager:
             self.cg_tokens.add(coin_id)
             logger.info(f"Subscribed to CGSimplePrice: {coin_id}")
     
+    def subscribe_cg_tokens(self, coin_ids: List[str]):
+        """
+        Subscribe to several tokens via CGSimplePrice channel at once.
+        
+        The set is updated in one step, so the listener sends a single
+        set_tokens frame for the whole batch.
+        """
+        new_ids = set(coin_ids) - self.cg_tokens
+        if new_ids:
+            self.cg_tokens.update(new_ids)
+            logger.info(f"Subscribed to CGSimplePrice: {', '.join(sorted(new_ids))}")
+    
     def subscribe_onchain_token(self, network: str, token_address: str):
         """Subscribe to a token via OnchainSimpleTokenPrice channel."""
         token_key = f"{network}:{token_address}"
@@ -536,6 +590,7 @@ def initialize_realtime_prices(common_tokens: Optional[list] = None):
     
     # Pre-subscribe to common tokens if provided
     if common_tokens:
+        cg_tokens = []
         for token in common_tokens:
             token_lower = token.lower()
             
@@ -545,7 +600,8 @@ def initialize_realtime_prices(common_tokens: Optional[list] = None):
                 manager.subscribe_onchain_token("solana", address)
             else:
                 # Subscribe via CGSimplePrice (works for BTC, ETH, etc.)
-                manager.subscribe_cg_token(token_lower)
+                cg_tokens.append(token_lower)
+        manager.subscribe_cg_tokens(cg_tokens)
     
     # Start the manager
     manager.start()
@@ -2,7 +2,7 @@ from langchain.tools import tool
 from typing import Dict, Any
 from pydantic import BaseModel, Field
 from solders.pubkey import Pubkey
-from maximus.tools.solana_client import get_solana_client
+from maximus.tools.solana_client import get_solana_client, TOKEN_PROGRAM_ID
 from maximus.utils.wallet_storage import get_wallet_storage
 from maximus.utils.delegate_wallet import get_delegate_wallet, get_session_password
 
@@ -143,8 +143,7 @@ def check_token_allowance(token_symbol: str) -> dict:
         # Get token accounts with full info including pubkey
         client = get_solana_client()
         pubkey = Pubkey.from_string(main_wallet_address)
-        token_program_id = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
-        opts = TokenAccountOpts(program_id=token_program_id)
+        opts = TokenAccountOpts(program_id=TOKEN_PROGRAM_ID)
         response = client.client.get_token_accounts_by_owner_json_parsed(pubkey, opts)
         
         if not response.value:
@@ -6,6 +6,9 @@ from solders.signature import Signature
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# SPL Token program, parsed once instead of on every call
+TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+
 
 class SolanaClient:
     """Wrapper for Solana RPC client with Helius integration."""
@@ -70,11 +73,8 @@ class SolanaClient:
             
             pubkey = Pubkey.from_string(address)
             
-            # Token program ID
-            token_program_id = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
-            
             # Get token accounts by owner using correct API
-            opts = TokenAccountOpts(program_id=token_program_id)
+            opts = TokenAccountOpts(program_id=TOKEN_PROGRAM_ID)
             response = self.client.get_token_accounts_by_owner_json_parsed(
                 pubkey,
                 opts
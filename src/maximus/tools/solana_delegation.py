@@ -4,7 +4,7 @@ from solders.keypair import Keypair
 from solders.transaction import Transaction
 from solders.message import Message
 from solana.rpc.commitment import Confirmed
-from maximus.tools.solana_client import get_solana_client
+from maximus.tools.solana_client import get_solana_client, TOKEN_PROGRAM_ID
 
 
 def create_token_delegation(
@@ -33,7 +33,7 @@ def create_token_delegation(
     # Build approve instruction
     approve_ix = approve(
         ApproveParams(
-            program_id=Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"),
+            program_id=TOKEN_PROGRAM_ID,
             source=Pubkey.from_string(token_account),
             delegate=Pubkey.from_string(delegate),
             owner=owner_keypair.pubkey(),
@@ -79,7 +79,7 @@ def revoke_token_delegation(
     # Build revoke instruction
     revoke_ix = revoke(
         RevokeParams(
-            program_id=Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"),
+            program_id=TOKEN_PROGRAM_ID,
             account=Pubkey.from_string(token_account),
             owner=owner_keypair.pubkey(),
         )
@@ -1,15 +1,17 @@
 from langchain.tools import tool
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 from solders.pubkey import Pubkey
+from solders.instruction import Instruction, AccountMeta
 from solders.system_program import transfer, TransferParams
 from solders.transaction import Transaction as SoldersTransaction
 from solders.message import Message
 from solana.rpc.commitment import Confirmed
-from maximus.tools.solana_client import get_solana_client
+from maximus.tools.solana_client import get_solana_client, TOKEN_PROGRAM_ID
 from maximus.utils.delegate_wallet import get_delegate_wallet
-import asyncio
 import base64
+import struct
+from functools import lru_cache
 
 
 ####################################
@@ -283,7 +285,7 @@ def send_token(token_mint: str, to_address: str, amount: float) -> dict:
         # Create transfer_checked instruction (safer than transfer as it validates decimals)
         transfer_ix = transfer_checked(
             TransferCheckedParams(
-                program_id=Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"),
+                program_id=TOKEN_PROGRAM_ID,
                 source=source_ata,
                 mint=mint_pubkey,
                 dest=destination_ata,
@@ -382,6 +384,7 @@ def swap_tokens(
     """
     import getpass
     from maximus.utils.delegate_wallet import get_session_password
+    from maximus.tools.titan_client import run_async
     
     try:
         # Try to get cached password first
@@ -426,7 +429,7 @@ def swap_tokens(
         
         # Stream quotes from Titan with live display
         # Pass delegate address so Titan builds transaction for the delegate to sign
-        result = asyncio.run(
+        result = run_async(
             get_titan_swap_with_display(
                 from_token=from_token,
                 to_token=to_token,
@@ -511,26 +514,12 @@ def swap_tokens(
                 # Build transaction from instructions
                 print(f"🔧 Building transaction from {len(best_quote.instructions)} instructions...")
                 
-                from solders.instruction import Instruction as SoldersInstruction
                 from solders.message import MessageV0
                 from solders.transaction import VersionedTransaction
                 from solders.address_lookup_table_account import AddressLookupTableAccount
                 
                 # Convert Titan instructions to Solders instructions
-                instructions = []
-                for titan_ix in best_quote.instructions:
-                    # Titan format: {p: Pubkey, a: [AccountMeta], d: bytes}
-                    program_id = Pubkey(titan_ix['p'])
-                    accounts = []
-                    for acc in titan_ix['a']:
-                        from solders.instruction import AccountMeta
-                        accounts.append(AccountMeta(
-                            pubkey=Pubkey(acc['p']),
-                            is_signer=acc['s'],
-                            is_writable=acc['w']
-                        ))
-                    data = bytes(titan_ix['d'])
-                    instructions.append(SoldersInstruction(program_id, data, accounts))
+                instructions = [titan_instruction_to_solders(titan_ix) for titan_ix in best_quote.instructions]
                 
                 # Get recent blockhash
                 recent_blockhash_resp = client.client.get_latest_blockhash(Confirmed)
@@ -542,50 +531,37 @@ def swap_tokens(
                     print(f"📋 Loading {len(best_quote.address_lookup_tables)} address lookup tables...")
                     from solders.address_lookup_table_account import AddressLookupTableAccount
                     
-                    for table_address in best_quote.address_lookup_tables:
-                        try:
-                            # Fetch lookup table account data
-                            table_pubkey = Pubkey(table_address)
-                            account_info = client.client.get_account_info(table_pubkey)
+                    # Fetch every table in one RPC round trip (batches are capped at 100 accounts)
+                    table_pubkeys = []
+                    table_accounts = []
+                    try:
+                        table_pubkeys = [Pubkey(address) for address in best_quote.address_lookup_tables]
+                        for batch_start in range(0, len(table_pubkeys), MAX_MULTIPLE_ACCOUNTS):
+                            table_accounts.extend(
+                                client.client.get_multiple_accounts(
+                                    table_pubkeys[batch_start:batch_start + MAX_MULTIPLE_ACCOUNTS]
+                                ).value
+                            )
+                    except Exception as e:
+                        print(f"  ⚠️  Could not load lookup tables: {e}")
+                    
+                    for table_pubkey, account in zip(table_pubkeys, table_accounts):
+                        if account and account.data:
+                            # The account data contains the serialized AddressLookupTable state
+                            addresses = parse_lookup_table_addresses(bytes(account.data))
                             
-                            if account_info.value and account_info.value.data:
-                                # Parse address lookup table using solders library structures
-                                # The account data contains the serialized AddressLookupTable state
-                                data = bytes(account_info.value.data)
-                                
-                                # Parse addresses from ALT account data
-                                # ALT account structure (as defined in Solana's address-lookup-table program):
-                                # - discriminator: 4 bytes
-                                # - deactivation_slot: 8 bytes
-                                # - last_extended_slot: 8 bytes
-                                # - last_extended_slot_start_index: 1 byte
-                                # - authority: 32 bytes (Option<Pubkey>, 1 byte tag + 32 bytes if Some)
-                                # - padding: variable
-                                # - addresses: array of 32-byte Pubkeys
-                                
-                                # Addresses typically start at byte 56 after the metadata
-                                addresses = []
-                                offset = 56
-                                
-                                while offset + 32 <= len(data):
-                                    addr_bytes = data[offset:offset + 32]
-                                    addresses.append(Pubkey(addr_bytes))
-                                    offset += 32
-                                
-                                if addresses:
-                                    # Create AddressLookupTableAccount using solders
-                                    alt = AddressLookupTableAccount(
-                                        key=table_pubkey,
-                                        addresses=addresses
-                                    )
-                                    lookup_accounts.append(alt)
-                                    print(f"  ✓ Loaded {len(addresses)} addresses from table")
-                                else:
-                                    print(f"  ⚠️  No addresses found in lookup table")
+                            if addresses:
+                                # Create AddressLookupTableAccount using solders
+                                alt = AddressLookupTableAccount(
+                                    key=table_pubkey,
+                                    addresses=addresses
+                                )
+                                lookup_accounts.append(alt)
+                                print(f"  ✓ Loaded {len(addresses)} addresses from table")
                             else:
-                                print(f"  ⚠️  No data found for lookup table")
-                        except Exception as e:
-                            print(f"  ⚠️  Could not load lookup table: {e}")
+                                print(f"  ⚠️  No addresses found in lookup table")
+                        else:
+                            print(f"  ⚠️  No data found for lookup table")
                 
                 # Create message (V0 for address lookup table support)
                 message = MessageV0.try_compile(
@@ -727,6 +703,84 @@ KNOWN_TOKEN_SYMBOLS = {
     "JUP": "JUPyiwrYJFskUPiHa7hkeR8VUtAeFoSYbKedZNsDvCN",
 }
 
+# Reverse lookup so known mint addresses resolve to their symbol
+# (first symbol wins, so the SOL mint maps to "SOL" rather than "WSOL")
+_MINT_TO_SYMBOL = {mint: symbol for symbol, mint in reversed(KNOWN_TOKEN_SYMBOLS.items())}
+
+# SPL Token Mint layout: decimals is a single byte at offset 44
+MINT_DECIMALS_OFFSET = 44
+_MINT_DECIMALS = struct.Struct('<B')
+
+# Most accounts the RPC returns from a single getMultipleAccounts request
+MAX_MULTIPLE_ACCOUNTS = 100
+
+# Decimals never change once a mint is initialized, so successful reads are
+# kept for the session. Seeded with SOL/WSOL (native token, not an SPL token)
+# and the common stablecoins so they never hit the RPC.
+_mint_decimals_cache = {
+    KNOWN_TOKEN_SYMBOLS["SOL"]: 9,
+    KNOWN_TOKEN_SYMBOLS["USDC"]: 6,
+    KNOWN_TOKEN_SYMBOLS["USDT"]: 6,
+}
+
+
+def get_token_decimals_batch(mint_addresses: List[str]) -> Dict[str, int]:
+    """
+    Query the Solana RPC for the decimals of several mints at once.
+    
+    Mint accounts are fetched with getMultipleAccounts, up to
+    MAX_MULTIPLE_ACCOUNTS per request, and only for mints not already
+    cached. Any mint that can't be read falls back to 6 decimals; fallbacks
+    are not cached so a later call can retry.
+    
+    Args:
+        mint_addresses: Token mint addresses (base58)
+    
+    Returns:
+        Dict mapping each mint address to its number of decimals (0-9)
+    """
+    decimals = {}
+    pending = {}
+    
+    for mint_address in mint_addresses:
+        if mint_address in _mint_decimals_cache:
+            decimals[mint_address] = _mint_decimals_cache[mint_address]
+            continue
+        try:
+            pending[mint_address] = Pubkey.from_string(mint_address)
+        except Exception as e:
+            print(f"⚠️  Error fetching decimals for {mint_address}: {e}, assuming 6 decimals")
+            decimals[mint_address] = 6
+    
+    mints = list(pending)
+    for batch_start in range(0, len(mints), MAX_MULTIPLE_ACCOUNTS):
+        batch = mints[batch_start:batch_start + MAX_MULTIPLE_ACCOUNTS]
+        try:
+            client = get_solana_client()
+            accounts = client.client.get_multiple_accounts([pending[mint] for mint in batch]).value
+        except Exception as e:
+            for mint_address in batch:
+                print(f"⚠️  Error fetching decimals for {mint_address}: {e}, assuming 6 decimals")
+                decimals[mint_address] = 6
+            continue
+        
+        for mint_address, account in zip(batch, accounts):
+            if not account:
+                print(f"⚠️  Could not find mint account {mint_address}, assuming 6 decimals")
+                decimals[mint_address] = 6
+                continue
+            
+            # Parse mint data to extract decimals
+            data = account.data
+            if len(data) >= MINT_DECIMALS_OFFSET + _MINT_DECIMALS.size:
+                decimals[mint_address] = _MINT_DECIMALS.unpack_from(data, MINT_DECIMALS_OFFSET)[0]
+                _mint_decimals_cache[mint_address] = decimals[mint_address]
+            else:
+                print(f"⚠️  Invalid mint data for {mint_address}, assuming 6 decimals")
+                decimals[mint_address] = 6
+    
+    return decimals
+
 
 def get_token_decimals(mint_address: str) -> int:
     """
@@ -738,34 +792,13 @@ def get_token_decimals(mint_address: str) -> int:
     Returns:
         Number of decimals (0-9)
     """
-    try:
-        client = get_solana_client()
-        
-        # Special case for SOL/WSOL (native token, not an SPL token)
-        if mint_address == "So11111111111111111111111111111111111111112":
-            return 9
-        
-        # Get mint account info
-        mint_pubkey = Pubkey.from_string(mint_address)
-        account_info = client.client.get_account_info(mint_pubkey)
-        
-        if not account_info.value:
-            print(f"⚠️  Could not find mint account {mint_address}, assuming 6 decimals")
-            return 6
-        
-        # Parse mint data to extract decimals
-        # SPL Token Mint layout: decimals is at byte offset 44
-        data = account_info.value.data
-        if len(data) >= 45:
-            decimals = data[44]
-            return decimals
-        else:
-            print(f"⚠️  Invalid mint data for {mint_address}, assuming 6 decimals")
-            return 6
-            
-    except Exception as e:
-        print(f"⚠️  Error fetching decimals for {mint_address}: {e}, assuming 6 decimals")
-        return 6
+    return get_token_decimals_batch([mint_address])[mint_address]
+
+
+@lru_cache(maxsize=16384)
+def _fallback_symbol(mint_address: str) -> str:
+    """Display symbol for a mint: its known symbol, or the truncated address."""
+    return _MINT_TO_SYMBOL.get(mint_address) or mint_address[:8].upper()
 
 
 def resolve_token_info(token: str) -> tuple[str, int, str]:
@@ -783,19 +816,94 @@ def resolve_token_info(token: str) -> tuple[str, int, str]:
     token_upper = token.upper()
     
     # Check if it's a known symbol
-    if token_upper in KNOWN_TOKEN_SYMBOLS:
-        mint_address = KNOWN_TOKEN_SYMBOLS[token_upper]
+    mint_address = KNOWN_TOKEN_SYMBOLS.get(token_upper)
+    if mint_address:
         decimals = get_token_decimals(mint_address)
         return (mint_address, decimals, token_upper)
     
     # Assume it's a mint address, query for decimals
     mint_address = token
     decimals = get_token_decimals(mint_address)
-    symbol = token_upper[:8]  # Use truncated address as symbol
+    symbol = _fallback_symbol(mint_address)
     
     return (mint_address, decimals, symbol)
 
 
+# Size of the address lookup table account metadata that precedes the addresses:
+# - discriminator: 4 bytes
+# - deactivation_slot: 8 bytes
+# - last_extended_slot: 8 bytes
+# - last_extended_slot_start_index: 1 byte
+# - authority: 33 bytes (Option<Pubkey>, 1 byte tag + 32 bytes)
+# - padding: 2 bytes
+LOOKUP_TABLE_META_SIZE = 56
+
+# One 32-byte address entry, unpacked in bulk by parse_lookup_table_addresses
+_LOOKUP_TABLE_ADDRESS = struct.Struct('32s')
+
+
+def parse_lookup_table_addresses(data: bytes, offset: int = LOOKUP_TABLE_META_SIZE) -> List[Pubkey]:
+    """
+    Parse the 32-byte addresses stored in an address lookup table account.
+    
+    Args:
+        data: Raw account data
+        offset: Byte offset of the first address
+    
+    Returns:
+        List of addresses; a trailing partial entry is ignored
+    """
+    end = offset + (len(data) - offset) // _LOOKUP_TABLE_ADDRESS.size * _LOOKUP_TABLE_ADDRESS.size
+    return [Pubkey(address) for (address,) in _LOOKUP_TABLE_ADDRESS.iter_unpack(memoryview(data)[offset:end])]
+
+
+def titan_instruction_to_solders(titan_ix: Dict[str, Any]) -> Instruction:
+    """
+    Convert a Titan instruction to a Solders instruction.
+    
+    Args:
+        titan_ix: Titan format {p: program id bytes, a: [{p, s, w}], d: data}
+    
+    Returns:
+        Solders Instruction
+    """
+    accounts = [AccountMeta(Pubkey(acc['p']), acc['s'], acc['w']) for acc in titan_ix['a']]
+    return Instruction(Pubkey(titan_ix['p']), bytes(titan_ix['d']), accounts)
+
+
+# Largest serialized transaction the network accepts (IPv6 MTU minus headers)
+PACKET_DATA_SIZE = 1232
+
+
+def _compact_u16_size(value: int) -> int:
+    """Bytes taken by a compact-u16 length prefix."""
+    return 1 if value < 0x80 else 2 if value < 0x4000 else 3
+
+
+def estimate_tx_size(num_signatures: int, num_accounts: int, instructions: List[tuple]) -> int:
+    """
+    Compute the serialized size of a legacy transaction without building it.
+    
+    Args:
+        num_signatures: Number of required signatures
+        num_accounts: Number of unique account keys in the message
+        instructions: (account_count, data_length) for each instruction
+    
+    Returns:
+        Exact size in bytes of the signed wire-format transaction
+    """
+    size = _compact_u16_size(num_signatures) + num_signatures * 64
+    size += 3  # message header
+    size += _compact_u16_size(num_accounts) + num_accounts * 32
+    size += 32  # recent blockhash
+    size += _compact_u16_size(len(instructions))
+    for account_count, data_length in instructions:
+        size += 1  # program id index
+        size += _compact_u16_size(account_count) + account_count
+        size += _compact_u16_size(data_length) + data_length
+    return size
+
+
 async def get_titan_swap_with_display(
     from_token: str,
     to_token: str,
@@ -822,6 +930,10 @@ async def get_titan_swap_with_display(
         QuoteDisplayConfig
     )
     
+    # Fetch both mints' decimals in one RPC round trip; the resolves below
+    # are then served from the decimals cache
+    get_token_decimals_batch([KNOWN_TOKEN_SYMBOLS.get(token.upper(), token) for token in (from_token, to_token)])
+    
     # Resolve token symbols to mint addresses and get decimals
     input_mint, input_decimals, input_symbol = resolve_token_info(from_token)
     output_mint, output_decimals, output_symbol = resolve_token_info(to_token)
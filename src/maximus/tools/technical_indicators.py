@@ -1,16 +1,515 @@
 from langchain.tools import tool
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional, Union
 from pydantic import BaseModel, Field
 import pandas as pd
 import numpy as np
-import talib
+from numba import njit
 from maximus.tools.prices import get_ohlc_data
 
+####################################
+# Numba Kernels
+####################################
+
+# Kernels declare explicit signatures so they are compiled (or loaded from the
+# on-disk cache) at import time instead of on the first analyze_signals call.
+# The top-level kernels release the GIL, so analyses for several tokens run
+# from worker threads compute in parallel.
+
+# Zero test talib's RSI applies to avg_gain + avg_loss (TA_IS_ZERO in TA-Lib 0.6)
+_RSI_EPSILON = 1e-14
+
+@njit('Tuple((int64, float64, float64))(float64[:], int64, float64, float64)', cache=True)
+def _sma_push(buf, count, total, value):
+    """
+    Push one value into a running-sum SMA ring buffer.
+    
+    Returns:
+        tuple: (new_count, new_total, mean) where mean is NaN until the window is full
+    """
+    window = buf.shape[0]
+    slot = count % window
+    if count >= window:
+        total -= buf[slot]
+    buf[slot] = value
+    total += value
+    count += 1
+    if count >= window:
+        return count, total, total / window
+    return count, total, np.nan
+
+
+@njit('Tuple((int64, float64, float64))(int64, float64, float64, int64)', cache=True)
+def _ema_push(count, state, value, period):
+    """
+    Feed one value into a talib-compatible EMA.
+    
+    Leading NaNs are skipped, the first period values seed the average with
+    their plain mean and later values follow the 2 / (period + 1) recurrence.
+    
+    Returns:
+        tuple: (new_count, new_state, ema) where ema is NaN until seeded
+    """
+    if count == 0 and np.isnan(value):
+        return count, state, np.nan
+    count += 1
+    if count < period:
+        return count, state + value, np.nan
+    if count == period:
+        state = (state + value) / period
+    else:
+        state = ((value - state) * (2.0 / (period + 1))) + state
+    return count, state, state
+
+
+@njit(
+    'UniTuple(float64[:], 2)(float64[:], float64[:], float64[:], int64, int64)',
+    cache=True,
+    nogil=True,
+    error_model='numpy'
+)
+def _wavetrend_nb(high, low, close, n1, n2):
+    """
+    Fused HLC3 -> ESA -> D -> CI -> TCI -> SMA(2) WaveTrend chain in one pass.
+    
+    Equivalent to the three chained talib.EMA calls and the 2-bar SMA, keeping
+    each EMA as a running scalar instead of materializing the intermediates.
+    Flat stretches make d zero, so division follows numpy rules (inf/NaN)
+    rather than raising.
+    
+    Returns:
+        tuple: (wt1, wt2) arrays, NaN-padded
+    """
+    n = high.shape[0]
+    wt1 = np.full(n, np.nan)
+    wt2 = np.full(n, np.nan)
+    
+    esa_count = 0
+    d_count = 0
+    tci_count = 0
+    esa = 0.0
+    d = 0.0
+    tci = 0.0
+    
+    for i in range(n):
+        ap = (high[i] + low[i] + close[i]) / 3
+        esa_count, esa, esa_val = _ema_push(esa_count, esa, ap, n1)
+        d_count, d, d_val = _ema_push(d_count, d, np.abs(ap - esa_val), n1)
+        ci = (ap - esa_val) / (0.015 * d_val)
+        tci_count, tci, wt1[i] = _ema_push(tci_count, tci, ci, n2)
+        if i > 0:
+            wt2[i] = 0.5 * (wt1[i] + wt1[i - 1])
+    
+    return wt1, wt2
+
+
+@njit('UniTuple(float64[:], 2)(float64[:], int64, int64)', cache=True, nogil=True)
+def _rsi_nb(close, length, smooth):
+    """
+    Wilder RSI and its SMA smoothing in a single pass.
+    
+    Equivalent to talib.RSI followed by talib.SMA, skipping leading NaNs the
+    same way; the smoothing is a running sum over a small ring buffer.
+    
+    Returns:
+        tuple: (rsi, smoothed_rsi) arrays, NaN-padded
+    """
+    n = close.shape[0]
+    rsi_out = np.full(n, np.nan)
+    smooth_out = np.full(n, np.nan)
+    
+    start = 0
+    while start < n and np.isnan(close[start]):
+        start += 1
+    if n - start <= length:
+        return rsi_out, smooth_out
+    
+    # Wilder seed: simple average of the first length gains/losses
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(start + 1, start + length + 1):
+        diff = close[i] - close[i - 1]
+        if diff < 0:
+            avg_loss -= diff
+        else:
+            avg_gain += diff
+    avg_gain /= length
+    avg_loss /= length
+    
+    buf = np.empty(smooth)
+    count = 0
+    total = 0.0
+    
+    for i in range(start + length, n):
+        if i > start + length:
+            diff = close[i] - close[i - 1]
+            avg_gain *= length - 1
+            avg_loss *= length - 1
+            if diff < 0:
+                avg_loss -= diff
+            else:
+                avg_gain += diff
+            avg_gain /= length
+            avg_loss /= length
+        
+        total_move = avg_gain + avg_loss
+        if -_RSI_EPSILON < total_move < _RSI_EPSILON:
+            rsi = 0.0
+        else:
+            rsi = 100.0 * (avg_gain / total_move)
+        
+        rsi_out[i] = rsi
+        count, total, smooth_out[i] = _sma_push(buf, count, total, rsi)
+    
+    return rsi_out, smooth_out
+
+
+@njit(
+    'UniTuple(float64[:], 4)(float64[:], int64, int64, int64, int64, int64, int64)',
+    cache=True,
+    nogil=True
+)
+def _stoch_rsi_nb(close, rsi_len, stoch_len, smooth_k, smooth_d, add_k, add_d):
+    """
+    Fused Wilder RSI -> Stochastic -> SMA chain in a single pass.
+    
+    Equivalent to talib.RSI followed by talib.STOCH(rsi, rsi, rsi) and the four
+    chained talib.SMA smoothings, skipping leading NaNs the same way, without
+    materializing the intermediate arrays. Rolling min/max over the RSI window use monotonic deques, each SMA stage is
+    a running sum over a small ring buffer.
+    
+    Returns:
+        tuple: (smooth_k, smooth_d, additional_k, additional_d) arrays, NaN-padded
+    """
+    n = close.shape[0]
+    k_out = np.full(n, np.nan)
+    d_out = np.full(n, np.nan)
+    k_add_out = np.full(n, np.nan)
+    d_add_out = np.full(n, np.nan)
+    
+    start = 0
+    while start < n and np.isnan(close[start]):
+        start += 1
+    if n - start <= rsi_len:
+        return k_out, d_out, k_add_out, d_add_out
+    
+    # Wilder seed: simple average of the first rsi_len gains/losses
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(start + 1, start + rsi_len + 1):
+        diff = close[i] - close[i - 1]
+        if diff < 0:
+            avg_loss -= diff
+        else:
+            avg_gain += diff
+    avg_gain /= rsi_len
+    avg_loss /= rsi_len
+    
+    # RSI values of the current stochastic window, addressed by RSI ordinal
+    rsi_buf = np.empty(stoch_len)
+    max_dq = np.empty(stoch_len, dtype=np.int64)
+    min_dq = np.empty(stoch_len, dtype=np.int64)
+    max_head = 0
+    max_size = 0
+    min_head = 0
+    min_size = 0
+    
+    k_buf = np.empty(smooth_k)
+    d_buf = np.empty(smooth_d)
+    k_add_buf = np.empty(add_k)
+    d_add_buf = np.empty(add_d)
+    k_count = 0
+    d_count = 0
+    k_add_count = 0
+    d_add_count = 0
+    k_total = 0.0
+    d_total = 0.0
+    k_add_total = 0.0
+    d_add_total = 0.0
+    
+    for i in range(start + rsi_len, n):
+        if i > start + rsi_len:
+            diff = close[i] - close[i - 1]
+            avg_gain *= rsi_len - 1
+            avg_loss *= rsi_len - 1
+            if diff < 0:
+                avg_loss -= diff
+            else:
+                avg_gain += diff
+            avg_gain /= rsi_len
+            avg_loss /= rsi_len
+        
+        total = avg_gain + avg_loss
+        if -_RSI_EPSILON < total < _RSI_EPSILON:
+            rsi = 0.0
+        else:
+            rsi = 100.0 * (avg_gain / total)
+        
+        j = i - start - rsi_len
+        rsi_buf[j % stoch_len] = rsi
+        
+        # Evict indices that slid out of the window, then keep deques monotonic
+        if max_size > 0 and max_dq[max_head] <= j - stoch_len:
+            max_head = (max_head + 1) % stoch_len
+            max_size -= 1
+        while max_size > 0 and rsi_buf[max_dq[(max_head + max_size - 1) % stoch_len] % stoch_len] <= rsi:
+            max_size -= 1
+        max_dq[(max_head + max_size) % stoch_len] = j
+        max_size += 1
+        
+        if min_size > 0 and min_dq[min_head] <= j - stoch_len:
+            min_head = (min_head + 1) % stoch_len
+            min_size -= 1
+        while min_size > 0 and rsi_buf[min_dq[(min_head + min_size - 1) % stoch_len] % stoch_len] >= rsi:
+            min_size -= 1
+        min_dq[(min_head + min_size) % stoch_len] = j
+        min_size += 1
+        
+        if j < stoch_len - 1:
+            continue
+        
+        highest = rsi_buf[max_dq[max_head] % stoch_len]
+        lowest = rsi_buf[min_dq[min_head] % stoch_len]
+        scale = (highest - lowest) / 100.0
+        stoch_k = (rsi - lowest) / scale if scale != 0.0 else 0.0
+        
+        k_count, k_total, k_val = _sma_push(k_buf, k_count, k_total, stoch_k)
+        if np.isnan(k_val):
+            continue
+        k_out[i] = k_val
+        
+        k_add_count, k_add_total, k_add_out[i] = _sma_push(k_add_buf, k_add_count, k_add_total, k_val)
+        d_count, d_total, d_val = _sma_push(d_buf, d_count, d_total, k_val)
+        if np.isnan(d_val):
+            continue
+        d_out[i] = d_val
+        
+        d_add_count, d_add_total, d_add_out[i] = _sma_push(d_add_buf, d_add_count, d_add_total, d_val)
+    
+    return k_out, d_out, k_add_out, d_add_out
+
+
+@njit('float64(float64[:], float64[:], float64[:], int64, float64)', cache=True, nogil=True)
+def _money_flow_last(high, low, close, period, multiplier):
+    """
+    Latest Money Flow value, computed from the tail of the series only.
+    
+    The last value of sma(hlc3 - sma(hlc3, period), period) depends on the final
+    2 * period - 1 bars, so only those are visited: one running sum for the
+    inner hlc3 SMA, fused with the diff and high-low range accumulators.
+    
+    Returns:
+        float: Money flow value, NaN if there is not enough data
+    """
+    n = high.shape[0]
+    if period < 1 or n < 2 * period - 1:
+        return np.nan
+    
+    start = n - (2 * period - 1)
+    hlc3_total = 0.0
+    for i in range(start, start + period - 1):
+        hlc3_total += (high[i] + low[i] + close[i]) / 3.0
+    
+    diff_total = 0.0
+    range_total = 0.0
+    for i in range(start + period - 1, n):
+        hlc3 = (high[i] + low[i] + close[i]) / 3.0
+        hlc3_total += hlc3
+        diff_total += hlc3 - hlc3_total / period
+        oldest = i - period + 1
+        hlc3_total -= (high[oldest] + low[oldest] + close[oldest]) / 3.0
+        range_total += high[i] - low[i]
+    
+    if range_total == 0.0:
+        return np.nan
+    return multiplier * 2.0 * diff_total / range_total
+
+
+@njit('UniTuple(boolean, 2)(float64[:], int64)', cache=True, nogil=True)
+def _extreme_crosses_nb(values, window):
+    """
+    Whether the last bar crosses up through the lowest / down through the
+    highest value of its trailing window.
+    
+    Only the final two windows are scanned. Like Series.rolling(window), a
+    window containing NaN has a NaN extreme, so no cross is reported.
+    
+    Returns:
+        tuple: (crosses_up_lowest, crosses_down_highest)
+    """
+    n = values.shape[0]
+    start = n - window - 1
+    
+    # The previous window is values[start:n - 1], the current one values[start + 1:n]
+    inner_low = np.inf
+    inner_high = -np.inf
+    inner_nan = False
+    for i in range(start + 1, n - 1):
+        v = values[i]
+        if np.isnan(v):
+            inner_nan = True
+        else:
+            inner_low = min(inner_low, v)
+            inner_high = max(inner_high, v)
+    
+    first = values[start]
+    last = values[n - 1]
+    if inner_nan or np.isnan(first):
+        prev_low = prev_high = np.nan
+    else:
+        prev_low = min(inner_low, first)
+        prev_high = max(inner_high, first)
+    if inner_nan or np.isnan(last):
+        curr_low = curr_high = np.nan
+    else:
+        curr_low = min(inner_low, last)
+        curr_high = max(inner_high, last)
+    
+    prev = values[n - 2]
+    curr = values[n - 1]
+    return (
+        prev <= prev_low and curr > curr_low,
+        prev >= prev_high and curr < curr_high
+    )
+
+
+@njit(
+    'UniTuple(boolean, 4)(float64[:], float64[:], float64[:], int64, int64, int64, int64)',
+    cache=True,
+    nogil=True
+)
+def _divergences_nb(high, low, osc, left, right, range_lower, range_upper):
+    """
+    Pivot search and divergence checks fused into one backward scan.
+    
+    Only the two most recent pivot highs and lows of the oscillator matter, so
+    bars are tested from the newest confirmable one backwards (same strict
+    test as find_pivots) and the scan stops once both pairs are found.
+    
+    Returns:
+        tuple: (regular_bullish, regular_bearish, hidden_bullish, hidden_bearish)
+    """
+    # Slot 1 holds the most recent pivot, slot 0 the one before it
+    low_idx = np.empty(2, dtype=np.int64)
+    high_idx = np.empty(2, dtype=np.int64)
+    lows_left = 2
+    highs_left = 2
+    
+    i = osc.shape[0] - right - 1
+    while i >= left and (lows_left > 0 or highs_left > 0):
+        center = osc[i]
+        is_high = highs_left > 0
+        is_low = lows_left > 0
+        for j in range(i - left, i + right + 1):
+            if j == i:
+                continue
+            if osc[j] >= center:
+                is_high = False
+            if osc[j] <= center:
+                is_low = False
+            if not is_high and not is_low:
+                break
+        if is_high:
+            highs_left -= 1
+            high_idx[highs_left] = i
+        if is_low:
+            lows_left -= 1
+            low_idx[lows_left] = i
+        i -= 1
+    
+    regular_bullish = False
+    regular_bearish = False
+    hidden_bullish = False
+    hidden_bearish = False
+    
+    if lows_left == 0 and range_lower <= low_idx[1] - low_idx[0] <= range_upper:
+        price_prev = low[low_idx[0]]
+        price_curr = low[low_idx[1]]
+        osc_prev = osc[low_idx[0]]
+        osc_curr = osc[low_idx[1]]
+        
+        # Price makes lower low, oscillator makes higher low
+        regular_bullish = price_curr < price_prev and osc_curr > osc_prev and osc_curr < 0
+        
+        # Hidden bullish: price makes higher low, oscillator makes lower low
+        hidden_bullish = price_curr > price_prev and osc_curr < osc_prev
+    
+    if highs_left == 0 and range_lower <= high_idx[1] - high_idx[0] <= range_upper:
+        price_prev = high[high_idx[0]]
+        price_curr = high[high_idx[1]]
+        osc_prev = osc[high_idx[0]]
+        osc_curr = osc[high_idx[1]]
+        
+        # Price makes higher high, oscillator makes lower high
+        regular_bearish = price_curr > price_prev and osc_curr < osc_prev and osc_curr > 0
+        
+        # Hidden bearish: price makes lower high, oscillator makes higher high
+        hidden_bearish = price_curr < price_prev and osc_curr > osc_prev
+    
+    return regular_bullish, regular_bearish, hidden_bullish, hidden_bearish
+
+
 ####################################
 # Core Calculation Functions
 ####################################
 
-def calculate_wavetrend(prices_df: pd.DataFrame, n1: int = 9, n2: int = 21) -> dict:
+# OHLC input: a price DataFrame or the column dict returned by _ohlc_arrays
+OHLCData = Union[pd.DataFrame, Dict[str, np.ndarray]]
+
+
+def _ohlc_arrays(prices_df: OHLCData) -> Dict[str, np.ndarray]:
+    """
+    Pull the high/low/close columns out once as contiguous float64 arrays.
+    
+    Accepts a DataFrame or a dict already returned by this function (arrays
+    that are already float64 are passed through without copying), so a caller
+    running several indicators converts the columns a single time.
+    
+    Args:
+        prices_df: DataFrame or dict with 'high', 'low' and 'close' columns
+    
+    Returns:
+        dict: {'high', 'low', 'close'} numpy arrays
+    """
+    return {
+        column: np.ascontiguousarray(prices_df[column], dtype=np.float64)
+        for column in ('high', 'low', 'close')
+    }
+
+
+def _sma(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Simple moving average as a boxcar convolution.
+    
+    Drop-in for talib.SMA: leading NaNs are skipped and the output is NaN-padded
+    so it stays aligned with the input. Wide windows over long series switch to
+    a cumulative-sum difference so the cost stays O(N) in the window size.
+    
+    Returns:
+        np.ndarray: SMA values, same length as the input
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape[0], np.nan)
+    
+    valid = np.flatnonzero(~np.isnan(values))
+    start = valid[0] if valid.size else values.shape[0]
+    tail = values[start:]
+    if tail.shape[0] < period:
+        return out
+    
+    if period * tail.shape[0] <= 1_000_000:
+        out[start + period - 1:] = np.convolve(tail, np.full(period, 1.0 / period), mode='valid')
+    else:
+        csum = np.concatenate(([0.0], np.cumsum(tail)))
+        out[start + period - 1:] = (csum[period:] - csum[:-period]) / period
+    
+    return out
+
+
+def calculate_wavetrend(
+    prices_df: OHLCData,
+    n1: int = 9,
+    n2: int = 21
+) -> dict:
     """
     Calculate WaveTrend Channel indicator.
     
@@ -23,46 +522,41 @@ def calculate_wavetrend(prices_df: pd.DataFrame, n1: int = 9, n2: int = 21) -> d
     wt1 = tci
     wt2 = ta.sma(wt1, 2)
     
+    'wt1_series' and 'wt2_series' are numpy arrays aligned with the input rows;
+    wrap them in a pandas Series at the call site if an index is needed.
+    
+    Args:
+        prices_df: OHLC DataFrame, or the column dict from _ohlc_arrays
+        n1: Channel length
+        n2: Average length
+    
     Returns:
         dict: WaveTrend values and overbought/oversold flags
     """
-    # Calculate average price (HLC3)
-    ap = (prices_df['high'] + prices_df['low'] + prices_df['close']) / 3
-    
-    # Calculate ESA (Exponential Moving Average of ap)
-    esa = talib.EMA(ap.values, timeperiod=n1)
-    
-    # Calculate d (EMA of absolute difference)
-    d = talib.EMA(np.abs(ap.values - esa), timeperiod=n1)
-    
-    # Calculate CI (Channel Index)
-    ci = (ap.values - esa) / (0.015 * d)
-    
-    # Calculate TCI (EMA of CI)
-    tci = talib.EMA(ci, timeperiod=n2)
-    
-    # WaveTrend lines
-    wt1 = tci
-    wt2 = talib.SMA(wt1, timeperiod=2)
+    # HLC3 -> EMA chain -> SMA(2) fused into one pass
+    ohlc = _ohlc_arrays(prices_df)
+    wt1, wt2 = _wavetrend_nb(ohlc['high'], ohlc['low'], ohlc['close'], n1, n2)
     
     # Get current values (last valid value)
     wt1_current = wt1[-1] if not np.isnan(wt1[-1]) else 0
     wt2_current = wt2[-1] if not np.isnan(wt2[-1]) else 0
     
-    return {
+    result = {
         'wt1': wt1_current,
         'wt2': wt2_current,
-        'wt1_series': pd.Series(wt1, index=prices_df.index),
-        'wt2_series': pd.Series(wt2, index=prices_df.index),
         'difference': wt1_current - wt2_current,
-        'overbought': wt1_current > 60,
-        'overbought_strong': wt1_current > 53,
-        'oversold': wt1_current < -60,
-        'oversold_strong': wt1_current < -53
+        'overbought': bool(wt1_current > 60),
+        'overbought_strong': bool(wt1_current > 53),
+        'oversold': bool(wt1_current < -60),
+        'oversold_strong': bool(wt1_current < -53),
+        'wt1_series': wt1,
+        'wt2_series': wt2
     }
+    
+    return result
 
 
-def calculate_money_flow(prices_df: pd.DataFrame, period: int = 9, multiplier: float = 5.0) -> float:
+def calculate_money_flow(prices_df: OHLCData, period: int = 9, multiplier: float = 5.0) -> float:
     """
     Calculate Money Flow indicator.
     
@@ -71,30 +565,19 @@ def calculate_money_flow(prices_df: pd.DataFrame, period: int = 9, multiplier: f
     rawMoneyFlow = (2 * ta.sma(hlc3 - ta.sma(hlc3, period), period)) / ta.sma(high - low, period)
     moneyFlow = rawMoneyFlow * multiplier
     
+    Args:
+        prices_df: OHLC DataFrame, or the column dict from _ohlc_arrays
+        period: SMA length
+        multiplier: Scale applied to the raw money flow
+    
     Returns:
         float: Money flow value
     """
-    # Calculate HLC3
-    hlc3 = (prices_df['high'] + prices_df['low'] + prices_df['close']) / 3
-    
-    # Calculate components
-    hlc3_sma = talib.SMA(hlc3.values, timeperiod=period)
-    hlc3_diff = hlc3.values - hlc3_sma
-    hlc3_diff_sma = talib.SMA(hlc3_diff, timeperiod=period)
-    
-    hl_range = prices_df['high'].values - prices_df['low'].values
-    hl_range_sma = talib.SMA(hl_range, timeperiod=period)
-    
-    # Calculate raw money flow
-    raw_money_flow = (2 * hlc3_diff_sma) / hl_range_sma
-    
-    # Apply multiplier
-    money_flow = raw_money_flow * multiplier
+    # Only the last value is used, so evaluate just the tail in one fused pass
+    ohlc = _ohlc_arrays(prices_df)
+    money_flow = _money_flow_last(ohlc['high'], ohlc['low'], ohlc['close'], period, multiplier)
     
-    # Get current value
-    current_value = money_flow[-1] if not np.isnan(money_flow[-1]) else 0
-    
-    return current_value
+    return money_flow if not np.isnan(money_flow) else 0
 
 
 def calculate_rsi(close_prices: pd.Series, length: int = 14, smooth_length: int = 5) -> dict:
@@ -108,11 +591,8 @@ def calculate_rsi(close_prices: pd.Series, length: int = 14, smooth_length: int
     Returns:
         dict: RSI values and overbought/oversold flags
     """
-    # Calculate RSI
-    rsi = talib.RSI(close_prices.values, timeperiod=length)
-    
-    # Calculate smoothed RSI
-    smoothed_rsi = talib.SMA(rsi, timeperiod=smooth_length)
+    # RSI and its SMA smoothing in one pass
+    rsi, smoothed_rsi = _rsi_nb(close_prices.to_numpy(dtype=np.float64), length, smooth_length)
     
     # Get current values
     rsi_current = rsi[-1] if not np.isnan(rsi[-1]) else 50
@@ -148,28 +628,17 @@ def calculate_stochastic_rsi(
     Returns:
         dict: Stochastic RSI values and overbought/oversold flags
     """
-    # First calculate RSI
-    rsi = talib.RSI(close_prices.values, timeperiod=14)
-    
-    # Calculate Stochastic of RSI
-    # Using RSI as high, low, and close for stochastic calculation
-    stoch_k, stoch_d = talib.STOCH(
-        rsi, rsi, rsi,
-        fastk_period=stoch_length,
-        slowk_period=1,
-        slowk_matype=0,
-        slowd_period=1,
-        slowd_matype=0
+    # RSI -> STOCH -> SMA chain fused into one pass
+    smooth_k_values, smooth_d_values, additional_k, additional_d = _stoch_rsi_nb(
+        close_prices.to_numpy(dtype=np.float64),
+        14,
+        stoch_length,
+        smooth_k,
+        smooth_d,
+        additional_smooth_k,
+        additional_smooth_d
     )
     
-    # Smooth K and D
-    smooth_k_values = talib.SMA(stoch_k, timeperiod=smooth_k)
-    smooth_d_values = talib.SMA(smooth_k_values, timeperiod=smooth_d)
-    
-    # Additional smoothing
-    additional_k = talib.SMA(smooth_k_values, timeperiod=additional_smooth_k)
-    additional_d = talib.SMA(smooth_d_values, timeperiod=additional_smooth_d)
-    
     # Get current values
     k_current = smooth_k_values[-1] if not np.isnan(smooth_k_values[-1]) else 50
     d_current = smooth_d_values[-1] if not np.isnan(smooth_d_values[-1]) else 50
@@ -186,7 +655,10 @@ def calculate_stochastic_rsi(
     }
 
 
-def detect_wavetrend_crosses(wt1_series: pd.Series, wt2_series: pd.Series) -> dict:
+def detect_wavetrend_crosses(
+    wt1_series: Union[pd.Series, np.ndarray],
+    wt2_series: Union[pd.Series, np.ndarray]
+) -> dict:
     """
     Detect WaveTrend crosses.
     
@@ -203,11 +675,9 @@ def detect_wavetrend_crosses(wt1_series: pd.Series, wt2_series: pd.Series) -> di
             'bearish_cross': False
         }
     
-    # Get last two values
-    wt1_curr = wt1_series.iloc[-1]
-    wt1_prev = wt1_series.iloc[-2]
-    wt2_curr = wt2_series.iloc[-1]
-    wt2_prev = wt2_series.iloc[-2]
+    # Get last two values (works for Series and raw arrays alike)
+    wt1_prev, wt1_curr = np.asarray(wt1_series[-2:])
+    wt2_prev, wt2_curr = np.asarray(wt2_series[-2:])
     
     # Check for crosses
     crossed = (wt1_prev <= wt2_prev and wt1_curr > wt2_curr) or \
@@ -223,8 +693,8 @@ def detect_wavetrend_crosses(wt1_series: pd.Series, wt2_series: pd.Series) -> di
 
 
 def detect_tops_bottoms(
-    wt1_series: pd.Series,
-    close_prices: pd.Series,
+    wt1_series: Union[pd.Series, np.ndarray],
+    close_prices: Union[pd.Series, np.ndarray],
     divergence_length: int = 28
 ) -> dict:
     """
@@ -236,6 +706,11 @@ def detect_tops_bottoms(
     bullishWTDivergence = ta.crossover(wt1, wt1_trough) and ta.crossover(close, ta.lowest(close, wtDivergenceLength))
     bearishWTDivergence = ta.crossunder(wt1, wt1_peak) and ta.crossunder(close, ta.highest(close, wtDivergenceLength))
     
+    Args:
+        wt1_series: WaveTrend wt1 values, as a Series or numpy array
+        close_prices: Close prices aligned with wt1_series, as a Series or numpy array
+        divergence_length: Lookback for the trailing highest/lowest values
+    
     Returns:
         dict: Potential top/bottom flags
     """
@@ -245,33 +720,13 @@ def detect_tops_bottoms(
             'potential_bottom': False
         }
     
-    # Calculate highest and lowest over lookback period
-    wt1_peak = wt1_series.rolling(window=divergence_length).max()
-    wt1_trough = wt1_series.rolling(window=divergence_length).min()
-    close_high = close_prices.rolling(window=divergence_length).max()
-    close_low = close_prices.rolling(window=divergence_length).min()
-    
-    # Get last two values
-    wt1_curr = wt1_series.iloc[-1]
-    wt1_prev = wt1_series.iloc[-2]
-    wt1_trough_curr = wt1_trough.iloc[-1]
-    wt1_trough_prev = wt1_trough.iloc[-2]
-    wt1_peak_curr = wt1_peak.iloc[-1]
-    wt1_peak_prev = wt1_peak.iloc[-2]
-    
-    close_curr = close_prices.iloc[-1]
-    close_prev = close_prices.iloc[-2]
-    close_low_curr = close_low.iloc[-1]
-    close_low_prev = close_low.iloc[-2]
-    close_high_curr = close_high.iloc[-1]
-    close_high_prev = close_high.iloc[-2]
-    
-    # Check for crossovers/crossunders
-    wt1_crosses_up_trough = wt1_prev <= wt1_trough_prev and wt1_curr > wt1_trough_curr
-    close_crosses_up_low = close_prev <= close_low_prev and close_curr > close_low_curr
-    
-    wt1_crosses_down_peak = wt1_prev >= wt1_peak_prev and wt1_curr < wt1_peak_curr
-    close_crosses_down_high = close_prev >= close_high_prev and close_curr < close_high_curr
+    # Check for crossovers/crossunders of the trailing lowest/highest values
+    wt1_crosses_up_trough, wt1_crosses_down_peak = _extreme_crosses_nb(
+        np.asarray(wt1_series, dtype=np.float64), divergence_length
+    )
+    close_crosses_up_low, close_crosses_down_high = _extreme_crosses_nb(
+        np.asarray(close_prices, dtype=np.float64), divergence_length
+    )
     
     potential_bottom = wt1_crosses_up_trough and close_crosses_up_low
     potential_top = wt1_crosses_down_peak and close_crosses_down_high
@@ -291,33 +746,33 @@ def find_pivots(series: pd.Series, lookback_left: int, lookback_right: int) -> d
     Returns:
         dict: {'pivot_highs': list, 'pivot_lows': list, 'pivot_high_indices': list, 'pivot_low_indices': list}
     """
-    pivot_highs = []
-    pivot_high_indices = []
-    pivot_lows = []
-    pivot_low_indices = []
-    
-    for i in range(lookback_left, len(series) - lookback_right):
-        # Check if current point is a pivot high
-        is_pivot_high = True
-        for j in range(i - lookback_left, i + lookback_right + 1):
-            if j != i and series.iloc[j] >= series.iloc[i]:
-                is_pivot_high = False
-                break
-        
-        if is_pivot_high:
-            pivot_highs.append(series.iloc[i])
-            pivot_high_indices.append(i)
-        
-        # Check if current point is a pivot low
-        is_pivot_low = True
-        for j in range(i - lookback_left, i + lookback_right + 1):
-            if j != i and series.iloc[j] <= series.iloc[i]:
-                is_pivot_low = False
-                break
-        
-        if is_pivot_low:
-            pivot_lows.append(series.iloc[i])
-            pivot_low_indices.append(i)
+    values = series.to_numpy(dtype=np.float64)
+    window = lookback_left + lookback_right + 1
+    if values.shape[0] < window:
+        return {
+            'pivot_highs': [],
+            'pivot_high_indices': [],
+            'pivot_lows': [],
+            'pivot_low_indices': []
+        }
+    
+    # One row per candidate bar; comparisons against NaN are False, as in the
+    # scalar scan, so NaN neighbours never block a pivot
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    center = windows[:, lookback_left:lookback_left + 1]
+    
+    blocks_high = windows >= center
+    blocks_high[:, lookback_left] = False
+    high_idx = np.flatnonzero(~blocks_high.any(axis=1)) + lookback_left
+    
+    blocks_low = windows <= center
+    blocks_low[:, lookback_left] = False
+    low_idx = np.flatnonzero(~blocks_low.any(axis=1)) + lookback_left
+    
+    pivot_highs = values[high_idx].tolist()
+    pivot_high_indices = high_idx.tolist()
+    pivot_lows = values[low_idx].tolist()
+    pivot_low_indices = low_idx.tolist()
     
     return {
         'pivot_highs': pivot_highs,
@@ -328,7 +783,7 @@ def find_pivots(series: pd.Series, lookback_left: int, lookback_right: int) -> d
 
 
 def detect_divergences(
-    prices_df: pd.DataFrame,
+    prices_df: OHLCData,
     oscillator_series: pd.Series,
     lookback_left: int = 10,
     lookback_right: int = 10,
@@ -340,6 +795,14 @@ def detect_divergences(
     
     Port from PineScript divergence detection logic (lines 221-276).
     
+    Args:
+        prices_df: OHLC DataFrame, or the column dict from _ohlc_arrays
+        oscillator_series: Oscillator values aligned with the price rows
+        lookback_left: Bars left of a pivot
+        lookback_right: Bars right of a pivot
+        range_lower: Minimum bars between compared pivots
+        range_upper: Maximum bars between compared pivots
+    
     Returns:
         dict: Divergence flags for regular/hidden bullish/bearish
     """
@@ -351,55 +814,16 @@ def detect_divergences(
             'hidden_bearish': False
         }
     
-    # Find pivots
-    pivots = find_pivots(oscillator_series, lookback_left, lookback_right)
-    
-    # Get recent pivot indices
-    recent_pivot_low_idx = pivots['pivot_low_indices'][-1] if pivots['pivot_low_indices'] else None
-    recent_pivot_high_idx = pivots['pivot_high_indices'][-1] if pivots['pivot_high_indices'] else None
-    
-    regular_bullish = False
-    regular_bearish = False
-    hidden_bullish = False
-    hidden_bearish = False
-    
-    # Check for regular bullish divergence
-    if recent_pivot_low_idx is not None and len(pivots['pivot_low_indices']) >= 2:
-        prev_pivot_low_idx = pivots['pivot_low_indices'][-2]
-        bars_between = recent_pivot_low_idx - prev_pivot_low_idx
-        
-        if range_lower <= bars_between <= range_upper:
-            # Price makes lower low, oscillator makes higher low
-            price_ll = prices_df['low'].iloc[recent_pivot_low_idx] < prices_df['low'].iloc[prev_pivot_low_idx]
-            osc_hl = oscillator_series.iloc[recent_pivot_low_idx] > oscillator_series.iloc[prev_pivot_low_idx]
-            osc_negative = oscillator_series.iloc[recent_pivot_low_idx] < 0
-            
-            regular_bullish = price_ll and osc_hl and osc_negative
-            
-            # Hidden bullish: price makes higher low, oscillator makes lower low
-            price_hl = prices_df['low'].iloc[recent_pivot_low_idx] > prices_df['low'].iloc[prev_pivot_low_idx]
-            osc_ll = oscillator_series.iloc[recent_pivot_low_idx] < oscillator_series.iloc[prev_pivot_low_idx]
-            
-            hidden_bullish = price_hl and osc_ll
-    
-    # Check for regular bearish divergence
-    if recent_pivot_high_idx is not None and len(pivots['pivot_high_indices']) >= 2:
-        prev_pivot_high_idx = pivots['pivot_high_indices'][-2]
-        bars_between = recent_pivot_high_idx - prev_pivot_high_idx
-        
-        if range_lower <= bars_between <= range_upper:
-            # Price makes higher high, oscillator makes lower high
-            price_hh = prices_df['high'].iloc[recent_pivot_high_idx] > prices_df['high'].iloc[prev_pivot_high_idx]
-            osc_lh = oscillator_series.iloc[recent_pivot_high_idx] < oscillator_series.iloc[prev_pivot_high_idx]
-            osc_positive = oscillator_series.iloc[recent_pivot_high_idx] > 0
-            
-            regular_bearish = price_hh and osc_lh and osc_positive
-            
-            # Hidden bearish: price makes lower high, oscillator makes higher high
-            price_lh = prices_df['high'].iloc[recent_pivot_high_idx] < prices_df['high'].iloc[prev_pivot_high_idx]
-            osc_hh = oscillator_series.iloc[recent_pivot_high_idx] > oscillator_series.iloc[prev_pivot_high_idx]
-            
-            hidden_bearish = price_lh and osc_hh
+    # Pivot search and comparisons in one pass over the recent bars
+    regular_bullish, regular_bearish, hidden_bullish, hidden_bearish = _divergences_nb(
+        np.asarray(prices_df['high'], dtype=np.float64),
+        np.asarray(prices_df['low'], dtype=np.float64),
+        np.asarray(oscillator_series, dtype=np.float64),
+        lookback_left,
+        lookback_right,
+        range_lower,
+        range_upper
+    )
     
     return {
         'regular_bullish': regular_bullish,
@@ -409,6 +833,29 @@ def detect_divergences(
     }
 
 
+# (score weight, reason) for each condition generate_aggregated_signal checks
+_SIGNAL_RULES = (
+    # Strong buy signals
+    (40, "WaveTrend oversold with bullish cross"),
+    (40, "Regular bullish divergence detected"),
+    (40, "Potential bottom signal"),
+    # Buy signals
+    (20, "WaveTrend oversold"),
+    (20, "Positive money flow with oversold RSI"),
+    (20, "Hidden bullish divergence"),
+    (15, "Stochastic RSI oversold"),
+    # Strong sell signals
+    (-40, "WaveTrend overbought with bearish cross"),
+    (-40, "Regular bearish divergence detected"),
+    (-40, "Potential top signal"),
+    # Sell signals
+    (-20, "WaveTrend overbought"),
+    (-20, "Negative money flow with overbought RSI"),
+    (-20, "Hidden bearish divergence"),
+    (-15, "Stochastic RSI overbought"),
+)
+
+
 def generate_aggregated_signal(indicators: dict, signals: dict) -> dict:
     """
     Generate aggregated trading signal based on all indicators.
@@ -416,73 +863,35 @@ def generate_aggregated_signal(indicators: dict, signals: dict) -> dict:
     Returns:
         dict: Aggregated signal with direction, strength, and reasons
     """
-    score = 50  # Start neutral
-    reasons = []
-    
     wt = indicators['wavetrend']
     mf = indicators['money_flow']
     rsi = indicators['rsi']
     stoch = indicators['stochastic_rsi']
+    crosses = signals['wavetrend_crosses']
+    divergences = signals['divergences']
+    extremes = signals['extremes']
+    
+    # One flag per entry of _SIGNAL_RULES, in the same order
+    conditions = (
+        wt['oversold'] and crosses['bullish_cross'],
+        divergences['regular_bullish'],
+        extremes['potential_bottom'],
+        wt['oversold'] and not crosses['bullish_cross'],
+        mf['fast_positive'] and rsi['oversold'],
+        divergences['hidden_bullish'],
+        stoch['oversold'],
+        wt['overbought'] and crosses['bearish_cross'],
+        divergences['regular_bearish'],
+        extremes['potential_top'],
+        wt['overbought'] and not crosses['bearish_cross'],
+        not mf['fast_positive'] and rsi['overbought'],
+        divergences['hidden_bearish'],
+        stoch['overbought'],
+    )
+    hits = [rule for rule, hit in zip(_SIGNAL_RULES, conditions) if hit]
     
-    # Strong buy signals (+40 points)
-    if wt['oversold'] and signals['wavetrend_crosses']['bullish_cross']:
-        score += 40
-        reasons.append("WaveTrend oversold with bullish cross")
-    
-    if signals['divergences']['regular_bullish']:
-        score += 40
-        reasons.append("Regular bullish divergence detected")
-    
-    if signals['extremes']['potential_bottom']:
-        score += 40
-        reasons.append("Potential bottom signal")
-    
-    # Buy signals (+20 points)
-    if wt['oversold'] and not signals['wavetrend_crosses']['bullish_cross']:
-        score += 20
-        reasons.append("WaveTrend oversold")
-    
-    if mf['fast_positive'] and rsi['oversold']:
-        score += 20
-        reasons.append("Positive money flow with oversold RSI")
-    
-    if signals['divergences']['hidden_bullish']:
-        score += 20
-        reasons.append("Hidden bullish divergence")
-    
-    if stoch['oversold']:
-        score += 15
-        reasons.append("Stochastic RSI oversold")
-    
-    # Strong sell signals (-40 points)
-    if wt['overbought'] and signals['wavetrend_crosses']['bearish_cross']:
-        score -= 40
-        reasons.append("WaveTrend overbought with bearish cross")
-    
-    if signals['divergences']['regular_bearish']:
-        score -= 40
-        reasons.append("Regular bearish divergence detected")
-    
-    if signals['extremes']['potential_top']:
-        score -= 40
-        reasons.append("Potential top signal")
-    
-    # Sell signals (-20 points)
-    if wt['overbought'] and not signals['wavetrend_crosses']['bearish_cross']:
-        score -= 20
-        reasons.append("WaveTrend overbought")
-    
-    if not mf['fast_positive'] and rsi['overbought']:
-        score -= 20
-        reasons.append("Negative money flow with overbought RSI")
-    
-    if signals['divergences']['hidden_bearish']:
-        score -= 20
-        reasons.append("Hidden bearish divergence")
-    
-    if stoch['overbought']:
-        score -= 15
-        reasons.append("Stochastic RSI overbought")
+    score = 50 + sum(weight for weight, _ in hits)  # Start neutral
+    reasons = [reason for _, reason in hits]
     
     # Clamp score to 0-100
     score = max(0, min(100, score))
@@ -582,25 +991,31 @@ def analyze_signals(identifier: str, days: str = '30', vs_currency: str = 'usd')
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
         df = df.set_index('timestamp')
         
-        # 3. Calculate all indicators
-        wavetrend = calculate_wavetrend(df, n1=9, n2=21)
-        money_flow_fast = calculate_money_flow(df, period=9, multiplier=5.0)
-        money_flow_slow = calculate_money_flow(df, period=10, multiplier=5.0)
+        # 3. Calculate all indicators (columns converted to arrays once)
+        ohlc = _ohlc_arrays(df)
+        wavetrend = calculate_wavetrend(ohlc, n1=9, n2=21)
+        money_flow_fast = calculate_money_flow(ohlc, period=9, multiplier=5.0)
+        money_flow_slow = calculate_money_flow(ohlc, period=10, multiplier=5.0)
         rsi_data = calculate_rsi(df['close'], length=14, smooth_length=5)
         stoch_rsi = calculate_stochastic_rsi(df['close'])
         
         # 4. Detect signals
         crosses = detect_wavetrend_crosses(wavetrend['wt1_series'], wavetrend['wt2_series'])
-        tops_bottoms = detect_tops_bottoms(wavetrend['wt1_series'], df['close'], divergence_length=28)
+        tops_bottoms = detect_tops_bottoms(
+            wavetrend['wt1_series'],
+            ohlc['close'],
+            divergence_length=28
+        )
         
         # Calculate MACD for divergence detection (as per PineScript)
-        fast_ma = talib.SMA((df['high'] + df['low'] + df['close']).values / 3, timeperiod=9)
-        slow_ma = talib.SMA((df['high'] + df['low'] + df['close']).values / 3, timeperiod=21)
+        hlc3 = (ohlc['high'] + ohlc['low'] + ohlc['close']) / 3
+        fast_ma = _sma(hlc3, 9)
+        slow_ma = _sma(hlc3, 21)
         macd = (fast_ma - slow_ma) / slow_ma
         macd_series = pd.Series(macd, index=df.index)
         
         divergences = detect_divergences(
-            df,
+            ohlc,
             macd_series,
             lookback_left=10,
             lookback_right=10,
@@ -31,14 +31,28 @@ Environment Variables:
 
 import os
 import asyncio
-import msgpack
-import base58
+import contextlib
+import functools
+import msgspec
+import operator
 import ssl
 import logging
-from typing import Optional, Dict, Any, List, AsyncIterator
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, TypeVar
 import websockets
-from websockets.client import WebSocketClientProtocol
+from websockets.asyncio.client import ClientConnection
+from websockets.datastructures import Headers
+from websockets.protocol import State
+from solders.pubkey import Pubkey
+import numpy as np
+
+# uvloop is not available on Windows; fall back to the default asyncio loop
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+T = TypeVar("T")
 
 
 # Titan API Configuration
@@ -62,30 +76,251 @@ IS_PRODUCTION = ENV in ("production", "prod") or NODE_ENV == "production" or PYT
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class SwapQuote:
-    """A single swap quote from a provider."""
-    provider: str
-    in_amount: int
-    out_amount: int
-    slippage_bps: int
-    route_steps: List[Dict[str, Any]]
-    instructions: List[Dict[str, Any]]
-    address_lookup_tables: List[bytes]
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion on uvloop when available.
+    
+    Streaming quotes is dominated by small frame receives, where uvloop's
+    scheduler roughly halves per-recv overhead versus the selector loop.
+    Synchronous entry points (e.g. around get_best_quote_from_stream) should
+    use this instead of asyncio.run. The pooled Titan connection is bound to
+    this loop, so it is closed before the loop exits.
+    """
+    async def run_and_close_pool() -> T:
+        try:
+            return await coro
+        finally:
+            await TitanClientPool.close()
+    
+    if HAS_UVLOOP:
+        return uvloop.run(run_and_close_pool())
+    return asyncio.run(run_and_close_pool())
+
+
+@functools.lru_cache(maxsize=2)
+def _get_ssl_context(insecure: bool) -> ssl.SSLContext:
+    """
+    Build the TLS context once and share it across clients.
+    
+    Loading the system trust store takes milliseconds, so it is not worth
+    repeating on every connect(); a shared context also lets OpenSSL resume
+    sessions on reconnect.
+    """
+    ssl_context = ssl.create_default_context()
+    ssl_context.set_alpn_protocols(["http/1.1"])
+    if insecure:
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+@functools.lru_cache(maxsize=1024)
+def _b58decode_cached(address: str) -> bytes:
+    """Decode a base58 address; mints and wallets repeat across requests."""
+    return bytes(Pubkey.from_string(address))
+
+
+@functools.lru_cache(maxsize=1024)
+def _b58encode_cached(pubkey_bytes: bytes) -> str:
+    """Encode 32 pubkey bytes as a base58 address."""
+    return str(Pubkey.from_bytes(pubkey_bytes))
+
+
+# Mints and lookup tables repeat across updates and providers; interning lets
+# each update share one bytes object per key instead of holding fresh copies.
+# bytes can't be weakly referenced, so the table is bounded by clearing it.
+_PUBKEY_INTERN_LIMIT = 4096
+_pubkey_intern: Dict[bytes, bytes] = {}
+
+
+def _intern_pubkey(pubkey_bytes: bytes) -> bytes:
+    """Return the shared bytes object for a 32-byte pubkey."""
+    if len(_pubkey_intern) >= _PUBKEY_INTERN_LIMIT:
+        _pubkey_intern.clear()
+    return _pubkey_intern.setdefault(pubkey_bytes, pubkey_bytes)
+
+
+# Empty MessagePack array, the default for quotes that omit heavy fields
+_EMPTY_ARRAY = msgspec.Raw(b"\x90")
+
+_instructions_decoder = msgspec.msgpack.Decoder(List[Dict[str, Any]])
+_lookup_tables_decoder = msgspec.msgpack.Decoder(List[bytes])
+
+
+class SwapQuote(msgspec.Struct, rename="camel", dict=True):
+    """
+    A single swap quote from a provider.
+    
+    Only the selected quote's instructions and lookup tables are ever used,
+    so they are kept as undecoded MessagePack views into the frame and
+    decoded on first access.
+    """
+    provider: str = ""
+    in_amount: int = 0
+    out_amount: int = 0
+    slippage_bps: int = 0
+    route_steps: List[Dict[str, Any]] = msgspec.field(default_factory=list, name="steps")
+    raw_instructions: msgspec.Raw = msgspec.field(default=_EMPTY_ARRAY, name="instructions")
+    raw_address_lookup_tables: msgspec.Raw = msgspec.field(default=_EMPTY_ARRAY, name="addressLookupTables")
     compute_units: Optional[int] = None
     transaction: Optional[bytes] = None
     reference_id: Optional[str] = None
+    
+    @functools.cached_property
+    def instructions(self) -> List[Dict[str, Any]]:
+        """Swap instructions as returned by Titan."""
+        return _instructions_decoder.decode(self.raw_instructions)
+    
+    @functools.cached_property
+    def address_lookup_tables(self) -> List[bytes]:
+        """Address lookup table keys (32 bytes each)."""
+        return [_intern_pubkey(key) for key in _lookup_tables_decoder.decode(self.raw_address_lookup_tables)]
 
 
-@dataclass
-class SwapQuotes:
+# Below this many quotes a plain max()/min() beats building a numpy array
+_VECTORIZED_QUOTE_THRESHOLD = 128
+
+_get_out_amount = operator.attrgetter("out_amount")
+_get_in_amount = operator.attrgetter("in_amount")
+
+
+class SwapQuotes(msgspec.Struct, rename="camel"):
     """Collection of quotes from multiple providers."""
-    id: str
+    id: str = ""
+    input_mint: bytes = b""
+    output_mint: bytes = b""
+    swap_mode: str = "ExactIn"
+    amount: int = 0
+    quotes: Dict[str, SwapQuote] = msgspec.field(default_factory=dict)
+    
+    def best_quote(self) -> Optional[tuple[str, SwapQuote]]:
+        """
+        Pick the best quote in this update.
+        
+        Returns:
+            (provider_id, quote) with the highest out_amount for ExactIn or the
+            lowest in_amount for ExactOut, or None if there are no quotes
+        """
+        if not self.quotes:
+            return None
+        
+        exact_in = self.swap_mode == "ExactIn"
+        if len(self.quotes) < _VECTORIZED_QUOTE_THRESHOLD:
+            if exact_in:
+                return max(self.quotes.items(), key=lambda item: item[1].out_amount)
+            return min(self.quotes.items(), key=lambda item: item[1].in_amount)
+        
+        # Large updates: gather amounts into an int64 array and reduce in C
+        providers = list(self.quotes)
+        quotes = list(self.quotes.values())
+        getter = _get_out_amount if exact_in else _get_in_amount
+        amounts = np.fromiter(map(getter, quotes), dtype=np.int64, count=len(quotes))
+        i = int(amounts.argmax() if exact_in else amounts.argmin())
+        return providers[i], quotes[i]
+
+
+####################################
+# Protocol Envelope
+####################################
+
+# Server messages are externally tagged ({"StreamData": {...}}), so the envelope
+# is a struct with one optional field per message kind. Decoding straight into
+# these types skips building intermediate dicts for every streamed frame.
+
+class StreamPayload(msgspec.Struct, rename="pascal"):
+    """Payload of a stream data frame."""
+    swap_quotes: Optional[SwapQuotes] = None
+
+
+class StreamData(msgspec.Struct):
+    """A single update on an open stream."""
+    id: Optional[int] = None
+    payload: StreamPayload = msgspec.field(default_factory=StreamPayload)
+
+
+class StreamEnd(msgspec.Struct, rename="camel"):
+    """Notification that a stream has finished."""
+    id: Optional[int] = None
+    error_code: Optional[int] = None
+    error_message: Optional[str] = None
+
+
+class StreamInfo(msgspec.Struct):
+    """Stream opened in response to a request."""
+    id: int
+
+
+class ResponseData(msgspec.Struct, rename="camel"):
+    """Successful response to a request."""
+    request_id: Optional[int] = None
+    stream: Optional[StreamInfo] = None
+    data: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+
+class ErrorData(msgspec.Struct, rename="camel"):
+    """Error response to a request."""
+    request_id: Optional[int] = None
+    code: int = 0
+    message: str = ""
+
+
+class TitanEnvelope(msgspec.Struct, rename="pascal"):
+    """Top-level server message."""
+    response: Optional[ResponseData] = None
+    error: Optional[ErrorData] = None
+    stream_data: Optional[StreamData] = None
+    stream_end: Optional[StreamEnd] = None
+
+
+class TitanRequest(msgspec.Struct):
+    """Client request frame."""
+    id: int
+    data: Any
+
+
+# Request bodies are structs too: the encoder caches each field name's
+# MessagePack encoding, so only the values are encoded per request
+
+class SwapParams(msgspec.Struct, rename="camel"):
+    """Swap parameters of a quote stream request."""
     input_mint: bytes
     output_mint: bytes
-    swap_mode: str
     amount: int
-    quotes: Dict[str, SwapQuote]
+    swap_mode: str
+    slippage_bps: int
+
+
+class TransactionParams(msgspec.Struct, rename="camel"):
+    """Transaction parameters of a quote stream request."""
+    user_public_key: bytes
+
+
+class UpdateParams(msgspec.Struct, rename="camel"):
+    """Update cadence of a quote stream."""
+    interval_ms: int
+    num_quotes: int
+
+
+class NewSwapQuoteStream(msgspec.Struct):
+    """Body of a NewSwapQuoteStream request."""
+    swap: SwapParams
+    transaction: TransactionParams
+    update: UpdateParams
+
+
+# GetInfo has no parameters, so its body is encoded once and spliced in raw
+_GET_INFO_DATA = msgspec.Raw(msgspec.msgpack.encode({"GetInfo": {}}))
+
+
+# Updates buffered between the stream reader and a slow consumer
+_QUOTE_QUEUE_SIZE = 4
+
+
+def _put_latest(queue: asyncio.Queue, item: Any) -> None:
+    """Enqueue item, dropping the oldest entry if full; only recent quotes matter."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
 
 
 class TitanClient:
@@ -99,17 +334,20 @@ class TitanClient:
                 "or contact info@titandex.io to obtain one."
             )
         
-        self.ws: Optional[WebSocketClientProtocol] = None
+        self.ws: Optional[ClientConnection] = None
         self.request_id = 0
         self.stream_id: Optional[int] = None
+        # Built once; every (re)connect sends the same auth header
+        self._auth_headers = Headers([("Authorization", f"Bearer {self.api_token}")])
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(TitanEnvelope)
         
     async def connect(self) -> None:
         """Establish WebSocket connection with authentication."""
         # Protocol negotiation in Sec-WebSocket-Protocol header
-        # Using v1.api.titan.ag (no compression for simplicity)
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-        }
+        # Using v1.api.titan.ag with permessage-deflate (RFC 7692) negotiated
+        # at the WebSocket layer; quote frames carry instructions and ALTs
+        # that compress well
         
         # Configure SSL/TLS verification
         # By default, use secure SSL with certificate verification
@@ -131,20 +369,20 @@ class TitanClient:
                 + "=" * 80
             )
             
-            # Create insecure SSL context (development only)
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
+            # Insecure SSL context (development only)
+            ssl_context = _get_ssl_context(insecure=True)
         else:
-            # Use secure SSL context with default certificate verification
-            ssl_context = ssl.create_default_context()
+            # Secure SSL context with default certificate verification
+            ssl_context = _get_ssl_context(insecure=False)
         
         try:
             self.ws = await websockets.connect(
                 TITAN_WS_URL,
-                additional_headers=headers,
+                additional_headers=self._auth_headers,
                 subprotocols=["v1.api.titan.ag"],
                 ssl=ssl_context,
+                compression="deflate",
+                max_size=2**22,
             )
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Titan API: {e}")
@@ -157,26 +395,42 @@ class TitanClient:
     
     def _encode_pubkey(self, address: str) -> bytes:
         """Encode a Solana public key from base58 to 32 bytes."""
-        return base58.b58decode(address)
+        return _b58decode_cached(address)
     
     def _decode_pubkey(self, pubkey_bytes: bytes) -> str:
         """Decode 32 bytes to base58 Solana address."""
-        return base58.b58encode(pubkey_bytes).decode('utf-8')
+        return _b58encode_cached(bytes(pubkey_bytes))
     
-    def _encode_request(self, request_data: Dict[str, Any]) -> bytes:
+    def _encode_request(self, request_data: Any) -> bytes:
         """Encode a request using MessagePack."""
         self.request_id += 1
-        request = {
-            "id": self.request_id,
-            "data": request_data
-        }
-        return msgpack.packb(request, use_bin_type=True)
+        return self._encoder.encode(TitanRequest(self.request_id, request_data))
     
-    def _decode_message(self, data: bytes) -> Dict[str, Any]:
+    def _decode_message(self, data: bytes) -> TitanEnvelope:
         """Decode a message using MessagePack."""
-        return msgpack.unpackb(data, raw=False)
+        return self._decoder.decode(data)
     
-    async def request_swap_quotes(
+    async def _recv_frame(self) -> bytes:
+        """Receive the next frame as raw bytes."""
+        # Titan frames are binary MessagePack; decode=False also keeps any text
+        # frame as bytes instead of paying for UTF-8 decoding into a str
+        return await self.ws.recv(decode=False)
+    
+    async def _recv_reply(self, request_id: int) -> TitanEnvelope:
+        """Receive the response or error for a request, skipping other frames."""
+        # Stop acks are not awaited, so a reused connection may still deliver
+        # them, along with frames from the stream they stopped. Only a reply
+        # carrying this request's id is accepted
+        while True:
+            msg = self._decode_message(await self._recv_frame())
+            reply = msg.response or msg.error
+            if reply is None:
+                continue
+            if reply.request_id == request_id:
+                return msg
+            logger.debug(f"Skipping reply to request {reply.request_id} while waiting for {request_id}")
+    
+    async def start_swap_quote_stream(
         self,
         input_mint: str,
         output_mint: str,
@@ -186,9 +440,9 @@ class TitanClient:
         swap_mode: str = "ExactIn",
         interval_ms: int = 500,
         num_quotes: int = 5,
-    ) -> AsyncIterator[SwapQuotes]:
+    ) -> None:
         """
-        Request swap quotes and stream updates.
+        Open a swap quote stream; read updates with next_swap_quotes().
         
         Args:
             input_mint: Input token mint address (base58)
@@ -199,31 +453,28 @@ class TitanClient:
             swap_mode: "ExactIn" or "ExactOut"
             interval_ms: Update interval in milliseconds
             num_quotes: Maximum number of quotes to return per update
-        
-        Yields:
-            SwapQuotes objects with updated quotes from providers
         """
         if not self.ws:
             await self.connect()
         
         # Build SwapQuoteRequest according to Titan protocol
         request_data = {
-            "NewSwapQuoteStream": {
-                "swap": {
-                    "inputMint": self._encode_pubkey(input_mint),
-                    "outputMint": self._encode_pubkey(output_mint),
-                    "amount": amount,
-                    "swapMode": swap_mode,
-                    "slippageBps": slippage_bps,
-                },
-                "transaction": {
-                    "userPublicKey": self._encode_pubkey(user_public_key),
-                },
-                "update": {
-                    "intervalMs": interval_ms,
-                    "numQuotes": num_quotes,
-                }
-            }
+            "NewSwapQuoteStream": NewSwapQuoteStream(
+                swap=SwapParams(
+                    input_mint=_b58decode_cached(input_mint),
+                    output_mint=_b58decode_cached(output_mint),
+                    amount=amount,
+                    swap_mode=swap_mode,
+                    slippage_bps=slippage_bps,
+                ),
+                transaction=TransactionParams(
+                    user_public_key=_b58decode_cached(user_public_key),
+                ),
+                update=UpdateParams(
+                    interval_ms=interval_ms,
+                    num_quotes=num_quotes,
+                ),
+            )
         }
         
         # Send request
@@ -231,78 +482,154 @@ class TitanClient:
         await self.ws.send(encoded)
         
         # Wait for initial response with stream start
-        response_data = await self.ws.recv()
-        response = self._decode_message(response_data)
+        response = await self._recv_reply(self.request_id)
         
-        if "Error" in response:
-            error = response["Error"]
-            raise Exception(f"Titan API error {error['code']}: {error['message']}")
+        if response.error:
+            error = response.error
+            raise Exception(f"Titan API error {error.code}: {error.message}")
         
         # Extract stream ID from response
-        if "Response" in response:
-            resp = response["Response"]
-            if "stream" in resp and resp["stream"]:
-                self.stream_id = resp["stream"]["id"]
+        if response.response and response.response.stream:
+            self.stream_id = response.response.stream.id
+    
+    def _is_current_stream(self, stream_id: Optional[int]) -> bool:
+        """Whether a stream frame belongs to the open stream."""
+        return stream_id is None or self.stream_id is None or stream_id == self.stream_id
+    
+    async def next_swap_quotes(self) -> Optional[SwapQuotes]:
+        """
+        Receive the next quote update on the open stream.
+        
+        Returns:
+            SwapQuotes for the next update, or None once the stream has ended
+        """
+        while True:
+            msg_data = await self._recv_frame()
+            msg = self._decode_message(msg_data)
+            
+            frame = msg.stream_end or msg.stream_data
+            if frame is None or not self._is_current_stream(frame.id):
+                continue
+            
+            if msg.stream_end:
+                stream_end = msg.stream_end
+                self.stream_id = None
+                if stream_end.error_code:
+                    raise Exception(
+                        f"Stream ended with error {stream_end.error_code}: "
+                        f"{stream_end.error_message or 'Unknown error'}"
+                    )
+                return None
+            
+            if msg.stream_data and msg.stream_data.payload.swap_quotes:
+                quotes = msg.stream_data.payload.swap_quotes
+                quotes.input_mint = _intern_pubkey(quotes.input_mint)
+                quotes.output_mint = _intern_pubkey(quotes.output_mint)
+                # Provider ids are the map keys on the wire
+                for provider_id, quote in quotes.quotes.items():
+                    quote.provider = provider_id
+                return quotes
+    
+    async def request_swap_quotes(
+        self,
+        input_mint: str,
+        output_mint: str,
+        amount: int,
+        user_public_key: str,
+        slippage_bps: int = 50,
+        swap_mode: str = "ExactIn",
+        interval_ms: int = 500,
+        num_quotes: int = 5,
+        latest_only: bool = False,
+    ) -> AsyncIterator[SwapQuotes]:
+        """
+        Request swap quotes and stream updates.
+        
+        Args:
+            input_mint: Input token mint address (base58)
+            output_mint: Output token mint address (base58)
+            amount: Amount in smallest units (lamports/token units)
+            user_public_key: User's wallet address (base58)
+            slippage_bps: Slippage tolerance in basis points
+            swap_mode: "ExactIn" or "ExactOut"
+            interval_ms: Update interval in milliseconds
+            num_quotes: Maximum number of quotes to return per update
+            latest_only: Skip updates that were superseded while the consumer
+                was busy, yielding only the newest one received
+        
+        Yields:
+            SwapQuotes objects with updated quotes from providers
+        """
+        await self.start_swap_quote_stream(
+            input_mint=input_mint,
+            output_mint=output_mint,
+            amount=amount,
+            user_public_key=user_public_key,
+            slippage_bps=slippage_bps,
+            swap_mode=swap_mode,
+            interval_ms=interval_ms,
+            num_quotes=num_quotes,
+        )
+        
+        # Receive and decode on a reader task so the next frame is read while
+        # the consumer is still handling the previous update
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUOTE_QUEUE_SIZE)
+        reader = asyncio.create_task(self._read_quotes_into(queue))
         
         # Stream quote updates
         try:
             while True:
-                msg_data = await self.ws.recv()
-                msg = self._decode_message(msg_data)
-                
-                if "StreamEnd" in msg:
-                    stream_end = msg["StreamEnd"]
-                    if stream_end.get("errorCode"):
-                        raise Exception(
-                            f"Stream ended with error {stream_end['errorCode']}: "
-                            f"{stream_end.get('errorMessage', 'Unknown error')}"
-                        )
+                quotes = await queue.get()
+                if latest_only:
+                    quotes = self._skip_to_latest(queue, quotes)
+                if quotes is None:
                     break
-                
-                if "StreamData" in msg:
-                    stream_data = msg["StreamData"]
-                    payload = stream_data.get("payload", {})
-                    
-                    if "SwapQuotes" in payload:
-                        quotes_data = payload["SwapQuotes"]
-                        yield self._parse_swap_quotes(quotes_data)
+                if isinstance(quotes, Exception):
+                    raise quotes
+                yield quotes
         
         except asyncio.CancelledError:
             # User cancelled, stop the stream
             await self.stop_stream()
             raise
-    
-    def _parse_swap_quotes(self, data: Dict[str, Any]) -> SwapQuotes:
-        """Parse SwapQuotes from protocol data."""
-        quotes_dict = {}
-        
-        for provider_id, route in data.get("quotes", {}).items():
-            quotes_dict[provider_id] = SwapQuote(
-                provider=provider_id,
-                in_amount=route.get("inAmount", 0),
-                out_amount=route.get("outAmount", 0),
-                slippage_bps=route.get("slippageBps", 0),
-                route_steps=route.get("steps", []),
-                instructions=route.get("instructions", []),
-                address_lookup_tables=[
-                    addr for addr in route.get("addressLookupTables", [])
-                ],
-                compute_units=route.get("computeUnits"),
-                transaction=route.get("transaction"),
-                reference_id=route.get("referenceId"),
-            )
         
-        return SwapQuotes(
-            id=data.get("id", ""),
-            input_mint=data.get("inputMint", b""),
-            output_mint=data.get("outputMint", b""),
-            swap_mode=data.get("swapMode", "ExactIn"),
-            amount=data.get("amount", 0),
-            quotes=quotes_dict,
-        )
+        finally:
+            reader.cancel()
+    
+    @staticmethod
+    def _skip_to_latest(queue: asyncio.Queue, quotes: Any) -> Any:
+        """Replace quotes with the newest update already queued behind it."""
+        # Each update is a full snapshot, so older ones can be dropped. The
+        # end marker or an error is always last, so it is put back to be
+        # seen after the update it followed
+        while isinstance(quotes, SwapQuotes) and not queue.empty():
+            queued = queue.get_nowait()
+            if not isinstance(queued, SwapQuotes):
+                queue.put_nowait(queued)
+                break
+            quotes = queued
+        return quotes
+    
+    async def _read_quotes_into(self, queue: asyncio.Queue) -> None:
+        """Feed stream updates into queue, then None at stream end or the error raised."""
+        try:
+            while True:
+                quotes = await self.next_swap_quotes()
+                _put_latest(queue, quotes)
+                if quotes is None:
+                    return
+        except Exception as e:
+            _put_latest(queue, e)
     
-    async def stop_stream(self) -> None:
-        """Stop the current quote stream."""
+    async def stop_stream(self, wait: bool = False) -> None:
+        """
+        Stop the current quote stream.
+        
+        Args:
+            wait: Wait for the server to confirm. By default the stop is sent
+                without waiting; later replies and stream frames are matched by
+                id, so the unread ack and any in-flight updates are skipped.
+        """
         if not self.ws or not self.stream_id:
             return
         
@@ -314,39 +641,216 @@ class TitanClient:
         
         encoded = self._encode_request(request_data)
         await self.ws.send(encoded)
+        self.stream_id = None
         
-        # Wait for confirmation
-        response_data = await self.ws.recv()
-        response = self._decode_message(response_data)
+        if not wait:
+            return
         
-        if "Error" in response:
-            error = response["Error"]
-            raise Exception(f"Failed to stop stream: {error['message']}")
+        # Wait for confirmation
+        response = await self._recv_reply(self.request_id)
         
-        self.stream_id = None
+        if response.error:
+            raise Exception(f"Failed to stop stream: {response.error.message}")
     
     async def get_server_info(self) -> Dict[str, Any]:
         """Get server information and settings."""
         if not self.ws:
             await self.connect()
         
-        request_data = {"GetInfo": {}}
-        encoded = self._encode_request(request_data)
+        encoded = self._encode_request(_GET_INFO_DATA)
         await self.ws.send(encoded)
         
-        response_data = await self.ws.recv()
-        response = self._decode_message(response_data)
+        response = await self._recv_reply(self.request_id)
         
-        if "Error" in response:
-            error = response["Error"]
-            raise Exception(f"Failed to get server info: {error['message']}")
+        if response.error:
+            raise Exception(f"Failed to get server info: {response.error.message}")
         
-        if "Response" in response:
-            return response["Response"].get("data", {}).get("GetInfo", {})
+        if response.response:
+            return response.response.data.get("GetInfo", {})
         
         return {}
 
 
+class TitanClientPool:
+    """
+    Keeps one connected TitanClient alive across calls.
+    
+    Reusing the socket skips the TLS handshake, WebSocket upgrade and auth on
+    every quote request. Clients only handle one stream at a time, so acquire()
+    hands the shared client out exclusively until release(); while it is busy,
+    callers get a short-lived client of their own instead of waiting for it.
+    Connections are bound to the event loop that opened them; a new loop gets
+    a new client.
+    """
+    
+    idle_timeout_seconds = 60.0
+    
+    _client: Optional[TitanClient] = None
+    _overflow: set = set()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock: Optional[asyncio.Lock] = None
+    _last_used = 0.0
+    
+    @classmethod
+    async def acquire(cls) -> TitanClient:
+        """Get the shared client, connecting it if needed."""
+        loop = asyncio.get_running_loop()
+        if cls._loop is not loop:
+            cls._discard_client()
+            cls._loop = loop
+            cls._lock = asyncio.Lock()
+        
+        if cls._lock.locked():
+            # Another stream holds the shared client; don't queue behind it
+            client = TitanClient()
+            await client.connect()
+            cls._overflow.add(client)
+            return client
+        
+        await cls._lock.acquire()
+        try:
+            client = cls._client
+            if client is not None:
+                expired = loop.time() - cls._last_used > cls.idle_timeout_seconds
+                if expired or client.ws is None or client.ws.state is not State.OPEN:
+                    await client.close()
+                    client = None
+            
+            if client is None:
+                client = TitanClient()
+                await client.connect()
+            
+            cls._client = client
+            return client
+        except BaseException:
+            cls._client = None
+            cls._lock.release()
+            raise
+    
+    @classmethod
+    async def release(cls, client: TitanClient, reusable: bool = True) -> None:
+        """Return the client to the pool, closing it if it can't be reused."""
+        if client in cls._overflow:
+            cls._overflow.discard(client)
+            await client.close()
+            return
+        
+        try:
+            if not reusable or client.stream_id is not None:
+                if cls._client is client:
+                    cls._client = None
+                await client.close()
+        finally:
+            cls._last_used = asyncio.get_running_loop().time()
+            cls._lock.release()
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared client, if any."""
+        if cls._loop is not asyncio.get_running_loop():
+            cls._discard_client()
+            return
+        client, cls._client = cls._client, None
+        if client is not None:
+            await client.close()
+    
+    @classmethod
+    def _discard_client(cls) -> None:
+        """Drop a client opened on another loop, aborting its socket."""
+        client, cls._client = cls._client, None
+        if client is not None and client.ws is not None:
+            # The owning loop can't run the close handshake from here, so the
+            # connection is torn down without it
+            with contextlib.suppress(Exception):
+                client.ws.transport.abort()
+            client.ws = None
+
+
+class _QuoteStreamHub:
+    """
+    Shares one Titan quote stream among concurrent callers asking for the same swap.
+    
+    The first subscriber starts a broadcast task on a pooled client; every
+    update is pushed to each subscriber's queue. When the last subscriber
+    leaves the task is cancelled, which stops the stream and returns the
+    client to the pool. Stream end is signalled with None and failures with
+    the exception itself.
+    """
+    
+    _streams: Dict[tuple, tuple[asyncio.Task, List[asyncio.Queue]]] = {}
+    
+    @classmethod
+    def subscribe(cls, key: tuple, stream_kwargs: Dict[str, Any]) -> asyncio.Queue:
+        """Register a queue for the stream under key, starting it if needed."""
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = cls._streams.get(key)
+        if entry is None:
+            queues = [queue]
+            task = asyncio.create_task(cls._broadcast(key, stream_kwargs, queues))
+            cls._streams[key] = (task, queues)
+        else:
+            entry[1].append(queue)
+        return queue
+    
+    @classmethod
+    def unsubscribe(cls, key: tuple, queue: asyncio.Queue) -> None:
+        """Remove a queue; cancel the stream once nobody is listening."""
+        entry = cls._streams.get(key)
+        if entry is None:
+            return
+        task, queues = entry
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            del cls._streams[key]
+            task.cancel()
+    
+    @classmethod
+    async def _broadcast(
+        cls,
+        key: tuple,
+        stream_kwargs: Dict[str, Any],
+        queues: List[asyncio.Queue],
+    ) -> None:
+        """Run one stream on a pooled client and fan updates out to queues."""
+        try:
+            client = await TitanClientPool.acquire()
+        except Exception as e:
+            cls._finish(key, queues, e)
+            return
+        
+        reusable = True
+        try:
+            await client.start_swap_quote_stream(**stream_kwargs)
+            while True:
+                quotes = await client.next_swap_quotes()
+                for queue in queues:
+                    queue.put_nowait(quotes)
+                if quotes is None:
+                    break
+        except Exception as e:
+            reusable = False
+            cls._finish(key, queues, e)
+        finally:
+            # Stop the stream so the connection can serve the next request
+            try:
+                await client.stop_stream()
+            except Exception:
+                reusable = False
+            await TitanClientPool.release(client, reusable=reusable)
+            cls._finish(key, queues)
+    
+    @classmethod
+    def _finish(cls, key: tuple, queues: List[asyncio.Queue], error: Optional[Exception] = None) -> None:
+        """Detach a finished stream so later callers start a fresh one."""
+        entry = cls._streams.get(key)
+        if entry is not None and entry[1] is queues:
+            del cls._streams[key]
+        if error is not None:
+            for queue in queues:
+                queue.put_nowait(error)
+
+
 async def get_best_quote_from_stream(
     input_mint: str,
     output_mint: str,
@@ -364,44 +868,58 @@ async def get_best_quote_from_stream(
     Returns:
         Tuple of (provider_id, best_quote, all_quotes) or None if failed
     """
-    client = TitanClient()
+    # Concurrent callers asking for the same swap share one stream
+    loop = asyncio.get_running_loop()
+    key = (loop, input_mint, output_mint, amount, user_public_key, slippage_bps)
+    queue = _QuoteStreamHub.subscribe(key, {
+        "input_mint": input_mint,
+        "output_mint": output_mint,
+        "amount": amount,
+        "user_public_key": user_public_key,
+        "slippage_bps": slippage_bps,
+    })
+    
+    # One deadline for the whole call; each wait gets only what is left
+    deadline = loop.time() + timeout_seconds
+    
+    best_provider = None
+    best_quote = None
+    latest_quotes = None
     
     try:
-        best_provider = None
-        best_quote = None
-        latest_quotes = None
-        
-        async def stream_quotes():
-            nonlocal best_provider, best_quote, latest_quotes
-            async for quotes in client.request_swap_quotes(
-                input_mint=input_mint,
-                output_mint=output_mint,
-                amount=amount,
-                user_public_key=user_public_key,
-                slippage_bps=slippage_bps,
-            ):
-                latest_quotes = quotes
-                
-                # Find best quote based on swap mode
-                for provider_id, quote in quotes.quotes.items():
-                    if quotes.swap_mode == "ExactIn":
-                        # For ExactIn: select highest out_amount
-                        if best_quote is None or quote.out_amount > best_quote.out_amount:
-                            best_provider = provider_id
-                            best_quote = quote
-                    else:  # ExactOut
-                        # For ExactOut: select lowest in_amount
-                        if best_quote is None or quote.in_amount < best_quote.in_amount:
-                            best_provider = provider_id
-                            best_quote = quote
-        
-        await asyncio.wait_for(stream_quotes(), timeout=timeout_seconds)
-        return (best_provider, best_quote, latest_quotes) if best_quote else None
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            
+            quotes = await asyncio.wait_for(queue.get(), timeout=remaining)
+            if quotes is None:
+                break
+            if isinstance(quotes, Exception):
+                raise quotes
+            
+            latest_quotes = quotes
+            
+            best = quotes.best_quote()
+            if best is None:
+                continue
+            
+            # Keep the best quote across updates based on swap mode
+            provider_id, quote = best
+            if quotes.swap_mode == "ExactIn":
+                # For ExactIn: select highest out_amount
+                if best_quote is None or quote.out_amount > best_quote.out_amount:
+                    best_provider, best_quote = provider_id, quote
+            else:  # ExactOut
+                # For ExactOut: select lowest in_amount
+                if best_quote is None or quote.in_amount < best_quote.in_amount:
+                    best_provider, best_quote = provider_id, quote
     
     except asyncio.TimeoutError:
-        # Return best quote found so far, if any
-        return (best_provider, best_quote, latest_quotes) if best_quote else None
+        # Deadline reached; fall through with the best quote found so far
+        pass
     
     finally:
-        await client.close()
-
+        _QuoteStreamHub.unsubscribe(key, queue)
+    
+    return (best_provider, best_quote, latest_quotes) if best_quote else None
@@ -5,14 +5,69 @@ Shows a table of quotes from multiple providers that updates in-place
 as new quotes arrive, with the best quote highlighted.
 """
 
+import os
 import sys
 import threading
 import asyncio
-from typing import Optional, Dict
+import time
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Optional, Dict, List
 from dataclasses import dataclass
 from maximus.utils.ui import Colors
 from maximus.tools.titan_client import SwapQuotes, SwapQuote
 
+# termios is POSIX-only; without it stdin stays in line mode
+try:
+    import termios
+    import tty
+    HAS_TERMIOS = True
+except ImportError:
+    HAS_TERMIOS = False
+
+# Minimum seconds between table redraws while streaming
+RENDER_INTERVAL = 0.1
+
+
+# Quotes that haven't moved are reformatted every frame, so the formatters
+# below are memoized; their arguments fully determine the output
+
+@lru_cache(maxsize=1024)
+def _format_amount(amount: int, decimals: int) -> str:
+    """Format token amount with decimals."""
+    value = amount / (10 ** decimals)
+    if value >= 1000:
+        return f"{value:,.2f}"
+    elif value >= 1:
+        return f"{value:.4f}"
+    else:
+        return f"{value:.8f}"
+
+
+@lru_cache(maxsize=1024)
+def _calculate_rate(in_amount: int, out_amount: int) -> str:
+    """Calculate and format the exchange rate."""
+    if in_amount == 0:
+        return "0.0000"
+    
+    rate = out_amount / in_amount
+    if rate >= 1000:
+        return f"{rate:,.2f}"
+    elif rate >= 1:
+        return f"{rate:.4f}"
+    else:
+        return f"{rate:.8f}"
+
+
+@lru_cache(maxsize=256)
+def _format_route_labels(labels: tuple, num_steps: int) -> str:
+    """Format the first route step labels and total step count."""
+    # Take first word of each venue
+    route = " → ".join(label.split()[0] for label in labels)
+    if num_steps > 3:
+        route += f" +{num_steps - 3}"
+    return route
+
 
 @dataclass
 class QuoteDisplayConfig:
@@ -34,20 +89,43 @@ class LiveQuoteDisplay:
     def __init__(self, config: QuoteDisplayConfig):
         self.config = config
         self.current_quotes: Optional[SwapQuotes] = None
+        # Quotes ordered by out_amount (best first), computed once per update
+        self._sorted_quotes: List[tuple] = []
+        self._best_provider: Optional[str] = None
         self.is_running = False
-        self.user_confirmed = False
-        self._lock = threading.Lock()
-        self._input_thread: Optional[threading.Thread] = None
+        # Only touched from the event loop, so no lock is needed
+        self.user_confirmed = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stdin_fd: Optional[int] = None
+        self._saved_tty: Optional[list] = None
+        self._prev_lines: List[bytes] = []
+        # Frames are composed as bytes in the terminal's encoding, so the
+        # static parts are encoded once and written without a final encode
+        self._encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
         
+        # Header and footer only depend on the config, so build them once
+        self._header_lines = self._encode_lines([
+            f"\n{Colors.BOLD}{Colors.LIGHT_ORANGE}╭─ Live Quotes{Colors.ENDC}",
+            f"{Colors.LIGHT_ORANGE}│{Colors.ENDC} "
+            f"{Colors.DIM}Provider{' ' * 8} Route{' ' * 15} "
+            f"In {config.symbol_in}{' ' * 8} Out {config.symbol_out}{' ' * 8} Rate{Colors.ENDC}",
+            f"{Colors.LIGHT_ORANGE}│{Colors.ENDC} {Colors.DIM}{'─' * 75}{Colors.ENDC}",
+        ])
+        self._footer_lines = self._encode_lines([
+            f"{Colors.LIGHT_ORANGE}│{Colors.ENDC}",
+            f"{Colors.LIGHT_ORANGE}╰{'─' * 75}{Colors.ENDC}",
+            f"\n{Colors.DIM}Press {Colors.BOLD}Enter{Colors.ENDC}{Colors.DIM} "
+            f"to execute best quote, or {Colors.BOLD}Ctrl+C{Colors.ENDC}{Colors.DIM} to cancel{Colors.ENDC}",
+        ])
+        self._waiting_lines = self._encode_lines([f"{Colors.YELLOW}⏳{Colors.ENDC} Waiting for quotes..."])
+        
+    def _encode_lines(self, texts: List[str]) -> List[bytes]:
+        """Encode text for the terminal, split into one entry per screen line."""
+        return "\n".join(texts).encode(self._encoding, errors="replace").split(b"\n")
+    
     def _format_amount(self, amount: int, decimals: int) -> str:
         """Format token amount with decimals."""
-        value = amount / (10 ** decimals)
-        if value >= 1000:
-            return f"{value:,.2f}"
-        elif value >= 1:
-            return f"{value:.4f}"
-        else:
-            return f"{value:.8f}"
+        return _format_amount(amount, decimals)
     
     def _format_route(self, steps: list) -> str:
         """Format route steps into a readable string."""
@@ -55,148 +133,228 @@ class LiveQuoteDisplay:
             return "Direct"
         
         # Show first few venues in the route
-        venues = []
-        for step in steps[:3]:
-            label = step.get("label", "Unknown")
-            venues.append(label.split()[0])  # Take first word
-        
-        route = " → ".join(venues)
-        if len(steps) > 3:
-            route += f" +{len(steps) - 3}"
-        
-        return route
+        labels = tuple(step.get("label", "Unknown") for step in steps[:3])
+        return _format_route_labels(labels, len(steps))
     
     def _calculate_rate(self, in_amount: int, out_amount: int) -> str:
         """Calculate and format the exchange rate."""
-        if in_amount == 0:
-            return "0.0000"
+        return _calculate_rate(in_amount, out_amount)
+    
+    @staticmethod
+    def _colored_run(segments: List[tuple[str, str]]) -> str:
+        """
+        Join (sgr, text) segments, emitting an escape only when the color changes.
         
-        rate = out_amount / in_amount
-        if rate >= 1000:
-            return f"{rate:,.2f}"
-        elif rate >= 1:
-            return f"{rate:.4f}"
-        else:
-            return f"{rate:.8f}"
+        Segments are expected to use plain foreground colors, which replace
+        each other without a reset; an empty sgr means the default color.
+        The line ends with a single reset if any color is still active.
+        """
+        out = []
+        current = ""
+        for sgr, text in segments:
+            if sgr != current:
+                out.append(sgr or Colors.ENDC)
+                current = sgr
+            out.append(text)
+        if current:
+            out.append(Colors.ENDC)
+        return "".join(out)
     
-    def _render_table(self) -> str:
-        """Render the current quotes as a table."""
+    def _render_lines(self) -> List[bytes]:
+        """Render the current quotes as a table, one encoded entry per line."""
         if not self.current_quotes or not self.current_quotes.quotes:
-            return f"{Colors.YELLOW}⏳{Colors.ENDC} Waiting for quotes..."
-        
-        # Find best quote (highest out_amount for ExactIn)
-        best_provider = None
-        best_out = 0
-        for provider, quote in self.current_quotes.quotes.items():
-            if quote.out_amount > best_out:
-                best_out = quote.out_amount
-                best_provider = provider
+            return list(self._waiting_lines)
         
-        # Build table
-        lines = []
+        best_provider = self._best_provider
+        border, green, white = Colors.LIGHT_ORANGE, Colors.GREEN, Colors.WHITE
+        colored_run = self._colored_run
+        decimals_in = self.config.decimals_in
+        decimals_out = self.config.decimals_out
+        format_amount = _format_amount
+        calculate_rate = _calculate_rate
+        encoding = self._encoding
         
-        # Header
-        lines.append(f"\n{Colors.BOLD}{Colors.LIGHT_ORANGE}╭─ Live Quotes{Colors.ENDC}")
-        lines.append(
-            f"{Colors.LIGHT_ORANGE}│{Colors.ENDC} "
-            f"{Colors.DIM}Provider{' ' * 8} Route{' ' * 15} "
-            f"In {self.config.symbol_in}{' ' * 8} Out {self.config.symbol_out}{' ' * 8} Rate{Colors.ENDC}"
-        )
-        lines.append(f"{Colors.LIGHT_ORANGE}│{Colors.ENDC} {Colors.DIM}{'─' * 75}{Colors.ENDC}")
-        
-        # Sort providers by out_amount (best first)
-        sorted_quotes = sorted(
-            self.current_quotes.quotes.items(),
-            key=lambda x: x[1].out_amount,
-            reverse=True
-        )
+        # Build table from the precomputed header
+        lines = list(self._header_lines)
         
         # Quote rows
-        for provider, quote in sorted_quotes:
+        for provider, quote in self._sorted_quotes:
             is_best = provider == best_provider
-            color = Colors.GREEN if is_best else Colors.WHITE
+            color = green if is_best else white
             prefix = "★" if is_best else " "
             
             # Format columns
             provider_name = provider[:15].ljust(15)
             route = self._format_route(quote.route_steps)[:20].ljust(20)
-            in_amt = self._format_amount(quote.in_amount, self.config.decimals_in).rjust(12)
-            out_amt = self._format_amount(quote.out_amount, self.config.decimals_out).rjust(12)
-            rate = self._calculate_rate(quote.in_amount, quote.out_amount).rjust(10)
+            in_amt = format_amount(quote.in_amount, decimals_in).rjust(12)
+            out_amt = format_amount(quote.out_amount, decimals_out).rjust(12)
+            rate = calculate_rate(quote.in_amount, quote.out_amount).rjust(10)
             
-            line = (
-                f"{Colors.LIGHT_ORANGE}│{Colors.ENDC} {color}{prefix} "
-                f"{provider_name} {route} {in_amt} {out_amt} {rate}{Colors.ENDC}"
-            )
-            lines.append(line)
+            # Border and row text are both foreground colors, so the row
+            # switches straight from one to the other without a reset
+            lines.append(colored_run([
+                (border, "│"),
+                (color, f" {prefix} {provider_name} {route} {in_amt} {out_amt} {rate}"),
+            ]).encode(encoding, errors="replace"))
         
         # Footer with instruction
-        lines.append(f"{Colors.LIGHT_ORANGE}│{Colors.ENDC}")
-        lines.append(
-            f"{Colors.LIGHT_ORANGE}╰{'─' * 75}{Colors.ENDC}"
-        )
-        lines.append(
-            f"\n{Colors.DIM}Press {Colors.BOLD}Enter{Colors.ENDC}{Colors.DIM} "
-            f"to execute best quote, or {Colors.BOLD}Ctrl+C{Colors.ENDC}{Colors.DIM} to cancel{Colors.ENDC}"
-        )
+        lines.extend(self._footer_lines)
         
-        return "\n".join(lines)
+        return lines
+    
+    def _clear_sequence(self, num_lines: int) -> bytes:
+        """Escape sequence that moves to the first table line and clears to the end of screen."""
+        if num_lines <= 1:
+            return b"\r\033[0J"
+        return b"\033[%dF\033[0J" % (num_lines - 1)
     
     def _clear_display(self, num_lines: int):
         """Clear the display by moving cursor up and clearing lines."""
-        for _ in range(num_lines):
-            sys.stdout.write("\033[F")  # Move cursor up
-            sys.stdout.write("\033[K")  # Clear line
+        self._write(self._clear_sequence(num_lines))
+    
+    def _write(self, data: bytes):
+        """Write an encoded frame to the terminal with a single write and flush."""
+        # A line-buffered text stream flushes at every newline; going through
+        # the byte buffer turns a whole frame into one write()
+        stream = sys.stdout
+        buffer = getattr(stream, "buffer", None)
+        if buffer is None:
+            stream.write(data.decode(self._encoding, errors="replace"))
+            stream.flush()
+            return
+        
+        stream.flush()
+        buffer.write(data)
+        buffer.flush()
+    
+    def _confirm(self):
+        """Mark the best quote as confirmed by the user."""
+        self.user_confirmed.set()
+        self.is_running = False
+        self._remove_stdin_reader()
+    
+    def _on_stdin(self):
+        """Handle a keypress on stdin, confirming on Enter."""
+        try:
+            data = os.read(self._stdin_fd, 1024)
+        except OSError:
+            data = b""
+        if not data:
+            # EOF: nobody can confirm, so stop watching
+            self._remove_stdin_reader()
+            return
+        if b"\n" in data or b"\r" in data:
+            self._confirm()
     
     def _wait_for_enter(self):
-        """Wait for user to press Enter in a separate thread."""
+        """Wait for Enter in a thread, for loops that can't watch stdin."""
         try:
             input()
-            with self._lock:
-                self.user_confirmed = True
-                self.is_running = False
-        except:
+            self._loop.call_soon_threadsafe(self._confirm)
+        except (EOFError, RuntimeError):
+            # No stdin, or the loop finished before Enter was pressed
             pass
     
+    def _enter_cbreak(self, fd: int):
+        """Put a terminal stdin into cbreak mode so keys arrive unechoed and unbuffered."""
+        if not HAS_TERMIOS or not os.isatty(fd):
+            return
+        try:
+            self._saved_tty = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+        except termios.error:
+            self._saved_tty = None
+    
+    def _remove_stdin_reader(self):
+        """Stop watching stdin and restore the terminal mode."""
+        if self._stdin_fd is not None:
+            self._loop.remove_reader(self._stdin_fd)
+            if self._saved_tty is not None:
+                try:
+                    termios.tcsetattr(self._stdin_fd, termios.TCSADRAIN, self._saved_tty)
+                except termios.error:
+                    pass
+                self._saved_tty = None
+            self._stdin_fd = None
+    
     def update_quotes(self, quotes: SwapQuotes):
         """Update the displayed quotes."""
-        with self._lock:
-            self.current_quotes = quotes
+        self.current_quotes = quotes
+        
+        # Sort providers by out_amount (best first); best is highest out_amount for ExactIn
+        self._sorted_quotes = sorted(
+            quotes.quotes.items(),
+            key=lambda x: x[1].out_amount,
+            reverse=True
+        )
+        top = self._sorted_quotes[0] if self._sorted_quotes else None
+        self._best_provider = top[0] if top and top[1].out_amount > 0 else None
     
     def start(self):
         """Start the display."""
-        with self._lock:
-            self.is_running = True
-            self.user_confirmed = False
+        self.is_running = True
+        self.user_confirmed.clear()
+        self._loop = asyncio.get_running_loop()
         
-        # Start thread to wait for Enter key
-        self._input_thread = threading.Thread(target=self._wait_for_enter, daemon=True)
-        self._input_thread.start()
+        # Watch stdin on the event loop for the Enter key
+        try:
+            fd = sys.stdin.fileno()
+            self._loop.add_reader(fd, self._on_stdin)
+            self._stdin_fd = fd
+            self._enter_cbreak(fd)
+        except (NotImplementedError, OSError, ValueError):
+            # Windows event loops can't watch stdin; fall back to a thread
+            threading.Thread(target=self._wait_for_enter, daemon=True).start()
     
     def stop(self):
         """Stop the display."""
-        with self._lock:
-            self.is_running = False
+        self.is_running = False
+        self._remove_stdin_reader()
+    
+    def _draw(self, lines: List[bytes], prefix: bytes = b"") -> int:
+        """Write a full frame, after any clear sequence, in one write."""
+        # Keep rendered lines for diffing and counting when clearing later
+        self._prev_lines = lines
+        self._write(prefix + b"\n".join(lines))
+        return len(lines)
     
     def render(self):
         """Render the current state to the terminal."""
-        table = self._render_table()
+        return self._draw(self._render_lines())
+    
+    def render_update(self, last_num_lines: int):
+        """
+        Update the display in-place.
         
-        # Count lines for clearing later
-        num_lines = table.count('\n') + 1
+        Only lines that differ from the previous frame are rewritten; the
+        table is redrawn in full only when its height changes.
+        """
+        lines = self._render_lines()
+        prev_lines = self._prev_lines
         
-        # Print the table
-        sys.stdout.write(table)
-        sys.stdout.flush()
+        if len(lines) != len(prev_lines) or len(lines) != last_num_lines:
+            prefix = self._clear_sequence(last_num_lines) if last_num_lines > 0 else b""
+            return self._draw(lines, prefix)
         
-        return num_lines
-    
-    def render_update(self, last_num_lines: int):
-        """Update the display in-place."""
-        if last_num_lines > 0:
-            self._clear_display(last_num_lines)
+        changed = [i for i, (old, new) in enumerate(zip(prev_lines, lines)) if old != new]
+        if not changed:
+            return last_num_lines
         
-        return self.render()
+        # The cursor rests at the end of the last line: save it, move up to
+        # each changed line, rewrite it, and restore before the next one
+        bottom = len(lines) - 1
+        out = bytearray(b"\0337")
+        for i in changed:
+            up = bottom - i
+            out += b"\033[%dF" % up if up else b"\r"
+            out += b"\033[2K"
+            out += lines[i]
+            out += b"\0338"
+        
+        self._write(bytes(out))
+        
+        self._prev_lines = lines
+        return last_num_lines
 
 
 async def stream_quotes_with_display(
@@ -221,47 +379,67 @@ async def stream_quotes_with_display(
     best_quote = None
     latest_quotes = None
     last_num_lines = 0
+    last_render = 0.0
+    pending_render = None
+    loop = asyncio.get_running_loop()
+    
+    def redraw():
+        nonlocal last_num_lines, last_render, pending_render
+        pending_render = None
+        last_num_lines = display.render_update(last_num_lines)
+        last_render = time.monotonic()
     
     try:
         # Initial render
         last_num_lines = display.render()
         
-        # Stream quotes
+        # Stream quotes; aclosing ends the generator (and its reader task)
+        # when the loop is left early
         quote_stream = client.request_swap_quotes(
             input_mint=input_mint,
             output_mint=output_mint,
             amount=amount,
             user_public_key=user_public_key,
             slippage_bps=slippage_bps,
+            latest_only=True,
         )
         
-        async for quotes in quote_stream:
-            # Update display
-            display.update_quotes(quotes)
-            latest_quotes = quotes
-            
-            # Find best quote
-            for provider_id, quote in quotes.quotes.items():
-                if best_quote is None or quote.out_amount > best_quote.out_amount:
-                    best_provider = provider_id
-                    best_quote = quote
-            
-            # Render update
-            last_num_lines = display.render_update(last_num_lines)
-            
-            # Check if user confirmed
-            if display.user_confirmed:
-                await client.stop_stream()
-                break
-            
-            # Small delay to avoid overwhelming the terminal
-            await asyncio.sleep(0.1)
+        async with aclosing(quote_stream):
+            async for quotes in quote_stream:
+                # Update display
+                display.update_quotes(quotes)
+                latest_quotes = quotes
+                
+                # Find best quote
+                best = quotes.best_quote()
+                if best and (best_quote is None or best[1].out_amount > best_quote.out_amount):
+                    best_provider, best_quote = best
+                
+                # Redraw at most every RENDER_INTERVAL; quotes in between are
+                # still tracked so a burst doesn't hold up confirmation. A
+                # skipped frame schedules a redraw so the end of a burst is
+                # always shown
+                elapsed = time.monotonic() - last_render
+                if elapsed >= RENDER_INTERVAL:
+                    if pending_render:
+                        pending_render.cancel()
+                    redraw()
+                elif pending_render is None:
+                    pending_render = loop.call_later(RENDER_INTERVAL - elapsed, redraw)
+                
+                # Check if user confirmed
+                if display.user_confirmed.is_set():
+                    await client.stop_stream()
+                    break
+                
+                # Let the stdin reader run between quotes
+                await asyncio.sleep(0)
         
         # Clear display
         if last_num_lines > 0:
             display._clear_display(last_num_lines)
         
-        if display.user_confirmed and best_quote:
+        if display.user_confirmed.is_set() and best_quote:
             # Show final selection
             out_formatted = display._format_amount(
                 best_quote.out_amount,
@@ -284,5 +462,7 @@ async def stream_quotes_with_display(
         return None
     
     finally:
+        if pending_render:
+            pending_render.cancel()
         display.stop()
 
@@ -1,15 +1,25 @@
-import json
+import hashlib
 import os
+import time
+import msgspec
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from solders.keypair import Keypair
 import base64
 
 
+# Key derivation functions; files written with scrypt start with the marker,
+# older files without it were encrypted under a PBKDF2 key
+_KDF_SCRYPT = "scrypt"
+_KDF_PBKDF2 = "pbkdf2"
+_SCRYPT_MARKER = b"scrypt$"
+
+
 class DelegationConfig:
     """Configuration for a delegation."""
     
@@ -32,12 +42,23 @@ class DelegationConfig:
         self.allowed_programs = allowed_programs or ["Titan"]
         self.created_at = created_at or datetime.now(timezone.utc).isoformat()
         self.expires_at = expires_at
+        # Parsed once; expiry checks are a float comparison and display reuses the datetime
+        self.expires_datetime: Optional[datetime] = (
+            datetime.fromisoformat(expires_at) if expires_at else None
+        )
+        self._expires_epoch: Optional[float] = (
+            self.expires_datetime.timestamp() if self.expires_datetime else None
+        )
+    
+    def is_expired(self) -> bool:
+        """Check whether the delegation has passed its expiry time."""
+        return self._expires_epoch is not None and time.time() > self._expires_epoch
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage."""
         return {
             "publicKey": self.public_key,
-            "secretKey": list(self.secret_key),
+            "secretKey": base64.b64encode(self.secret_key).decode('ascii'),
             "delegatedBy": self.delegated_by,
             "maxSolPerTx": self.max_sol_per_tx,
             "maxTokenPerTx": self.max_token_per_tx,
@@ -49,9 +70,13 @@ class DelegationConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "DelegationConfig":
         """Create from dictionary."""
+        # Older files store the secret key as a list of ints
+        secret_key = data["secretKey"]
+        if isinstance(secret_key, str):
+            secret_key = base64.b64decode(secret_key)
         return cls(
             public_key=data["publicKey"],
-            secret_key=bytes(data["secretKey"]),
+            secret_key=bytes(secret_key),
             delegated_by=data["delegatedBy"],
             max_sol_per_tx=data.get("maxSolPerTx", 1.0),
             max_token_per_tx=data.get("maxTokenPerTx", 100.0),
@@ -78,41 +103,132 @@ class DelegateWallet:
         
         self.delegate_file = self.config_dir / "delegate_key.enc"
         self.salt_file = self.config_dir / ".delegate_salt"
+        self._salt: Optional[bytes] = None
+        # Derived keys by sha256(kdf + salt + password); the KDF runs once per session
+        self._key_cache: Dict[bytes, bytes] = {}
+        # Last decrypted config with the (file stamp, kdf, key) it was read under
+        self._config_cache: Optional[tuple] = None
         self._ensure_config_dir()
     
     def _ensure_config_dir(self):
         """Ensure the config directory exists."""
         self.config_dir.mkdir(parents=True, exist_ok=True)
     
-    def _derive_key(self, password: str) -> bytes:
+    def _derive_key(self, password: str, kdf_name: str = _KDF_SCRYPT) -> bytes:
         """
-        Derive encryption key from password using PBKDF2.
+        Derive encryption key from password.
+        
+        New delegations use scrypt, which is memory-hard and cheaper for us
+        than PBKDF2 at a comparable cost to an attacker. PBKDF2 is kept for
+        reading delegations saved before the switch.
         
         Args:
             password: User password
+            kdf_name: _KDF_SCRYPT or _KDF_PBKDF2
             
         Returns:
             Derived encryption key
         """
-        # Get or create salt
-        if self.salt_file.exists():
-            with open(self.salt_file, 'rb') as f:
-                salt = f.read()
+        salt = self._get_salt()
+        
+        cache_key = hashlib.sha256(kdf_name.encode() + salt + password.encode()).digest()
+        key = self._key_cache.get(cache_key)
+        if key is not None:
+            return key
+        
+        if kdf_name == _KDF_SCRYPT:
+            kdf = Scrypt(salt=salt, length=32, n=2**15, r=8, p=1)
         else:
-            salt = os.urandom(16)
-            with open(self.salt_file, 'wb') as f:
-                f.write(salt)
-        
-        # Derive key using PBKDF2HMAC
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=480000,
-        )
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=480000,
+            )
         key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        self._key_cache[cache_key] = key
         return key
     
+    def _get_salt(self) -> bytes:
+        """Get or create the key derivation salt, reading the file only once."""
+        if self._salt is None:
+            if self.salt_file.exists():
+                with open(self.salt_file, 'rb') as f:
+                    self._salt = f.read()
+            else:
+                self._salt = os.urandom(16)
+                with open(self.salt_file, 'wb') as f:
+                    f.write(self._salt)
+        return self._salt
+    
+    def clear_key_cache(self):
+        """Forget derived keys and decrypted config held in memory."""
+        self._key_cache.clear()
+        self._config_cache = None
+    
+    def _file_stamp(self) -> tuple:
+        """Modification time and size of the delegation file."""
+        stat = self.delegate_file.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_config(self, password: str) -> DelegationConfig:
+        """
+        Decrypt the stored delegation config.
+        
+        load_delegate, get_delegation_info and is_valid are often called
+        back to back, so the result is reused while the file is unchanged.
+        
+        Args:
+            password: Password for decryption
+            
+        Returns:
+            Decrypted DelegationConfig
+        """
+        file_stamp = self._file_stamp()
+        if self._config_cache is not None:
+            (cached_stamp, kdf_name, key), config = self._config_cache
+            if cached_stamp == file_stamp and self._derive_key(password, kdf_name) == key:
+                return config
+        
+        with open(self.delegate_file, 'rb') as f:
+            encrypted = f.read()
+        
+        if encrypted.startswith(_SCRYPT_MARKER):
+            kdf_name = _KDF_SCRYPT
+            encrypted = encrypted[len(_SCRYPT_MARKER):]
+        else:
+            kdf_name = _KDF_PBKDF2
+        
+        key = self._derive_key(password, kdf_name)
+        decrypted = Fernet(key).decrypt(encrypted)
+        config = DelegationConfig.from_dict(msgspec.json.decode(decrypted))
+        
+        if kdf_name == _KDF_PBKDF2:
+            # Re-encrypt older delegations under scrypt now that we have the password
+            self._write_config(config, password)
+        else:
+            self._config_cache = ((file_stamp, kdf_name, key), config)
+        return config
+    
+    def _write_config(self, config: DelegationConfig, password: str):
+        """
+        Encrypt the delegation config under a scrypt key and save it.
+        
+        Args:
+            config: Delegation config to store
+            password: Password for encryption
+        """
+        key = self._derive_key(password)
+        encrypted = _SCRYPT_MARKER + Fernet(key).encrypt(msgspec.json.encode(config.to_dict()))
+        
+        # Write then rename so a delegation being replaced is never left half written
+        tmp_file = self.delegate_file.with_suffix(".tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(encrypted)
+        os.replace(tmp_file, self.delegate_file)
+        
+        self._config_cache = ((self._file_stamp(), _KDF_SCRYPT, key), config)
+    
     def generate_delegate(self) -> Keypair:
         """
         Generate a new delegate keypair.
@@ -159,18 +275,8 @@ class DelegateWallet:
             expires_at=expires_at
         )
         
-        # Derive encryption key from password
-        key = self._derive_key(password)
-        fernet = Fernet(key)
-        
-        # Encrypt the config
-        config_json = json.dumps(config.to_dict())
-        encrypted = fernet.encrypt(config_json.encode())
-        
-        # Save encrypted data
-        with open(self.delegate_file, 'wb') as f:
-            f.write(encrypted)
-        
+        # Encrypt and save the config
+        self._write_config(config, password)
         return config
     
     def load_delegate(self, password: str) -> Keypair:
@@ -190,24 +296,13 @@ class DelegateWallet:
         if not self.delegate_file.exists():
             raise FileNotFoundError("No delegation found. Please create a delegation first.")
         
-        # Derive encryption key
-        key = self._derive_key(password)
-        fernet = Fernet(key)
-        
         try:
             # Read and decrypt
-            with open(self.delegate_file, 'rb') as f:
-                encrypted = f.read()
-            
-            decrypted = fernet.decrypt(encrypted)
-            config_data = json.loads(decrypted)
-            config = DelegationConfig.from_dict(config_data)
+            config = self._read_config(password)
             
             # Check if delegation is expired
-            if config.expires_at:
-                expires = datetime.fromisoformat(config.expires_at)
-                if datetime.now(timezone.utc) > expires:
-                    raise ValueError("Delegation has expired. Please create a new delegation.")
+            if config.is_expired():
+                raise ValueError("Delegation has expired. Please create a new delegation.")
             
             # Return keypair
             return Keypair.from_bytes(config.secret_key)
@@ -231,15 +326,7 @@ class DelegateWallet:
             return None
         
         try:
-            key = self._derive_key(password)
-            fernet = Fernet(key)
-            
-            with open(self.delegate_file, 'rb') as f:
-                encrypted = f.read()
-            
-            decrypted = fernet.decrypt(encrypted)
-            config_data = json.loads(decrypted)
-            return DelegationConfig.from_dict(config_data)
+            return self._read_config(password)
         
         except Exception:
             return None
@@ -259,11 +346,7 @@ class DelegateWallet:
             if not config:
                 return False
             
-            if config.expires_at:
-                expires = datetime.fromisoformat(config.expires_at)
-                return datetime.now(timezone.utc) <= expires
-            
-            return True
+            return not config.is_expired()
         except Exception:
             return False
     
@@ -273,6 +356,8 @@ class DelegateWallet:
             self.delegate_file.unlink()
         if self.salt_file.exists():
             self.salt_file.unlink()
+        self._salt = None
+        self.clear_key_cache()
     
     def delegation_exists(self) -> bool:
         """Check if a delegation file exists."""
@@ -364,6 +449,8 @@ def clear_session_password():
     """Clear the cached delegation password."""
     global _session_password
     _session_password = None
+    if _delegate_wallet is not None:
+        _delegate_wallet.clear_key_cache()
 
 
 def get_delegate_wallet() -> DelegateWallet:
@@ -381,19 +468,19 @@ def process_temp_delegation() -> bool:
     Returns:
         True if a temp file was processed, False otherwise
     """
-    from pathlib import Path
-    import json
-    
     config_dir = Path.home() / ".maximus"
     temp_file = config_dir / "delegate_temp.json"
     
-    if not temp_file.exists():
+    # Opening directly avoids a separate stat() on the usual no-file path
+    try:
+        fd = os.open(temp_file, os.O_RDONLY)
+    except FileNotFoundError:
         return False
     
     try:
-        # Read temp file
-        with open(temp_file, 'r') as f:
-            data = json.load(f)
+        # Read temp file as bytes; msgspec parses it without a text decode
+        with os.fdopen(fd, 'rb') as f:
+            data = msgspec.json.decode(f.read())
         
         # Extract data
         secret_key_list = data.get('secretKey', [])
@@ -405,7 +492,6 @@ def process_temp_delegation() -> bool:
         
         # Calculate duration from expiry if available
         if 'expiresAt' in data and 'createdAt' in data:
-            from datetime import datetime
             expires = datetime.fromisoformat(data['expiresAt'].replace('Z', '+00:00'))
             created = datetime.fromisoformat(data['createdAt'].replace('Z', '+00:00'))
             duration_hours = int((expires - created).total_seconds() / 3600)
@@ -428,7 +514,8 @@ def process_temp_delegation() -> bool:
         # Delete temp file
         temp_file.unlink()
         
-        print(f"✅ Delegation activated! Delegate wallet: {str(keypair.pubkey())[:8]}...{str(keypair.pubkey())[-8:]}")
+        pubkey = str(keypair.pubkey())
+        print(f"✅ Delegation activated! Delegate wallet: {pubkey[:8]}...{pubkey[-8:]}")
         print(f"   Max SOL per transaction: {max_sol_per_tx}")
         print(f"   Max tokens per transaction: {max_token_per_tx}")
         print(f"   Duration: {duration_hours} hours")
@@ -1,26 +1,45 @@
 import os
+import re
+import sys
+from functools import lru_cache
+from importlib import metadata
 from pathlib import Path
 
-try:
-    import tomli
-except ImportError:
-    import tomllib as tomli
+# Only the [project] version is needed, so pyproject.toml is scanned
+# rather than parsed into a dict that would be thrown away
+_TABLE_HEADER_RE = re.compile(r"^\[", re.MULTILINE)
+_VERSION_RE = re.compile(r'^version\s*=\s*"([^"]+)"', re.MULTILINE)
 
+@lru_cache(maxsize=1)
 def get_version():
-    """Get version from pyproject.toml"""
+    """Get version from the installed package metadata, else pyproject.toml"""
+    try:
+        return metadata.version("maximus")
+    except metadata.PackageNotFoundError:
+        pass
+    
     try:
         # Get path to pyproject.toml (3 levels up from this file)
         project_root = Path(__file__).parent.parent.parent.parent
         pyproject_path = project_root / "pyproject.toml"
         
-        with open(pyproject_path, "rb") as f:
-            data = tomli.load(f)
-            return data["project"]["version"]
-    except (FileNotFoundError, KeyError):
-        return "0.1.0"
+        text = pyproject_path.read_text(encoding="utf-8")
+        
+        # Limit the search to the [project] table
+        start = text.index("[project]\n") + len("[project]\n")
+        next_table = _TABLE_HEADER_RE.search(text, start)
+        section = text[start:next_table.start() if next_table else len(text)]
+        
+        match = _VERSION_RE.search(section)
+        if match:
+            return match.group(1)
+    except (FileNotFoundError, ValueError):
+        pass
+    return "0.1.0"
 
+@lru_cache(maxsize=1)
 def check_api_status():
-    """Check if API keys are configured."""
+    """Check if API keys are configured; the environment is read once per process."""
     openai_key = os.getenv("OPENAI_API_KEY")
     coingecko_key = os.getenv("COINGECKO_API_KEY")
     titan_key = os.getenv("TITAN_API_TOKEN")
@@ -29,19 +48,19 @@ def check_api_status():
     statuses = []
     
     # Check OpenAI API key for Intelligence
-    if openai_key and len(openai_key) > 0:
+    if openai_key:
         statuses.append(("Intelligence", " ✓", "\033[92m", False))  # Green
     else:
         statuses.append(("Intelligence", " ✗", "\033[91m", False))  # Red
     
     # Check OpenAI API key for Memory
-    if openai_key and len(openai_key) > 0:
+    if openai_key:
         statuses.append(("Memory", " ✓", "\033[92m", False))  # Green
     else:
         statuses.append(("Memory", " ✗", "\033[91m", False))  # Red
     
     # Check CoinGecko API key
-    if coingecko_key and len(coingecko_key) > 0:
+    if coingecko_key:
         statuses.append(("Market Data", " ✓", "\033[92m", False))  # Green
     else:
         statuses.append(("Market Data", " ✗", "\033[91m", False))  # Red
@@ -51,12 +70,21 @@ def check_api_status():
         statuses.append(("WebSocket", " ✓", "\033[92m", False))  # Green - connects in background
     
     # Check Titan API token (for token swaps)
-    if titan_key and len(titan_key) > 0:
+    if titan_key:
         statuses.append(("Token Swapping", " ✓", "\033[92m", False))  # Green
     else:
         statuses.append(("Token Swapping", " ✗ (disabled)", "\033[93m", False))  # Yellow
     
-    return statuses
+    # Cached, so hand out an immutable copy
+    return tuple(statuses)
+
+@lru_cache(maxsize=1)
+def _status_block():
+    """Render the API status lines once; they only depend on the environment."""
+    return "".join(
+        f"{color}{symbol}\033[0m \033[2m{api_name}\033[0m\n"
+        for api_name, symbol, color, is_async in check_api_status()
+    )
 
 def print_intro(session_id: str = None):
     """Display the welcome screen with compact logo."""
@@ -68,7 +96,7 @@ def print_intro(session_id: str = None):
     GREEN = "\033[92m"
     
     # Clear screen effect with some spacing
-    print("\n" * 2)
+    out = ["\n" * 3]
     
     version = get_version()
     
@@ -82,18 +110,18 @@ def print_intro(session_id: str = None):
 #     logo = f"""{BOLD}{LIGHT_ORANGE} █▄█▄█ ▄▀█ ▀▄▀ █ █▄█▄█ █ █ ▄▀█{RESET}  {BOLD}MAXIMUS{RESET} {DIM}v{version}{RESET}
 # {BOLD}{LIGHT_ORANGE} █ ▄ █ █▀█ █░█ █ █ ▄ █ █▄█ ▄▄█{RESET}  {DIM}Autonomous agent for onchain asset analysis and transaction execution{RESET}"""
     
-    print(icon_logo)
-    print()
+    out.append(f"{icon_logo}\n\n")
     
     # Session info
     if session_id:
-        print(f"{GREEN} ✓{RESET} {DIM}Session initialized (ID: {session_id[:8]}){RESET}")
+        out.append(f"{GREEN} ✓{RESET} {DIM}Session initialized (ID: {session_id[:8]}){RESET}\n")
     
     # API connection status
-    api_statuses = check_api_status()
-    for api_name, symbol, color, is_async in api_statuses:
-        print(f"{color}{symbol}{RESET} {DIM}{api_name}{RESET}")
+    out.append(_status_block())
+    out.append("\n")
     
-    print()
+    # One write for the whole screen rather than one per line
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
 
 
@@ -12,10 +12,34 @@ from maximus.tools.api import call_api
 from maximus.tools.realtime_prices import get_price_cache, get_websocket_manager
 from maximus.utils.ui import Colors
 
+# Redraw cap while prices stream in (5 fps)
+MIN_FRAME_INTERVAL = 0.2
+# Redraw at least this often when idle so the age column keeps ticking
+IDLE_REFRESH_INTERVAL = 1.0
+
+# (lower bound, bound format) pairs, largest first; the last entry also
+# catches anything below every bound
+PRICE_BUCKETS = (
+    (1000, "${:,.2f}".format),
+    (1, "${:.4f}".format),
+    (0.01, "${:.6f}".format),
+    (0, "${:.8f}".format),
+)
+# (lower bound, divisor, bound format) for volumes
+VOLUME_BUCKETS = (
+    (1_000_000_000, 1_000_000_000, "${:.1f}B".format),
+    (1_000_000, 1_000_000, "${:.0f}M".format),
+    (1_000, 1_000, "${:.0f}K".format),
+    (0, 1, "${:.0f}".format),
+)
+
 
 class LivePriceMonitor:
     """Monitors and displays live cryptocurrency prices in a grid."""
     
+    # Box border piece repeated on every line
+    BORDER = f"{Colors.BOLD}║{Colors.ENDC}"
+    
     def __init__(self, limit: int = 10):
         self.limit = limit
         self.tokens: List[Dict] = []
@@ -24,6 +48,24 @@ class LivePriceMonitor:
         self.manager = get_websocket_manager()
         self.refresh_count = 0
         self.last_refresh = time.time()
+        # Formatted row text before the age column, by coin id, with the
+        # values it was built from; most rows don't change between frames
+        self._row_cache: Dict[str, tuple[tuple, str]] = {}
+        
+        # Header lines that only depend on the token limit, built once
+        title = f" {Colors.RED}🔴 LIVE PRICES{Colors.ENDC} - Top {limit} Tokens"
+        title_pad = 78 - len('🔴 LIVE PRICES') - len(f' - Top {limit} Tokens') - 1
+        self._header_top = [
+            f"\n{Colors.BOLD}╔{'═'*78}╗{Colors.ENDC}",
+            f"{self.BORDER}{title}{' ' * title_pad}{self.BORDER}",
+        ]
+        self._header_bottom = [
+            f"{Colors.BOLD}╠{'═'*78}╣{Colors.ENDC}",
+            f"{self.BORDER}  # {'Symbol':<8} {'Price':<16} {'24h Change':<18} {'Volume':<12} {'Updated':<10}{self.BORDER}",
+            f"{Colors.BOLD}╟{'─'*78}╢{Colors.ENDC}",
+        ]
+        # Stats line width without its three counters
+        self._stats_pad = 78 - len(" ⚡  live |  REST | Refresh #") - 2
     
     def fetch_top_tokens(self) -> List[Dict]:
         """Fetch top tokens by market cap from CoinGecko."""
@@ -65,14 +107,10 @@ class LivePriceMonitor:
     
     def format_price(self, price: float) -> str:
         """Format price with appropriate decimal places."""
-        if price >= 1000:
-            return f"${price:,.2f}"
-        elif price >= 1:
-            return f"${price:.4f}"
-        elif price >= 0.01:
-            return f"${price:.6f}"
-        else:
-            return f"${price:.8f}"
+        for bound, fmt in PRICE_BUCKETS:
+            if price >= bound:
+                return fmt(price)
+        return fmt(price)
     
     def format_change(self, change_pct: Optional[float]) -> str:
         """Format 24h change with color and arrow."""
@@ -96,14 +134,10 @@ class LivePriceMonitor:
         if volume is None:
             return "N/A"
         
-        if volume >= 1_000_000_000:
-            return f"${volume/1_000_000_000:.1f}B"
-        elif volume >= 1_000_000:
-            return f"${volume/1_000_000:.0f}M"
-        elif volume >= 1_000:
-            return f"${volume/1_000:.0f}K"
-        else:
-            return f"${volume:.0f}"
+        for bound, divisor, fmt in VOLUME_BUCKETS:
+            if volume >= bound:
+                return fmt(volume / divisor)
+        return fmt(volume)
     
     def format_age(self, age_seconds: float, is_live: bool) -> str:
         """Format data age indicator."""
@@ -121,66 +155,91 @@ class LivePriceMonitor:
         """Clear terminal screen."""
         print("\033[2J\033[H", end="")
     
-    def render_header(self):
-        """Render the dashboard header."""
+    def render_header(self) -> List[str]:
+        """Render the dashboard header lines."""
         # Count live vs REST prices
         live_count = sum(1 for token in self.tokens if self.cache.get(token.get("id")))
         rest_count = len(self.tokens) - live_count
         
-        # Calculate uptime
-        uptime = int(time.time() - self.last_refresh) if self.refresh_count == 0 else 0
+        # Top border and title are static
+        lines = list(self._header_top)
         
-        print(f"\n{Colors.BOLD}╔{'═'*78}╗{Colors.ENDC}")
+        # Second line: Stats
+        live, rest, refresh = str(live_count), str(rest_count), str(self.refresh_count)
+        stats = f" {Colors.GREEN}⚡ {live} live{Colors.ENDC} | {Colors.DIM}{rest} REST{Colors.ENDC} | Refresh #{refresh}"
+        padding = self._stats_pad - len(live) - len(rest) - len(refresh)
+        lines.append(f"{self.BORDER}{stats}{' ' * padding}{self.BORDER}")
         
-        # First line: Title
-        title = f" {Colors.RED}🔴 LIVE PRICES{Colors.ENDC} - Top {self.limit} Tokens"
-        print(f"{Colors.BOLD}║{Colors.ENDC}{title}{' ' * (78 - len('🔴 LIVE PRICES') - len(f' - Top {self.limit} Tokens') - 1)}{Colors.BOLD}║{Colors.ENDC}")
+        lines.extend(self._header_bottom)
+        return lines
+    
+    def prepare_token(self, token: Dict) -> tuple:
+        """
+        Format the fields of a token that only change when tokens are refetched.
         
-        # Second line: Stats
-        stats = f" {Colors.GREEN}⚡ {live_count} live{Colors.ENDC} | {Colors.DIM}{rest_count} REST{Colors.ENDC} | Refresh #{self.refresh_count}"
-        stats_plain = f" ⚡ {live_count} live | {rest_count} REST | Refresh #{self.refresh_count}"
-        padding = 78 - len(stats_plain) - 2
-        print(f"{Colors.BOLD}║{Colors.ENDC}{stats}{' ' * padding}{Colors.BOLD}║{Colors.ENDC}")
-        
-        print(f"{Colors.BOLD}╠{'═'*78}╣{Colors.ENDC}")
-        print(f"{Colors.BOLD}║{Colors.ENDC}  # {'Symbol':<8} {'Price':<16} {'24h Change':<18} {'Volume':<12} {'Updated':<10}{Colors.BOLD}║{Colors.ENDC}")
-        print(f"{Colors.BOLD}╟{'─'*78}╢{Colors.ENDC}")
+        Returns:
+            (symbol, change_str, volume_str), also stored on the token
+        """
+        static = (
+            token.get("symbol", "").upper(),
+            self.format_change(token.get("price_change_percentage_24h")),
+            self.format_volume(token.get("total_volume")),
+        )
+        token["_static"] = static
+        return static
     
-    def render_row(self, rank: int, token: Dict):
+    def render_row(self, rank: int, token: Dict) -> str:
         """Render a single token row."""
         coin_id = token.get("id", "")
-        symbol = token.get("symbol", "").upper()
         fallback_price = token.get("current_price", 0)
-        change_24h = token.get("price_change_percentage_24h")
-        volume = token.get("total_volume")
+        static = token.get("_static") or self.prepare_token(token)
         
         # Get live price from cache
         price, age, is_live = self.get_live_price(coin_id, fallback_price)
         
-        # Format data
-        price_str = self.format_price(price)
-        change_str = self.format_change(change_24h)
-        volume_str = self.format_volume(volume)
+        # Reuse the formatted row unless its values changed; only the age
+        # column moves on every frame
+        key = (rank, price, static)
+        cached = self._row_cache.get(coin_id)
+        if cached is not None and cached[0] == key:
+            row = cached[1]
+        else:
+            symbol, change_str, volume_str = static
+            price_str = self.format_price(price)
+            row = f"{self.BORDER} {rank:2d}  {symbol:<8} {price_str:<16} {change_str:<28} {volume_str:<12} "
+            self._row_cache[coin_id] = (key, row)
+        
         age_str = self.format_age(age, is_live)
         
         # Render row
-        print(f"{Colors.BOLD}║{Colors.ENDC} {rank:2d}  {symbol:<8} {price_str:<16} {change_str:<28} {volume_str:<12} {age_str:<18}{Colors.BOLD}║{Colors.ENDC}")
+        return f"{row}{age_str:<18}{self.BORDER}"
     
-    def render_footer(self):
-        """Render the dashboard footer."""
-        print(f"{Colors.BOLD}╚{'═'*78}╝{Colors.ENDC}")
-        print(f"\n{Colors.DIM}Press Ctrl+C to exit | Updates every 0.3s | ⚡ = Real-time websocket data{Colors.ENDC}\n")
+    def render_footer(self) -> List[str]:
+        """Render the dashboard footer lines."""
+        return [
+            f"{Colors.BOLD}╚{'═'*78}╝{Colors.ENDC}",
+            f"\n{Colors.DIM}Press Ctrl+C to exit | Updates as prices arrive | ⚡ = Real-time websocket data{Colors.ENDC}\n",
+        ]
     
     def render_dashboard(self):
         """Render the complete dashboard."""
-        self.clear_screen()
         self.refresh_count += 1
-        self.render_header()
+        lines = self.render_header()
         
         for i, token in enumerate(self.tokens, 1):
-            self.render_row(i, token)
+            lines.append(self.render_row(i, token))
+        
+        lines.extend(self.render_footer())
         
-        self.render_footer()
+        # Overwrite the previous frame in place: home the cursor, clear the rest
+        # of each line as it is written and anything left below the frame.
+        # Only the first frame wipes the whole screen
+        home = "\033[2J\033[H" if self.refresh_count == 1 else "\033[H"
+        frame = ("\n".join(lines) + "\n").replace("\n", "\033[K\n")
+        
+        # Draw the whole frame with one write instead of a print per line
+        sys.stdout.write(home + frame + "\033[J")
+        sys.stdout.flush()
     
     def start(self):
         """Start the live price monitor."""
@@ -197,6 +256,10 @@ class LivePriceMonitor:
             print(f"{Colors.RED}Failed to fetch tokens. Exiting.{Colors.ENDC}\n")
             return
         
+        # Symbol, 24h change and volume are fixed until the next fetch
+        for token in self.tokens:
+            self.prepare_token(token)
+        
         print(f"{Colors.GREEN}✓{Colors.ENDC} Fetched {len(self.tokens)} tokens")
         print(f"{Colors.LIGHT_ORANGE}Starting websocket manager...{Colors.ENDC}")
         
@@ -235,10 +298,21 @@ class LivePriceMonitor:
         self.last_refresh = time.time()
         time.sleep(0.5)
         
+        updated = self.cache.updated
+        
         try:
             while self.running:
                 self.render_dashboard()
-                time.sleep(0.3)  # Update every 300ms for smoother display
+                last_render = time.monotonic()
+                
+                # Sleep until a price arrives rather than polling
+                updated.wait(timeout=IDLE_REFRESH_INTERVAL)
+                updated.clear()
+                
+                # Coalesce bursts of updates into at most one frame per interval
+                delay = MIN_FRAME_INTERVAL - (time.monotonic() - last_render)
+                if delay > 0:
+                    time.sleep(delay)
         
         except KeyboardInterrupt:
             self.stop()
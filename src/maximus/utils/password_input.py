@@ -1,6 +1,7 @@
+import os
 import sys
+import codecs
 import getpass
-from typing import Optional
 
 # Try to import POSIX-specific modules
 try:
@@ -18,6 +19,20 @@ except ImportError:
     IS_WINDOWS = False
 
 
+def _pop_char(password: bytearray):
+    """Remove the last UTF-8 encoded character from the password buffer."""
+    # Step back over continuation bytes (0b10xxxxxx) to the lead byte
+    end = len(password) - 1
+    while end > 0 and 0x80 <= password[end] <= 0xBF:
+        end -= 1
+    del password[end:]
+
+
+def _wipe_password(password: bytearray):
+    """Overwrite the password buffer with zeros."""
+    password[:] = b'\0' * len(password)
+
+
 def _get_password_posix(prompt: str) -> str:
     """
     POSIX implementation of password input with asterisks.
@@ -25,7 +40,7 @@ def _get_password_posix(prompt: str) -> str:
     """
     print(prompt, end='', flush=True)
     
-    password = []
+    password = bytearray()
     
     # Save terminal settings
     fd = sys.stdin.fileno()
@@ -35,43 +50,58 @@ def _get_password_posix(prompt: str) -> str:
         # Set terminal to raw mode
         tty.setraw(fd)
         
-        while True:
-            char = sys.stdin.read(1)
-            
-            # Handle Enter/Return
-            if char in ('\r', '\n'):
-                print()  # New line
-                break
+        # Read whatever is available at once so a pasted password takes one
+        # read, decoding incrementally in case a character spans two reads
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        done = False
+        
+        while not done:
+            chunk = os.read(fd, 64)
+            # Treat end of input like Ctrl+D
+            chars = decoder.decode(chunk) if chunk else '\x04'
+            echo = []
             
-            # Handle Backspace (both ASCII 127 and 8)
-            elif char in ('\x7f', '\x08'):
-                if password:
-                    password.pop()
-                    # Erase the asterisk
-                    sys.stdout.write('\b \b')
+            for char in chars:
+                # Handle Enter/Return
+                if char in ('\r', '\n'):
+                    echo.append('\n')  # New line
+                    done = True
+                    break
+                
+                # Handle Backspace (both ASCII 127 and 8)
+                elif char in ('\x7f', '\x08'):
+                    if password:
+                        _pop_char(password)
+                        # Erase the asterisk
+                        echo.append('\b \b')
+                
+                # Handle Ctrl+C
+                elif char == '\x03':
+                    sys.stdout.write(''.join(echo) + '\n')
                     sys.stdout.flush()
+                    raise KeyboardInterrupt
+                
+                # Handle Ctrl+D (EOF)
+                elif char == '\x04':
+                    echo.append('\n')
+                    done = True
+                    break
+                
+                # Handle printable characters (Unicode-safe: accepts accents, emoji, etc.)
+                elif char.isprintable():
+                    password.extend(char.encode('utf-8'))
+                    echo.append('*')
             
-            # Handle Ctrl+C
-            elif char == '\x03':
-                print()
-                raise KeyboardInterrupt
-            
-            # Handle Ctrl+D (EOF)
-            elif char == '\x04':
-                print()
-                break
-            
-            # Handle printable characters (Unicode-safe: accepts accents, emoji, etc.)
-            elif char.isprintable():
-                password.append(char)
-                sys.stdout.write('*')
-                sys.stdout.flush()
+            # One write per chunk rather than per character
+            sys.stdout.write(''.join(echo))
+            sys.stdout.flush()
         
+        return password.decode('utf-8')
+    
     finally:
-        # Restore terminal settings
+        # Restore terminal settings and wipe the buffer, on Ctrl+C too
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    
-    return ''.join(password)
+        _wipe_password(password)
 
 
 def _get_password_windows(prompt: str) -> str:
@@ -81,7 +111,7 @@ def _get_password_windows(prompt: str) -> str:
     """
     print(prompt, end='', flush=True)
     
-    password = []
+    password = bytearray()
     
     try:
         while True:
@@ -96,7 +126,7 @@ def _get_password_windows(prompt: str) -> str:
             # Handle Backspace
             elif char in (b'\x08', b'\x7f'):
                 if password:
-                    password.pop()
+                    _pop_char(password)
                     # Erase the asterisk
                     sys.stdout.write('\b \b')
                     sys.stdout.flush()
@@ -117,18 +147,22 @@ def _get_password_windows(prompt: str) -> str:
                     # Decode the byte to a character
                     decoded_char = char.decode('utf-8', errors='ignore')
                     if decoded_char and decoded_char.isprintable():
-                        password.append(decoded_char)
+                        password.extend(decoded_char.encode('utf-8'))
                         sys.stdout.write('*')
                         sys.stdout.flush()
                 except (UnicodeDecodeError, AttributeError):
                     # Skip characters that can't be decoded
                     pass
+        
+        return password.decode('utf-8')
     
     except KeyboardInterrupt:
         print()
         raise
     
-    return ''.join(password)
+    finally:
+        # Wipe the buffer, on Ctrl+C too
+        _wipe_password(password)
 
 
 def _get_password_fallback(prompt: str) -> str:
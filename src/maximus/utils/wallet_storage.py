@@ -1,16 +1,27 @@
-import json
 import os
+import msgspec
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from pydantic import BaseModel, Field
 
 
-class WalletConfig(BaseModel):
+@dataclass(slots=True)
+class WalletConfig:
     """Model for a stored wallet configuration."""
-    address: str = Field(description="Solana wallet public key address")
-    label: Optional[str] = Field(default=None, description="User-friendly label for the wallet")
-    added_at: str = Field(default_factory=lambda: datetime.now().isoformat(), description="Timestamp when wallet was added")
+    # Solana wallet public key address
+    address: str
+    # User-friendly label for the wallet
+    label: Optional[str] = None
+    # Timestamp when wallet was added
+    added_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "WalletConfig":
+        """Create from a stored entry, ignoring unknown keys."""
+        if "added_at" in data:
+            return cls(address=data["address"], label=data.get("label"), added_at=data["added_at"])
+        return cls(address=data["address"], label=data.get("label"))
 
 
 class WalletStorage:
@@ -29,32 +40,84 @@ class WalletStorage:
             self.config_dir = Path.home() / ".maximus"
         
         self.config_file = self.config_dir / "wallets.json"
+        # Last parsed config with the file stamp it was read under; callers
+        # treat it as read-only and write changes through _write_config
+        self._cache: Optional[dict] = None
+        self._cache_stamp: Optional[tuple] = None
+        # Wallet entries of the cached config by address, for O(1) lookups
+        self._index: Dict[str, dict] = {}
+        # Bytes of the last write, to skip rewriting identical content
+        self._last_written: Optional[bytes] = None
         self._ensure_config_dir()
     
     def _ensure_config_dir(self):
         """Ensure the config directory exists."""
         self.config_dir.mkdir(parents=True, exist_ok=True)
     
+    def _file_stamp(self) -> Optional[tuple]:
+        """Modification time and size of the config file, or None if missing."""
+        try:
+            stat = self.config_file.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
     def _read_config(self) -> dict:
-        """Read the wallet configuration file."""
-        if not self.config_file.exists():
-            return {"wallets": []}
+        """Read the wallet configuration file, reusing the last parse while it is unchanged."""
+        stamp = self._file_stamp()
+        if self._cache is not None and stamp == self._cache_stamp:
+            return self._cache
         
         try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {"wallets": []}
+            config = msgspec.json.decode(self.config_file.read_bytes())
+        except (msgspec.DecodeError, OSError):
+            # Missing or unreadable file means no wallets yet
+            config = {"wallets": []}
+        
+        self._set_cache(config, stamp)
+        return config
     
     def _write_config(self, config: dict):
         """Write the wallet configuration file."""
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Keep the file indented for hand editing, as json.dump(indent=2) did
+        data = msgspec.json.format(msgspec.json.encode(config), indent=2)
+        if data == self._last_written and self._file_stamp() == self._cache_stamp:
+            # Same content as the file we last wrote, which nobody has touched since
+            self._set_cache(config, self._cache_stamp)
+            return
+        
+        # Write then rename so a crash never leaves a truncated wallets file
+        tmp_file = self.config_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, self.config_file)
+        
+        self._last_written = data
+        self._set_cache(config, self._file_stamp())
+    
+    def _set_cache(self, config: dict, stamp: Optional[tuple]):
+        """Remember a parsed config and index its wallets by address."""
+        self._cache, self._cache_stamp = config, stamp
+        # The file stays a list; keep the first entry if an address repeats
+        self._index = {}
+        for wallet in config.get("wallets", []):
+            self._index.setdefault(wallet.get("address"), wallet)
+    
+    def _wallet_index(self) -> Dict[str, dict]:
+        """Current wallet entries by address."""
+        self._read_config()
+        return self._index
+    
+    def clear_cache(self):
+        """Forget the parsed config so the next read goes to disk."""
+        self._cache = None
+        self._cache_stamp = None
+        self._index = {}
+        self._last_written = None
     
     def get_wallets(self) -> List[WalletConfig]:
         """Get all stored wallet configurations."""
         config = self._read_config()
-        return [WalletConfig(**wallet) for wallet in config.get("wallets", [])]
+        return [WalletConfig.from_dict(wallet) for wallet in config.get("wallets", [])]
     
     def add_wallet(self, address: str, label: Optional[str] = None) -> WalletConfig:
         """
@@ -71,15 +134,14 @@ class WalletStorage:
         wallets = config.get("wallets", [])
         
         # Check if wallet already exists
-        if any(w.get("address") == address for w in wallets):
+        if address in self._index:
             raise ValueError(f"Wallet {address} already exists")
         
         # Create new wallet config
         wallet = WalletConfig(address=address, label=label)
-        wallets.append(wallet.model_dump(exclude_none=True))
         
-        config["wallets"] = wallets
-        self._write_config(config)
+        # Build a new config rather than mutating the cached one
+        self._write_config({**config, "wallets": wallets + [{k: v for k, v in asdict(wallet).items() if v is not None}]})
         
         return wallet
     
@@ -94,23 +156,18 @@ class WalletStorage:
             True if wallet was removed, False if not found
         """
         config = self._read_config()
-        wallets = config.get("wallets", [])
-        
-        original_count = len(wallets)
-        wallets = [w for w in wallets if w.get("address") != address]
-        
-        if len(wallets) == original_count:
+        if address not in self._index:
             return False
         
-        config["wallets"] = wallets
-        self._write_config(config)
+        wallets = [w for w in config.get("wallets", []) if w.get("address") != address]
+        self._write_config({**config, "wallets": wallets})
         
         return True
     
     def get_wallet(self, address: str) -> Optional[WalletConfig]:
         """Get a specific wallet by address."""
-        wallets = self.get_wallets()
-        return next((w for w in wallets if w.address == address), None)
+        wallet = self._wallet_index().get(address)
+        return WalletConfig.from_dict(wallet) if wallet is not None else None
     
     def update_wallet_label(self, address: str, label: str) -> bool:
         """
@@ -124,16 +181,14 @@ class WalletStorage:
             True if updated, False if wallet not found
         """
         config = self._read_config()
-        wallets = config.get("wallets", [])
-        
-        for wallet in wallets:
-            if wallet.get("address") == address:
-                wallet["label"] = label
-                config["wallets"] = wallets
-                self._write_config(config)
-                return True
+        wallet = self._index.get(address)
+        if wallet is None:
+            return False
         
-        return False
+        # Replace the entry with a copy so the cached config stays untouched
+        updated = [{**w, "label": label} if w is wallet else w for w in config.get("wallets", [])]
+        self._write_config({**config, "wallets": updated})
+        return True
     
     def clear_wallets(self):
         """Remove all stored wallets."""
@@ -0,0 +1,130 @@
+"""
+Tests for encrypted delegate wallet storage.
+
+Run with: uv run pytest tests/test_delegate_wallet.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+from maximus.utils.delegate_wallet import DelegateWallet, DelegationConfig
+
+
+@pytest.fixture
+def wallet(tmp_path):
+    """Delegate wallet manager rooted in a temporary config dir."""
+    return DelegateWallet(config_dir=str(tmp_path))
+
+
+class TestKeyDerivation:
+    """Test password key derivation and its session cache."""
+    
+    def test_derived_key_cached_per_password(self, wallet):
+        """The KDF should run once per password, not on every call."""
+        keypair = wallet.generate_delegate()
+        wallet.save_delegate(keypair, "secret", delegated_by="main")
+        
+        with patch("maximus.utils.delegate_wallet.Scrypt") as kdf:
+            assert wallet.load_delegate("secret") == keypair
+            assert wallet.is_valid("secret")
+            kdf.assert_not_called()
+    
+    def test_wrong_password_rejected(self, wallet):
+        """A cached key for one password must not unlock with another."""
+        wallet.save_delegate(wallet.generate_delegate(), "secret", delegated_by="main")
+        
+        assert wallet.is_valid("secret")
+        assert not wallet.is_valid("other")
+        with pytest.raises(Exception):
+            wallet.load_delegate("other")
+    
+    def test_revoke_clears_cache(self, wallet):
+        """Revoking should drop derived keys and the salt."""
+        wallet.save_delegate(wallet.generate_delegate(), "secret", delegated_by="main")
+        wallet.revoke_delegate()
+        
+        assert wallet._key_cache == {}
+        assert not wallet.delegation_exists()
+
+
+class TestDelegationReads:
+    """Test reading the encrypted delegation config."""
+    
+    def test_config_decrypted_once_while_unchanged(self, wallet, tmp_path):
+        """Back-to-back reads should share one decrypt until the file changes."""
+        from cryptography.fernet import Fernet
+        
+        wallet.save_delegate(wallet.generate_delegate(), "secret", delegated_by="main")
+        reader = DelegateWallet(config_dir=str(tmp_path))
+        
+        with patch.object(Fernet, "decrypt", autospec=True, side_effect=Fernet.decrypt) as decrypt:
+            reader.load_delegate("secret")
+            assert reader.get_delegation_info("secret").delegated_by == "main"
+            assert reader.is_valid("secret")
+            assert decrypt.call_count == 1
+            
+            wallet.save_delegate(wallet.generate_delegate(), "secret", delegated_by="other")
+            assert reader.get_delegation_info("secret").delegated_by == "other"
+    
+    def test_legacy_pbkdf2_file_loads_and_migrates(self, wallet):
+        """Older PBKDF2 files with a list-encoded secret should load and be re-saved under scrypt."""
+        import json
+        from cryptography.fernet import Fernet
+        from maximus.utils.delegate_wallet import _KDF_PBKDF2, _SCRYPT_MARKER
+        
+        keypair = wallet.generate_delegate()
+        config = wallet.save_delegate(keypair, "secret", delegated_by="main")
+        legacy = dict(config.to_dict(), secretKey=list(bytes(keypair)))
+        wallet.delegate_file.write_bytes(
+            Fernet(wallet._derive_key("secret", _KDF_PBKDF2)).encrypt(json.dumps(legacy).encode())
+        )
+        
+        reader = DelegateWallet(config_dir=str(wallet.config_dir))
+        assert reader.load_delegate("secret") == keypair
+        assert wallet.delegate_file.read_bytes().startswith(_SCRYPT_MARKER)
+        assert DelegateWallet(config_dir=str(wallet.config_dir)).load_delegate("secret") == keypair
+    
+    def test_expired_delegation_rejected(self, wallet):
+        """Expiry should be checked against the parsed timestamp."""
+        wallet.save_delegate(wallet.generate_delegate(), "secret", delegated_by="main", duration_hours=0)
+        
+        with patch("maximus.utils.delegate_wallet.time.time", return_value=2**40):
+            assert not wallet.is_valid("secret")
+            with pytest.raises(ValueError, match="expired"):
+                wallet.load_delegate("secret")
+        
+        assert DelegationConfig("pk", b"", "main").is_expired() is False
+        
+        config = DelegationConfig("pk", b"", "main", expires_at="2030-01-02T03:04:05+00:00")
+        assert config.expires_datetime.year == 2030
+        assert config._expires_epoch == config.expires_datetime.timestamp()
+
+
+class TestTempDelegation:
+    """Test importing a delegation handed over by the web dashboard."""
+    
+    def test_temp_delegation_imported_once(self, tmp_path, monkeypatch, capsys):
+        """A pending temp file is saved encrypted and removed; no file is a no-op."""
+        import json
+        from solders.keypair import Keypair
+        from maximus.utils import delegate_wallet
+        
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setattr(delegate_wallet, "_delegate_wallet", None)
+        assert delegate_wallet.process_temp_delegation() is False
+        
+        keypair = Keypair()
+        temp_file = tmp_path / ".maximus" / "delegate_temp.json"
+        temp_file.parent.mkdir()
+        temp_file.write_text(json.dumps({
+            "secretKey": list(bytes(keypair)),
+            "password": "secret",
+            "delegatedBy": "main",
+        }))
+        
+        assert delegate_wallet.process_temp_delegation() is True
+        assert not temp_file.exists()
+        assert delegate_wallet.get_delegate_wallet().load_delegate("secret") == keypair
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
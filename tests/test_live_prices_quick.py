@@ -4,10 +4,6 @@ Just verifies the module loads and basic functionality works.
 """
 
 import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from maximus.utils.live_prices import LivePriceMonitor
 
@@ -4,6 +4,7 @@ Tests for Maximus technical signals implementation.
 import pytest
 import pandas as pd
 import numpy as np
+import talib
 from unittest.mock import Mock, patch
 from maximus.tools.technical_indicators import (
     calculate_wavetrend,
@@ -15,26 +16,27 @@ from maximus.tools.technical_indicators import (
     find_pivots,
     detect_divergences,
     generate_aggregated_signal,
-    analyze_signals
+    analyze_signals,
+    _stoch_rsi_nb,
+    _sma
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def sample_price_data():
-    """Create sample OHLC price data for testing."""
-    np.random.seed(42)
+    """Create sample OHLC price data for testing (built once, tests must not mutate it)."""
     dates = pd.date_range('2024-01-01', periods=200, freq='1H')
     
-    # Generate realistic price data
+    # Generate realistic price data from one block of normals
+    changes, open_noise, high_noise, low_noise = np.random.default_rng(42).standard_normal((4, 200))
     base_price = 50000
-    price_changes = np.random.randn(200) * 100
-    close_prices = base_price + np.cumsum(price_changes)
+    close_prices = base_price + np.cumsum(changes * 100)
     
     df = pd.DataFrame({
         'timestamp': dates,
-        'open': close_prices + np.random.randn(200) * 50,
-        'high': close_prices + np.abs(np.random.randn(200) * 100),
-        'low': close_prices - np.abs(np.random.randn(200) * 100),
+        'open': close_prices + open_noise * 50,
+        'high': close_prices + np.abs(high_noise * 100),
+        'low': close_prices - np.abs(low_noise * 100),
         'close': close_prices,
     })
     
@@ -85,6 +87,43 @@ class TestWaveTrend:
         
         assert len(result['wt1_series']) == len(sample_price_data)
         assert len(result['wt2_series']) == len(sample_price_data)
+    
+    def test_wavetrend_series_are_arrays(self, sample_price_data):
+        """Test that the series outputs are plain numpy arrays."""
+        result = calculate_wavetrend(sample_price_data)
+        
+        assert isinstance(result['wt1_series'], np.ndarray)
+        assert isinstance(result['wt2_series'], np.ndarray)
+        assert result['wt1'] == result['wt1_series'][-1]
+    
+    def test_wavetrend_matches_talib_chain(self, sample_price_data):
+        """Test that the fused kernel reproduces the chained talib.EMA calls."""
+        ap = ((sample_price_data['high'] + sample_price_data['low'] + sample_price_data['close']) / 3).to_numpy()
+        esa = talib.EMA(ap, timeperiod=9)
+        d = talib.EMA(np.abs(ap - esa), timeperiod=9)
+        wt1 = talib.EMA((ap - esa) / (0.015 * d), timeperiod=21)
+        
+        result = calculate_wavetrend(sample_price_data)
+        
+        np.testing.assert_allclose(result['wt1_series'], wt1)
+        np.testing.assert_allclose(result['wt2_series'][1:], (wt1[1:] + wt1[:-1]) / 2)
+
+
+class TestSMA:
+    """Test the convolution-based SMA helper."""
+    
+    def test_sma_matches_talib(self, sample_price_data):
+        """Test that _sma reproduces talib.SMA, including NaN padding."""
+        close = sample_price_data['close'].to_numpy(dtype=np.float64)
+        rsi = talib.RSI(close, timeperiod=14)
+        
+        for values in (close, rsi):
+            for period in (2, 9, 21):
+                np.testing.assert_allclose(_sma(values, period), talib.SMA(values, timeperiod=period))
+    
+    def test_sma_shorter_than_period(self):
+        """Test that _sma returns all NaN when there is not enough data."""
+        assert np.isnan(_sma(np.array([1.0, 2.0]), 5)).all()
 
 
 class TestMoneyFlow:
@@ -106,6 +145,19 @@ class TestMoneyFlow:
         assert isinstance(slow, (int, float))
         # Values should be different
         assert fast != slow or len(sample_price_data) < 20
+    
+    def test_money_flow_matches_full_series(self, sample_price_data):
+        """Test that the tail-only kernel matches the full-series formula."""
+        high = sample_price_data['high'].to_numpy(dtype=np.float64)
+        low = sample_price_data['low'].to_numpy(dtype=np.float64)
+        hlc3 = (high + low + sample_price_data['close'].to_numpy(dtype=np.float64)) / 3
+        
+        diff_sma = talib.SMA(hlc3 - talib.SMA(hlc3, timeperiod=9), timeperiod=9)
+        expected = 5.0 * 2 * diff_sma[-1] / talib.SMA(high - low, timeperiod=9)[-1]
+        
+        result = calculate_money_flow(sample_price_data, period=9, multiplier=5.0)
+        
+        assert result == pytest.approx(expected)
 
 
 class TestRSI:
@@ -137,6 +189,16 @@ class TestRSI:
             assert result['overbought']
         if result['value'] < 30:
             assert result['oversold']
+    
+    def test_rsi_matches_talib(self, sample_price_data):
+        """Test that the single-pass kernel reproduces talib.RSI and its SMA."""
+        close = sample_price_data['close'].to_numpy(dtype=np.float64)
+        rsi = talib.RSI(close, timeperiod=14)
+        
+        result = calculate_rsi(sample_price_data['close'], length=14, smooth_length=5)
+        
+        np.testing.assert_allclose(result['rsi_series'].to_numpy(), rsi)
+        assert result['smoothed'] == pytest.approx(talib.SMA(rsi, timeperiod=5)[-1])
 
 
 class TestStochasticRSI:
@@ -160,6 +222,42 @@ class TestStochasticRSI:
         
         assert 0 <= result['k'] <= 100
         assert 0 <= result['d'] <= 100
+    
+    @staticmethod
+    def _talib_chain(close):
+        """Reference TA-Lib RSI/STOCH/SMA chain for the default settings."""
+        rsi = talib.RSI(close, timeperiod=14)
+        stoch_k, _ = talib.STOCH(
+            rsi, rsi, rsi,
+            fastk_period=14, slowk_period=1, slowk_matype=0, slowd_period=1, slowd_matype=0
+        )
+        smooth_k = talib.SMA(stoch_k, timeperiod=21)
+        smooth_d = talib.SMA(smooth_k, timeperiod=9)
+        return smooth_k, smooth_d, talib.SMA(smooth_k, timeperiod=3), talib.SMA(smooth_d, timeperiod=3)
+    
+    def test_fused_kernel_matches_talib_chain(self, sample_price_data):
+        """Test that the fused kernel reproduces the TA-Lib RSI/STOCH/SMA chain."""
+        close = sample_price_data['close'].to_numpy(dtype=np.float64)
+        
+        result = _stoch_rsi_nb(close, 14, 14, 21, 9, 3, 3)
+        
+        for fused, reference in zip(result, self._talib_chain(close)):
+            np.testing.assert_allclose(fused, reference, atol=1e-8)
+    
+    def test_fused_kernel_skips_leading_nans(self, sample_price_data):
+        """Test that leading NaNs are skipped the same way TA-Lib skips them."""
+        close = sample_price_data['close'].to_numpy(dtype=np.float64)
+        close[:3] = np.nan
+        
+        result = _stoch_rsi_nb(close, 14, 14, 21, 9, 3, 3)
+        
+        assert not np.isnan(result[0][-1])
+        for fused, reference in zip(result, self._talib_chain(close)):
+            np.testing.assert_allclose(fused, reference, atol=1e-8)
+    
+    def test_kernel_compiled_at_import(self):
+        """Test that the kernel is compiled eagerly rather than on first call."""
+        assert _stoch_rsi_nb.signatures
 
 
 class TestCrossDetection:
@@ -213,6 +311,16 @@ class TestPivotDetection:
         
         # Should find the peak at value 5
         assert 5 in result['pivot_highs']
+    
+    def test_find_pivots_edges_and_ties(self):
+        """Test that flat tops are not pivots and short series find nothing."""
+        series = pd.Series([1.0, 3.0, 3.0, 1.0, 0.0, 2.0, 1.0])
+        
+        result = find_pivots(series, lookback_left=1, lookback_right=1)
+        
+        assert result['pivot_high_indices'] == [5]
+        assert result['pivot_low_indices'] == [4]
+        assert find_pivots(series.iloc[:2], 1, 1)['pivot_highs'] == []
 
 
 class TestDivergenceDetection:
@@ -374,32 +482,33 @@ class TestSignalAggregation:
         assert 0 <= result['strength'] <= 100
 
 
+# 150 hourly candles on a steady uptrend, built once and shared read-only
+MOCK_CANDLES = tuple(
+    {
+        'timestamp': timestamp,
+        'open': price,
+        'high': price + 100,
+        'low': price - 100,
+        'close': price
+    }
+    for timestamp, price in zip(
+        (pd.date_range('2024-01-01', periods=150, freq='1h').asi8 // 1_000_000).tolist(),
+        range(50000, 51500, 10)
+    )
+)
+
+
 class TestSignalsTool:
     """Test the main analyze_signals tool."""
     
     @patch('maximus.tools.technical_indicators.get_ohlc_data')
     def test_analyze_signals_with_mock_data(self, mock_get_ohlc):
         """Test analyze_signals with mocked OHLC data."""
-        # Create mock OHLC data
-        dates = pd.date_range('2024-01-01', periods=150, freq='1H')
-        mock_candles = []
-        base_price = 50000
-        
-        for i, date in enumerate(dates):
-            price = base_price + i * 10
-            mock_candles.append({
-                'timestamp': int(date.timestamp() * 1000),
-                'open': price,
-                'high': price + 100,
-                'low': price - 100,
-                'close': price
-            })
-        
         mock_get_ohlc.invoke = Mock(return_value={
             'id': 'bitcoin',
             'vs_currency': 'usd',
             'days': '7',
-            'candles': mock_candles
+            'candles': MOCK_CANDLES
         })
         
         result = analyze_signals.invoke({
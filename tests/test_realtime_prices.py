@@ -8,14 +8,13 @@ This script tests:
 4. Multi-token subscriptions
 """
 
+import threading
 import time
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from maximus.tools.realtime_prices import (
+    PriceCache,
+    PriceData,
+    WebsocketManager,
     initialize_realtime_prices,
     shutdown_realtime_prices,
     get_price_cache,
@@ -35,15 +34,15 @@ def test_realtime_vs_rest():
     common_tokens = ["sol", "btc", "eth", "usdc", "bonk"]
     initialize_realtime_prices(common_tokens)
     
-    # Give websockets time to connect and receive first updates
-    print("   Waiting 15 seconds for websocket connections and initial price updates...")
-    for i in range(15, 0, -1):
-        print(f"   {i}...", end="\r")
-        time.sleep(1)
-    print("   Ready!                    ")
-    
     cache = get_price_cache()
     
+    # Wait until every token has its first update (up to 15 seconds)
+    print("   Waiting up to 15 seconds for websocket connections and initial price updates...")
+    if cache.wait_for(common_tokens, timeout=15):
+        print("   Ready!")
+    else:
+        print("   Timed out; continuing with what has arrived")
+    
     # Check cached prices
     print("\n2. Checking real-time cached prices:")
     print("-" * 80)
@@ -74,11 +73,10 @@ def test_realtime_vs_rest():
     # Show all cached token prices
     print("\n4. All cached prices:")
     print("-" * 80)
-    all_prices = cache.get_all()
-    if all_prices:
-        for token_id, data in all_prices.items():
-            print(f"   {token_id:15s} ${data['price']:>12.4f} "
-                  f"(age: {data['age_seconds']:.1f}s)")
+    if len(cache):
+        for token_id, price, age in cache.iter_snapshot():
+            print(f"   {token_id:15s} ${price:>12.4f} "
+                  f"(age: {age:.1f}s)")
     else:
         print("   No prices in cache")
     
@@ -108,6 +106,32 @@ def test_realtime_vs_rest():
     print(f"  - Cache hit rate: {len([t for t in common_tokens if cache.get(t)])}/{len(common_tokens)}")
 
 
+def test_cache_wait_for():
+    """wait_for returns as soon as every token is stored, or False on timeout."""
+    cache = PriceCache()
+    assert cache.wait_for(["sol"], timeout=0.01) is False
+    
+    timer = threading.Timer(0.05, cache.set, args=("sol", PriceData(price=1.0)))
+    timer.start()
+    started = time.monotonic()
+    assert cache.wait_for(["sol"], timeout=5)
+    assert time.monotonic() - started < 1
+    timer.join()
+    
+    ((token_id, price, age),) = cache.iter_snapshot()
+    assert (token_id, price) == ("sol", 1.0) and 0 <= age < 5
+    assert list(cache.get_many(["sol", "btc"])) == ["sol"]
+
+
+def test_subscribe_cg_tokens_batch():
+    """Batch subscription adds every new token in one update and skips known ones."""
+    manager = WebsocketManager(PriceCache())
+    manager.subscribe_cg_token("bitcoin")
+    manager.subscribe_cg_tokens(["bitcoin", "ethereum", "solana"])
+    manager.subscribe_cg_tokens([])
+    assert manager.cg_tokens == {"bitcoin", "ethereum", "solana"}
+
+
 def test_dynamic_subscription():
     """Test dynamic token subscription during runtime."""
     print("\n" + "=" * 80)
@@ -4,66 +4,143 @@ Tests for Titan router integration.
 Run with: uv run pytest tests/test_titan_integration.py -v
 """
 
+import asyncio
 import os
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import msgspec
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from solders.address_lookup_table_account import AddressLookupTableAccount
+from solders.hash import Hash
+from solders.instruction import Instruction, AccountMeta
+from solders.keypair import Keypair
+from solders.message import Message
 from solders.pubkey import Pubkey
+from solders.transaction import Transaction
+from websockets.protocol import State
 
 # Set dummy environment variables to avoid import errors
 os.environ.setdefault('COINGECKO_API_KEY', 'test_key')
 os.environ.setdefault('TITAN_API_TOKEN', 'test_token')
 
+from maximus.tools import solana_transactions, titan_client, titan_display
+from maximus.tools.solana_transactions import (
+    PACKET_DATA_SIZE,
+    estimate_tx_size,
+    get_token_decimals,
+    get_token_decimals_batch,
+    parse_lookup_table_addresses,
+    resolve_token_info,
+    titan_instruction_to_solders,
+)
+from maximus.tools.titan_client import (
+    NewSwapQuoteStream,
+    SwapParams,
+    SwapQuote,
+    SwapQuotes,
+    TitanClient,
+    TransactionParams,
+    UpdateParams,
+    _GET_INFO_DATA,
+    _VECTORIZED_QUOTE_THRESHOLD,
+    _put_latest,
+)
+from maximus.tools.titan_display import LiveQuoteDisplay, QuoteDisplayConfig, stream_quotes_with_display
+from maximus.utils.ui import Colors
+
+# Distinct pubkeys and their raw bytes, built once and shared by the tests
+PUBKEYS = [Pubkey.new_unique() for _ in range(128)]
+PUBKEY_BYTES = [bytes(pubkey) for pubkey in PUBKEYS]
+
+
+@dataclass(slots=True)
+class FakeAccount:
+    """Account as returned by the RPC; only the raw data is read."""
+    data: bytes
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    """RPC response wrapper holding the result in `value`."""
+    value: Any
+
+
+def mint_account(decimals: int) -> FakeAccount:
+    """SPL Token Mint account with decimals at byte 44."""
+    data = bytearray(82)
+    data[44] = decimals
+    return FakeAccount(data)
+
 
 class TestTokenDecimalResolution:
     """Test dynamic token decimal resolution from RPC."""
     
     @patch('maximus.tools.solana_transactions.get_solana_client')
     def test_sol_decimals(self, mock_client):
-        """SOL should always return 9 decimals."""
-        from maximus.tools.solana_transactions import get_token_decimals
-        
+        """SOL should always return 9 decimals; known stablecoins skip the RPC too."""
         decimals = get_token_decimals("So11111111111111111111111111111111111111112")
         assert decimals == 9
+        assert get_token_decimals("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v") == 6
+        mock_client.assert_not_called()
     
     @patch('maximus.tools.solana_transactions.get_solana_client')
-    def test_usdc_decimals_from_rpc(self, mock_client):
-        """USDC decimals should be queried from RPC."""
-        from maximus.tools.solana_transactions import get_token_decimals
-        
-        # Mock RPC response with USDC mint data
-        mock_account_info = Mock()
-        # SPL Token Mint: decimals at byte 44 = 6
-        mock_account_info.value.data = bytearray(82)
-        mock_account_info.value.data[44] = 6
-        
+    def test_decimals_from_rpc_cached(self, mock_client):
+        """Mint decimals should be queried from RPC once, then served from cache."""
+        # Mock RPC response with mint data
         mock_client_instance = Mock()
-        mock_client_instance.client.get_account_info.return_value = mock_account_info
+        mock_client_instance.client.get_multiple_accounts.return_value = FakeResponse([mint_account(5)])
         mock_client.return_value = mock_client_instance
         
-        decimals = get_token_decimals("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v")
-        assert decimals == 6
+        # Fresh mint: decimals are cached for the session, so shared pubkeys could already be cached
+        mint = str(Pubkey.new_unique())
+        assert get_token_decimals(mint) == 5
+        assert get_token_decimals(mint) == 5
+        assert mock_client_instance.client.get_multiple_accounts.call_count == 1
     
     @patch('maximus.tools.solana_transactions.get_solana_client')
     def test_unknown_token_fallback(self, mock_client):
         """Unknown tokens should fall back to 6 decimals."""
-        from maximus.tools.solana_transactions import get_token_decimals
-        
         # Mock no account found
-        mock_account_info = Mock()
-        mock_account_info.value = None
-        
         mock_client_instance = Mock()
-        mock_client_instance.client.get_account_info.return_value = mock_account_info
+        mock_client_instance.client.get_multiple_accounts.return_value = FakeResponse([None])
         mock_client.return_value = mock_client_instance
         
         decimals = get_token_decimals("UnknownToken11111111111111111111111111111")
         assert decimals == 6
     
+    @patch('maximus.tools.solana_transactions.get_solana_client')
+    def test_batch_decimals_one_request_per_100_mints(self, mock_client):
+        """Batch lookups should fetch up to 100 mints per RPC request."""
+        def get_multiple_accounts(pubkeys):
+            # Short data and a missing account fall back to 6
+            accounts = [mint_account(i % 10) for i in range(len(pubkeys))]
+            if len(pubkeys) == 100:
+                accounts[0] = None
+                accounts[1] = FakeAccount(bytearray(10))
+            return FakeResponse(accounts)
+        
+        mock_client_instance = Mock()
+        mock_client_instance.client.get_multiple_accounts.side_effect = get_multiple_accounts
+        mock_client.return_value = mock_client_instance
+        
+        # Fresh mints so none are already in the session decimals cache
+        mints = [str(Pubkey.new_unique()) for _ in range(150)]
+        sol = "So11111111111111111111111111111111111111112"
+        decimals = get_token_decimals_batch([sol] + mints + ["not-a-mint"])
+        
+        assert mock_client_instance.client.get_multiple_accounts.call_count == 2
+        assert decimals[sol] == 9
+        assert decimals["not-a-mint"] == 6
+        assert decimals[mints[0]] == 6
+        assert decimals[mints[1]] == 6
+        assert decimals[mints[2]] == 2
+        assert decimals[mints[100]] == 0
+        assert decimals[mints[149]] == 9
+    
     @patch('maximus.tools.solana_transactions.get_token_decimals')
     def test_resolve_token_info_by_symbol(self, mock_get_decimals):
         """Test resolving token by symbol."""
-        from maximus.tools.solana_transactions import resolve_token_info
-        
         mock_get_decimals.return_value = 6
         
         mint, decimals, symbol = resolve_token_info("USDC")
@@ -75,8 +152,6 @@ class TestTokenDecimalResolution:
     @patch('maximus.tools.solana_transactions.get_token_decimals')
     def test_resolve_token_info_by_address(self, mock_get_decimals):
         """Test resolving token by mint address."""
-        from maximus.tools.solana_transactions import resolve_token_info
-        
         mock_get_decimals.return_value = 9
         
         mint, decimals, symbol = resolve_token_info("CustomMint1111111111111111111111111111111")
@@ -84,6 +159,33 @@ class TestTokenDecimalResolution:
         assert mint == "CustomMint1111111111111111111111111111111"
         assert decimals == 9
         assert symbol.startswith("CUSTOMMI")  # Truncated
+    
+    @patch('maximus.tools.solana_transactions.get_solana_client')
+    def test_swap_display_fetches_decimals_in_one_call(self, mock_client):
+        """Both swap mints should be resolved with a single batched RPC request."""
+        def get_multiple_accounts(pubkeys):
+            return FakeResponse([mint_account(8), mint_account(4)])
+        
+        mock_client_instance = Mock()
+        mock_client_instance.client.get_multiple_accounts.side_effect = get_multiple_accounts
+        mock_client.return_value = mock_client_instance
+        
+        input_mint, output_mint = str(PUBKEYS[4]), str(PUBKEYS[5])
+        with patch('maximus.tools.titan_client.TitanClient') as titan, \
+             patch('maximus.tools.titan_display.stream_quotes_with_display', new_callable=AsyncMock) as stream:
+            titan.return_value.connect = AsyncMock()
+            titan.return_value.close = AsyncMock()
+            asyncio.run(solana_transactions.get_titan_swap_with_display(input_mint, output_mint, 1.5, "user"))
+        
+        assert mock_client_instance.client.get_multiple_accounts.call_count == 1
+        assert stream.call_args.kwargs["amount"] == 150000000
+        assert stream.call_args.kwargs["config"].decimals_out == 4
+    
+    def test_resolve_token_info_by_known_address(self):
+        """A well-known mint address should resolve to its symbol without RPC."""
+        assert resolve_token_info("So11111111111111111111111111111111111111112") == (
+            "So11111111111111111111111111111111111111112", 9, "SOL"
+        )
 
 
 class TestAddressLookupTableParsing:
@@ -105,27 +207,16 @@ class TestAddressLookupTableParsing:
     
     def test_parse_alt_addresses(self):
         """Test parsing addresses from ALT data."""
-        from solders.pubkey import Pubkey
-        
-        # Create mock ALT data
-        header = bytearray(61)  # Header
-        
-        # Add 3 test addresses (32 bytes each)
-        addr1 = Pubkey.new_unique()
-        addr2 = Pubkey.new_unique()
-        addr3 = Pubkey.new_unique()
-        
-        data = header + bytes(addr1) + bytes(addr2) + bytes(addr3)
-        
-        # Parse addresses
+        # Create mock ALT data: 61-byte header, 3 test addresses (32 bytes each)
+        # and a 5-byte trailing partial entry, written into one buffer
         HEADER_SIZE = 61
-        addresses_data = data[HEADER_SIZE:]
-        addresses = []
+        addr1, addr2, addr3 = PUBKEYS[:3]
+        
+        data = bytearray(HEADER_SIZE + 3 * 32 + 5)
+        data[HEADER_SIZE:HEADER_SIZE + 3 * 32] = b"".join(PUBKEY_BYTES[:3])
         
-        for i in range(0, len(addresses_data), 32):
-            if i + 32 <= len(addresses_data):
-                addr_bytes = addresses_data[i:i+32]
-                addresses.append(Pubkey(addr_bytes))
+        # Parse addresses (trailing partial entry is dropped)
+        addresses = parse_lookup_table_addresses(data, offset=HEADER_SIZE)
         
         assert len(addresses) == 3
         assert addresses[0] == addr1
@@ -138,35 +229,22 @@ class TestInstructionBuilding:
     
     def test_titan_instruction_to_solders(self):
         """Test converting Titan instruction format to Solders format."""
-        from solders.instruction import Instruction as SoldersInstruction, AccountMeta
-        from solders.pubkey import Pubkey
-        
         # Mock Titan instruction
         titan_ix = {
-            'p': bytes(Pubkey.new_unique()),  # program_id
+            'p': PUBKEY_BYTES[0],  # program_id
             'a': [  # accounts
-                {'p': bytes(Pubkey.new_unique()), 's': True, 'w': True},
-                {'p': bytes(Pubkey.new_unique()), 's': False, 'w': True},
-                {'p': bytes(Pubkey.new_unique()), 's': False, 'w': False},
+                {'p': PUBKEY_BYTES[1], 's': True, 'w': True},
+                {'p': PUBKEY_BYTES[2], 's': False, 'w': True},
+                {'p': PUBKEY_BYTES[3], 's': False, 'w': False},
             ],
             'd': b'\x01\x02\x03\x04',  # data
         }
         
         # Convert to Solders format
-        program_id = Pubkey(titan_ix['p'])
-        accounts = []
-        for acc in titan_ix['a']:
-            accounts.append(AccountMeta(
-                pubkey=Pubkey(acc['p']),
-                is_signer=acc['s'],
-                is_writable=acc['w']
-            ))
-        data = bytes(titan_ix['d'])
-        
-        instruction = SoldersInstruction(program_id, data, accounts)
+        instruction = titan_instruction_to_solders(titan_ix)
         
-        assert instruction.program_id == program_id
-        assert len(instruction.accounts) == 3
+        assert instruction.program_id == PUBKEYS[0]
+        assert [meta.pubkey for meta in instruction.accounts] == PUBKEYS[1:4]
         assert instruction.accounts[0].is_signer == True
         assert instruction.accounts[0].is_writable == True
         assert instruction.accounts[1].is_signer == False
@@ -181,42 +259,36 @@ class TestTransactionSizeCalculation:
     
     def test_transaction_without_alt_too_large(self):
         """Transactions without ALTs should exceed size limit for complex swaps."""
-        from solders.instruction import Instruction, AccountMeta
-        from solders.pubkey import Pubkey
-        from solders.message import Message
-        from solders.transaction import Transaction
-        from solders.hash import Hash
-        from solders.keypair import Keypair
-        
-        # Create a swap-like transaction with many accounts
-        program_id = Pubkey.new_unique()
-        accounts = [AccountMeta(Pubkey.new_unique(), False, True) for _ in range(50)]
-        data = b'\x00' * 100
-        
-        ix = Instruction(program_id, data, accounts)
-        payer = Keypair()
-        
-        message = Message.new_with_blockhash(
-            [ix],
-            payer.pubkey(),
-            Hash.new_unique()
-        )
+        # A swap-like transaction: payer + program + 50 accounts, one 100-byte instruction
+        size = estimate_tx_size(num_signatures=1, num_accounts=52, instructions=[(50, 100)])
         
+        # Without ALTs, should be large
+        print(f"Transaction size without ALTs: {size} bytes")
+        assert size > PACKET_DATA_SIZE, "Transaction should exceed 1232 byte limit"
+    
+    def test_estimate_tx_size_matches_serialized(self):
+        """The size estimate should match the serialized transaction exactly."""
+        payer = Keypair()
+        program_id = PUBKEYS[0]
+        instructions = [
+            Instruction(program_id, b'\x00' * 200, [AccountMeta(pubkey, False, True) for pubkey in PUBKEYS[1:]]),
+            Instruction(program_id, b'\x01', [AccountMeta(payer.pubkey(), True, True)]),
+        ]
+        message = Message.new_with_blockhash(instructions, payer.pubkey(), Hash.new_unique())
         tx = Transaction([payer], message, Hash.new_unique())
-        tx_bytes = bytes(tx)
         
-        # Without ALTs, should be large
-        print(f"Transaction size without ALTs: {len(tx_bytes)} bytes")
-        assert len(tx_bytes) > 1232, "Transaction should exceed 1232 byte limit"
+        size = estimate_tx_size(
+            num_signatures=1,
+            num_accounts=len(message.account_keys),
+            instructions=[(len(ix.accounts), len(ix.data)) for ix in instructions],
+        )
+        assert size == len(bytes(tx))
     
     def test_alt_reduces_transaction_size(self):
         """ALTs should significantly reduce transaction size."""
-        from solders.address_lookup_table_account import AddressLookupTableAccount
-        from solders.pubkey import Pubkey
-        
         # Create lookup table with many addresses
-        table_key = Pubkey.new_unique()
-        addresses = [Pubkey.new_unique() for _ in range(100)]
+        table_key = PUBKEYS[0]
+        addresses = PUBKEYS[1:101]
         
         alt = AddressLookupTableAccount(key=table_key, addresses=addresses)
         
@@ -231,8 +303,6 @@ class TestSwapQuoteSelection:
     
     def test_select_best_quote_by_out_amount(self):
         """Should select quote with highest output amount."""
-        from maximus.tools.titan_client import SwapQuote
-        
         quotes = {
             "provider1": SwapQuote(
                 provider="provider1",
@@ -240,8 +310,6 @@ class TestSwapQuoteSelection:
                 out_amount=9500000,
                 slippage_bps=50,
                 route_steps=[],
-                instructions=[],
-                address_lookup_tables=[]
             ),
             "provider2": SwapQuote(
                 provider="provider2",
@@ -249,8 +317,6 @@ class TestSwapQuoteSelection:
                 out_amount=9700000,  # Best
                 slippage_bps=50,
                 route_steps=[],
-                instructions=[],
-                address_lookup_tables=[]
             ),
             "provider3": SwapQuote(
                 provider="provider3",
@@ -258,22 +324,547 @@ class TestSwapQuoteSelection:
                 out_amount=9600000,
                 slippage_bps=50,
                 route_steps=[],
-                instructions=[],
-                address_lookup_tables=[]
             ),
         }
         
         # Find best quote
-        best_provider = None
-        best_quote = None
-        
-        for provider_id, quote in quotes.items():
-            if best_quote is None or quote.out_amount > best_quote.out_amount:
-                best_provider = provider_id
-                best_quote = quote
+        best_provider, best_quote = max(quotes.items(), key=lambda item: item[1].out_amount)
         
         assert best_provider == "provider2"
         assert best_quote.out_amount == 9700000
+    
+    def test_swap_quotes_best_quote_by_mode(self):
+        """best_quote should maximize out_amount for ExactIn and minimize in_amount for ExactOut."""
+        quotes = {
+            "provider1": SwapQuote(in_amount=1000, out_amount=9500),
+            "provider2": SwapQuote(in_amount=990, out_amount=9700),
+            "provider3": SwapQuote(in_amount=980, out_amount=9600),
+        }
+        
+        assert SwapQuotes(swap_mode="ExactIn", quotes=quotes).best_quote()[0] == "provider2"
+        assert SwapQuotes(swap_mode="ExactOut", quotes=quotes).best_quote()[0] == "provider3"
+        assert SwapQuotes().best_quote() is None
+    
+    def test_swap_quotes_best_quote_vectorized_matches_scan(self):
+        """Large updates should pick the same quote as the plain scan, including ties."""
+        n = _VECTORIZED_QUOTE_THRESHOLD * 2
+        quotes = {f"provider{i}": SwapQuote(in_amount=1000 - i % 7, out_amount=(i * 37) % 101) for i in range(n)}
+        
+        best_in = SwapQuotes(swap_mode="ExactIn", quotes=quotes).best_quote()
+        best_out = SwapQuotes(swap_mode="ExactOut", quotes=quotes).best_quote()
+        
+        assert best_in == max(quotes.items(), key=lambda item: item[1].out_amount)
+        assert best_out == min(quotes.items(), key=lambda item: item[1].in_amount)
+
+
+class TestMessageDecoding:
+    """Test decoding Titan server frames."""
+    
+    def test_decode_stream_data(self):
+        """Stream frames should decode straight into SwapQuotes."""
+        frame = msgspec.msgpack.encode({
+            "StreamData": {
+                "id": 1,
+                "payload": {
+                    "SwapQuotes": {
+                        "id": "quote-1",
+                        "inputMint": bytes(32),
+                        "outputMint": bytes(32),
+                        "swapMode": "ExactIn",
+                        "amount": 1000000,
+                        "quotes": {
+                            "provider1": {
+                                "inAmount": 1000000,
+                                "outAmount": 9500000,
+                                "slippageBps": 50,
+                                "steps": [{"label": "Orca Whirlpool"}],
+                                "instructions": [],
+                                "addressLookupTables": [bytes(32)],
+                            }
+                        },
+                    }
+                },
+            }
+        })
+        
+        client = TitanClient(api_token="test_token")
+        msg = client._decode_message(frame)
+        
+        quotes = msg.stream_data.payload.swap_quotes
+        assert isinstance(quotes, SwapQuotes)
+        assert quotes.amount == 1000000
+        quote = quotes.quotes["provider1"]
+        assert quote.out_amount == 9500000
+        assert quote.route_steps == [{"label": "Orca Whirlpool"}]
+        # Heavy fields stay undecoded until accessed
+        assert isinstance(quote.raw_address_lookup_tables, msgspec.Raw)
+        assert quote.address_lookup_tables == [bytes(32)]
+        assert quote.instructions == []
+        assert msg.error is None
+    
+    def test_lookup_tables_interned_across_quotes(self):
+        """Identical lookup table keys from different providers should share one object."""
+        table = bytes(range(32))
+        first = msgspec.msgpack.decode(msgspec.msgpack.encode({"addressLookupTables": [table]}), type=SwapQuote)
+        second = msgspec.msgpack.decode(msgspec.msgpack.encode({"addressLookupTables": [table]}), type=SwapQuote)
+        
+        assert first.address_lookup_tables == [table]
+        assert first.address_lookup_tables[0] is second.address_lookup_tables[0]
+    
+    def test_decode_error(self):
+        """Error frames should expose code and message."""
+        frame = msgspec.msgpack.encode({"Error": {"requestId": 1, "code": 401, "message": "Unauthorized"}})
+        
+        msg = TitanClient(api_token="test_token")._decode_message(frame)
+        
+        assert msg.error.code == 401
+        assert msg.error.message == "Unauthorized"
+    
+    def test_recv_reply_matches_request_id_only(self):
+        """Replies without an id or for another request should be skipped."""
+        client = TitanClient(api_token="test_token")
+        frames = [
+            msgspec.msgpack.encode({"Response": {"data": {"stale": True}}}),
+            msgspec.msgpack.encode({"Response": {"requestId": 2, "data": {"stale": True}}}),
+            msgspec.msgpack.encode({"Response": {"requestId": 3, "data": {}}}),
+        ]
+        client._recv_frame = AsyncMock(side_effect=frames)
+        
+        msg = asyncio.run(client._recv_reply(3))
+        
+        assert msg.response.request_id == 3
+        assert client._recv_frame.await_count == 3
+    
+    def test_encode_request_matches_dict_envelope(self):
+        """Request frames should encode like a plain {"id", "data"} map."""
+        client = TitanClient(api_token="test_token")
+        
+        assert client._encode_request(_GET_INFO_DATA) == msgspec.msgpack.encode({"id": 1, "data": {"GetInfo": {}}})
+        assert client._encode_request({"StopStream": {"id": 7}}) == msgspec.msgpack.encode({"id": 2, "data": {"StopStream": {"id": 7}}})
+    
+    def test_swap_stream_request_matches_dict_body(self):
+        """Struct request bodies should encode to the documented camelCase maps."""
+        body = NewSwapQuoteStream(
+            swap=SwapParams(input_mint=bytes(32), output_mint=bytes(32), amount=1000, swap_mode="ExactIn", slippage_bps=50),
+            transaction=TransactionParams(user_public_key=bytes(32)),
+            update=UpdateParams(interval_ms=500, num_quotes=5),
+        )
+        
+        assert msgspec.msgpack.encode(body) == msgspec.msgpack.encode({
+            "swap": {"inputMint": bytes(32), "outputMint": bytes(32), "amount": 1000, "swapMode": "ExactIn", "slippageBps": 50},
+            "transaction": {"userPublicKey": bytes(32)},
+            "update": {"intervalMs": 500, "numQuotes": 5},
+        })
+
+
+class TestQuoteStreaming:
+    """Test the request_swap_quotes reader pipeline."""
+    
+    def test_yields_updates_until_stream_end(self):
+        """Updates should arrive in order and iteration should stop at StreamEnd."""
+        frames = [msgspec.msgpack.encode({"Response": {"requestId": 1, "stream": {"id": 9}, "data": {}}})]
+        for out in (100, 200):
+            frames.append(msgspec.msgpack.encode({"StreamData": {"id": 9, "payload": {"SwapQuotes": {
+                "quotes": {"a": {"outAmount": out}},
+            }}}}))
+        frames.append(msgspec.msgpack.encode({"StreamEnd": {"id": 9}}))
+        
+        ws = Mock()
+        ws.send = AsyncMock()
+        ws.recv = AsyncMock(side_effect=frames)
+        
+        async def collect():
+            client = TitanClient(api_token="test_token")
+            client.ws = ws
+            return [
+                quotes.quotes["a"].out_amount
+                async for quotes in client.request_swap_quotes(
+                    "So11111111111111111111111111111111111111112",
+                    "EPjFWvd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    1000,
+                    "So11111111111111111111111111111111111111112",
+                )
+            ]
+        
+        assert asyncio.run(collect()) == [100, 200]
+    
+    def test_latest_only_skips_superseded_updates(self):
+        """Queued updates should collapse to the newest, still ending at StreamEnd."""
+        frames = [msgspec.msgpack.encode({"Response": {"requestId": 1, "stream": {"id": 9}, "data": {}}})]
+        for out in (100, 200, 300):
+            frames.append(msgspec.msgpack.encode({"StreamData": {"id": 9, "payload": {"SwapQuotes": {
+                "quotes": {"a": {"outAmount": out}},
+            }}}}))
+        frames.append(msgspec.msgpack.encode({"StreamEnd": {"id": 9}}))
+        
+        ws = Mock()
+        ws.send = AsyncMock()
+        ws.recv = AsyncMock(side_effect=frames)
+        
+        async def collect():
+            client = TitanClient(api_token="test_token")
+            client.ws = ws
+            return [
+                quotes.quotes["a"].out_amount
+                async for quotes in client.request_swap_quotes(
+                    "So11111111111111111111111111111111111111112",
+                    "EPjFWvd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    1000,
+                    "So11111111111111111111111111111111111111112",
+                    latest_only=True,
+                )
+            ]
+        
+        assert asyncio.run(collect()) == [300]
+    
+    def test_full_queue_drops_oldest(self):
+        """A slow consumer should see the newest updates, not a backlog."""
+        queue = asyncio.Queue(maxsize=2)
+        for item in range(4):
+            _put_latest(queue, item)
+        
+        assert [queue.get_nowait(), queue.get_nowait()] == [2, 3]
+
+
+class TestBestQuoteStream:
+    """Test get_best_quote_from_stream deadline handling and connection reuse."""
+    
+    @staticmethod
+    def _fake_titan(updates):
+        """
+        Build a fake connect() serving queued quote updates, plus connect and request logs.
+        
+        updates is either one list shared by every stream or a dict of lists
+        keyed by the raw input mint of the stream.
+        """
+        connects = []
+        requests = []
+        
+        class FakeWebSocket:
+            state = State.OPEN
+            
+            def __init__(self):
+                self.frames = []
+            
+            async def send(self, data):
+                request = msgspec.msgpack.decode(data)
+                request_id = request["id"]
+                requests.extend(request["data"])
+                if "NewSwapQuoteStream" in request["data"]:
+                    stream_updates = updates
+                    if isinstance(updates, dict):
+                        swap = request["data"]["NewSwapQuoteStream"]["swap"]
+                        stream_updates = updates[bytes(swap["inputMint"])]
+                    # Use the request id as the stream id so streams are distinct
+                    self.frames.append(msgspec.msgpack.encode(
+                        {"Response": {"requestId": request_id, "stream": {"id": request_id}, "data": {}}}
+                    ))
+                    while stream_updates:
+                        self.frames.append(msgspec.msgpack.encode({
+                            "StreamData": {"id": request_id, "payload": {"SwapQuotes": {
+                                "id": "q",
+                                "swapMode": "ExactIn",
+                                "quotes": {name: {"outAmount": out} for name, out in stream_updates.pop(0).items()},
+                            }}}
+                        }))
+                else:
+                    self.frames.append(msgspec.msgpack.encode({"Response": {"requestId": request_id, "data": {}}}))
+            
+            async def recv(self, decode=None):
+                if self.frames:
+                    return self.frames.pop(0)
+                await asyncio.sleep(10)
+            
+            async def close(self):
+                self.state = State.CLOSED
+        
+        async def fake_connect(self):
+            connects.append(self)
+            self.ws = FakeWebSocket()
+        
+        return fake_connect, connects, requests
+    
+    def test_returns_best_quote_at_deadline(self):
+        """Quotes seen before the deadline should be kept when it expires."""
+        fake_connect, _, _ = self._fake_titan([{"a": 100, "b": 250}, {"a": 200}])
+        
+        with patch.object(titan_client.TitanClient, "connect", fake_connect):
+            result = asyncio.run(titan_client.get_best_quote_from_stream(
+                "So11111111111111111111111111111111111111112",
+                "EPjFWvd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                1000,
+                "So11111111111111111111111111111111111111112",
+                timeout_seconds=0.2,
+            ))
+        
+        provider_id, best_quote, latest_quotes = result
+        assert provider_id == "b"
+        assert best_quote.out_amount == 250
+        assert list(latest_quotes.quotes) == ["a"]
+    
+    def test_connection_reused_across_calls(self):
+        """Back-to-back calls on one loop should share a single connection."""
+        updates = [{"a": 100}]
+        fake_connect, connects, _ = self._fake_titan(updates)
+        
+        async def two_calls():
+            results = []
+            for _ in range(2):
+                results.append(await titan_client.get_best_quote_from_stream(
+                    "So11111111111111111111111111111111111111112",
+                    "EPjFWvd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    1000,
+                    "So11111111111111111111111111111111111111112",
+                    timeout_seconds=0.1,
+                ))
+                updates.append({"b": 300})
+            await titan_client.TitanClientPool.close()
+            return results
+        
+        with patch.object(titan_client.TitanClient, "connect", fake_connect):
+            first, second = asyncio.run(two_calls())
+        
+        assert first[0] == "a"
+        assert second[0] == "b"
+        assert len(connects) == 1
+    
+    def test_run_async_closes_pooled_connection(self):
+        """Each run_async loop should close the pooled connection before it exits."""
+        fake_connect, connects, _ = self._fake_titan([{"a": 100}, {"b": 300}])
+        
+        with patch.object(titan_client.TitanClient, "connect", fake_connect):
+            for _ in range(2):
+                titan_client.run_async(titan_client.get_best_quote_from_stream(
+                    "So11111111111111111111111111111111111111112",
+                    "EPjFWvd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    1000,
+                    "So11111111111111111111111111111111111111112",
+                    timeout_seconds=0.1,
+                ))
+        
+        assert len(connects) == 2
+        assert all(client.ws is None for client in connects)
+        assert titan_client.TitanClientPool._client is None
+    
+    def test_concurrent_identical_requests_share_stream(self):
+        """Concurrent calls for the same swap should subscribe to one stream."""
+        fake_connect, connects, requests = self._fake_titan([{"a": 100, "b": 250}])
+        
+        async def concurrent_calls():
+            results = await asyncio.gather(*(
+                titan_client.get_best_quote_from_stream(
+                    "So11111111111111111111111111111111111111112",
+                    "EPjFWvd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    1000,
+                    "So11111111111111111111111111111111111111112",
+                    timeout_seconds=0.1,
+                )
+                for _ in range(2)
+            ))
+            await titan_client.TitanClientPool.close()
+            return results
+        
+        with patch.object(titan_client.TitanClient, "connect", fake_connect):
+            first, second = asyncio.run(concurrent_calls())
+        
+        assert first[0] == second[0] == "b"
+        assert len(connects) == 1
+        assert requests.count("NewSwapQuoteStream") == 1
+    
+    def test_concurrent_different_requests_both_get_quotes(self):
+        """A busy shared connection should not hold up a stream for another swap."""
+        fake_connect, connects, _ = self._fake_titan({
+            PUBKEY_BYTES[0]: [{"a": 100}],
+            PUBKEY_BYTES[1]: [{"b": 300}],
+        })
+        
+        async def concurrent_calls():
+            results = await asyncio.gather(*(
+                titan_client.get_best_quote_from_stream(
+                    str(input_mint),
+                    "EPjFWvd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    1000,
+                    "So11111111111111111111111111111111111111112",
+                    timeout_seconds=0.2,
+                )
+                for input_mint in PUBKEYS[:2]
+            ))
+            await titan_client.TitanClientPool.close()
+            return results
+        
+        with patch.object(titan_client.TitanClient, "connect", fake_connect):
+            first, second = asyncio.run(concurrent_calls())
+        
+        assert first[0] == "a"
+        assert second[0] == "b"
+        assert len(connects) == 2
+        assert titan_client.TitanClientPool._overflow == set()
+        assert connects[1].ws is None
+
+
+class TestLiveQuoteDisplay:
+    """Test in-place rendering of the live quote table."""
+    
+    @staticmethod
+    def _quotes(out_a, out_b):
+        return SwapQuotes(quotes={
+            "providerA": SwapQuote(in_amount=1000000, out_amount=out_a),
+            "providerB": SwapQuote(in_amount=1000000, out_amount=out_b),
+        })
+    
+    def test_render_update_rewrites_only_changed_rows(self, capsys):
+        """Only rows whose text changed should be written on update."""
+        display = LiveQuoteDisplay(QuoteDisplayConfig())
+        display.update_quotes(self._quotes(9000000, 8000000))
+        num_lines = display.render()
+        capsys.readouterr()
+        
+        display.update_quotes(self._quotes(9100000, 8000000))
+        assert display.render_update(num_lines) == num_lines
+        out = capsys.readouterr().out
+        
+        assert "9.1000" in out
+        assert "providerB" not in out
+        assert "Press" not in out
+    
+    def test_render_update_skips_unchanged_frame(self, capsys):
+        """An identical frame should write nothing."""
+        display = LiveQuoteDisplay(QuoteDisplayConfig())
+        display.update_quotes(self._quotes(9000000, 8000000))
+        num_lines = display.render()
+        capsys.readouterr()
+        
+        display.update_quotes(self._quotes(9000000, 8000000))
+        display.render_update(num_lines)
+        
+        assert capsys.readouterr().out == ""
+    
+    def test_quote_rows_skip_redundant_resets(self):
+        """Rows should switch colors directly and reset once at the end."""
+        display = LiveQuoteDisplay(QuoteDisplayConfig())
+        display.update_quotes(self._quotes(9000000, 8000000))
+        rows = [line.decode() for line in display._render_lines() if b"provider" in line]
+        
+        assert rows[0].startswith(f"{Colors.LIGHT_ORANGE}│{Colors.GREEN} ★ providerA")
+        assert all(row.count(Colors.ENDC) == 1 and row.endswith(Colors.ENDC) for row in rows)
+    
+    def test_enter_on_stdin_confirms(self, monkeypatch):
+        """A line on stdin should set user_confirmed without a reader thread."""
+        read_fd, write_fd = os.pipe()
+        
+        async def press_enter():
+            with os.fdopen(read_fd) as stdin:
+                monkeypatch.setattr("sys.stdin", stdin)
+                display = LiveQuoteDisplay(QuoteDisplayConfig())
+                display.start()
+                os.write(write_fd, b"\n")
+                await asyncio.wait_for(display.user_confirmed.wait(), timeout=1.0)
+                display.stop()
+                return display.is_running
+        
+        try:
+            assert asyncio.run(press_enter()) is False
+        finally:
+            os.close(write_fd)
+    
+    def test_confirm_closes_quote_stream(self, monkeypatch):
+        """Leaving the stream on confirm should close the generator right away."""
+        read_fd, write_fd = os.pipe()
+        
+        class FakeClient:
+            closed = False
+            
+            async def request_swap_quotes(self, **kwargs):
+                try:
+                    while True:
+                        yield TestLiveQuoteDisplay._quotes(9000000, 8000000)
+                        await asyncio.sleep(0.01)
+                finally:
+                    self.closed = True
+            
+            async def stop_stream(self):
+                pass
+        
+        async def confirm():
+            with os.fdopen(read_fd) as stdin:
+                monkeypatch.setattr("sys.stdin", stdin)
+                client = FakeClient()
+                os.write(write_fd, b"\n")
+                result = await stream_quotes_with_display(
+                    client, "in", "out", 1000, "user", 50, QuoteDisplayConfig()
+                )
+                return result, client.closed
+        
+        try:
+            result, closed = asyncio.run(confirm())
+        finally:
+            os.close(write_fd)
+        
+        assert result[0] == "providerA"
+        assert closed
+    
+    def test_end_of_burst_is_rendered(self, monkeypatch, capsys):
+        """An update skipped by the redraw throttle should be drawn once the interval passes."""
+        monkeypatch.setattr(titan_display, "RENDER_INTERVAL", 0.05)
+        read_fd, write_fd = os.pipe()
+        shown = []
+        
+        class FakeClient:
+            async def request_swap_quotes(self, **kwargs):
+                yield TestLiveQuoteDisplay._quotes(9000000, 8000000)
+                yield TestLiveQuoteDisplay._quotes(9000000, 8500000)
+                await asyncio.sleep(0.2)
+                shown.append(capsys.readouterr().out)
+                os.write(write_fd, b"\n")
+                while True:
+                    await asyncio.sleep(0.01)
+                    yield TestLiveQuoteDisplay._quotes(9000000, 8500000)
+            
+            async def stop_stream(self):
+                pass
+        
+        async def burst():
+            with os.fdopen(read_fd) as stdin:
+                monkeypatch.setattr("sys.stdin", stdin)
+                return await stream_quotes_with_display(
+                    FakeClient(), "in", "out", 1000, "user", 50, QuoteDisplayConfig()
+                )
+        
+        try:
+            asyncio.run(burst())
+        finally:
+            os.close(write_fd)
+        
+        assert "8.5000" in shown[0]
+    
+    def test_terminal_keys_read_in_cbreak_mode(self, monkeypatch):
+        """On a terminal only Enter confirms, and the tty mode is restored on stop."""
+        termios = pytest.importorskip("termios")
+        pty = pytest.importorskip("pty")
+        
+        master_fd, slave_fd = pty.openpty()
+        original = termios.tcgetattr(slave_fd)
+        
+        async def press_keys():
+            with os.fdopen(slave_fd) as stdin:
+                monkeypatch.setattr("sys.stdin", stdin)
+                display = LiveQuoteDisplay(QuoteDisplayConfig())
+                display.start()
+                assert not termios.tcgetattr(slave_fd)[3] & termios.ICANON
+                
+                os.write(master_fd, b"x")
+                await asyncio.sleep(0.05)
+                assert not display.user_confirmed.is_set()
+                
+                os.write(master_fd, b"\r")
+                await asyncio.wait_for(display.user_confirmed.wait(), timeout=1.0)
+                display.stop()
+                return termios.tcgetattr(slave_fd)
+        
+        try:
+            assert asyncio.run(press_keys()) == original
+        finally:
+            os.close(master_fd)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+"""
+Tests for stored wallet configuration.
+
+Run with: uv run pytest tests/test_wallet_storage.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+from maximus.utils.wallet_storage import WalletStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Wallet storage rooted in a temporary config dir."""
+    return WalletStorage(config_dir=str(tmp_path))
+
+
+class TestWalletStorage:
+    """Test adding, updating and removing wallets."""
+    
+    def test_wallet_round_trip(self, storage, tmp_path):
+        """Changes should persist to disk and be visible to a fresh instance."""
+        storage.add_wallet("addr1", label="main")
+        storage.add_wallet("addr2")
+        
+        assert storage.update_wallet_label("addr2", "spare")
+        assert storage.remove_wallet("addr1")
+        assert not storage.remove_wallet("missing")
+        with pytest.raises(ValueError):
+            storage.add_wallet("addr2")
+        
+        wallets = WalletStorage(config_dir=str(tmp_path)).get_wallets()
+        assert [(w.address, w.label) for w in wallets] == [("addr2", "spare")]
+    
+    def test_unchanged_write_skipped(self, storage):
+        """Setting a label to its current value should not rewrite the file."""
+        storage.add_wallet("addr1", label="main")
+        
+        with patch("maximus.utils.wallet_storage.os.replace") as replace:
+            assert storage.update_wallet_label("addr1", "main")
+            replace.assert_not_called()
+            
+            storage.update_wallet_label("addr1", "other")
+            replace.assert_called_once()
+    
+    def test_reads_reuse_parse_until_file_changes(self, storage, tmp_path):
+        """Back-to-back reads should parse once; an outside write should be picked up."""
+        import msgspec
+        
+        storage.add_wallet("addr1")
+        reader = WalletStorage(config_dir=str(tmp_path))
+        
+        with patch("maximus.utils.wallet_storage.msgspec.json.decode", side_effect=msgspec.json.decode) as decode:
+            assert reader.get_wallet("addr1") is not None
+            assert len(reader.get_wallets()) == 1
+            assert decode.call_count == 1
+            
+            storage.add_wallet("addr2")
+            assert reader.get_wallet("addr2") is not None
+    
+    def test_unknown_entry_keys_ignored(self, storage):
+        """Entries with extra keys from other versions should still load."""
+        storage.add_wallet("addr1")
+        config = storage._read_config()
+        storage._write_config({"wallets": [dict(config["wallets"][0], note="x")]})
+        
+        wallet = storage.get_wallet("addr1")
+        assert wallet.label is None and wallet.added_at
+        assert not hasattr(wallet, "__dict__")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
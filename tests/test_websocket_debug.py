@@ -41,19 +41,21 @@ def main():
     
     # Subscribe to a few test tokens
     test_tokens = ["bitcoin", "ethereum", "solana"]
-    for token in test_tokens:
-        manager.subscribe_cg_token(token)
-        print(f"  Subscribed to: {token}")
+    manager.subscribe_cg_tokens(test_tokens)
+    print(f"  Subscribed to: {', '.join(test_tokens)}")
     
     # Start the manager
     manager.start()
     
-    print("\nWaiting 15 seconds for connections and data...")
-    for i in range(15, 0, -1):
-        # Check cache status
-        live_count = sum(1 for token in test_tokens if cache.get(token))
-        print(f"\r  {i}s remaining... ({live_count}/{len(test_tokens)} prices received)", end="", flush=True)
-        time.sleep(1)
+    print("\nWaiting up to 15 seconds for connections and data...")
+    # Wake as soon as every token has a price; the short wait slices only pace the progress line
+    deadline = time.monotonic() + 15
+    while not cache.wait_for(test_tokens, timeout=min(0.25, max(0.0, deadline - time.monotonic()))):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        live_count = len(cache.get_many(test_tokens))
+        print(f"\r  {remaining:.0f}s remaining... ({live_count}/{len(test_tokens)} prices received)", end="", flush=True)
     
     print("\n\n" + "=" * 80)
     print("Results:")
@@ -68,8 +70,7 @@ def main():
             print(f"✗ {token.upper():<10} No data received")
     
     # Show all cached data
-    all_cached = cache.get_all()
-    print(f"\nTotal cached entries: {len(all_cached)}")
+    print(f"\nTotal cached entries: {len(cache)}")
     
     print("\n" + "=" * 80)
     print("Stopping manager...")